@@ -1,57 +1,98 @@
-# The main data structure: a dictionary where the key is the account PIN (string)
-# and the value is the account balance (float).
+from atm_auth import CredentialStore, AuthSession, TooManyAttemptsError, CREDENTIALS_FILE
+from atm_ledger import Ledger, LEDGER_DIR, to_cents, format_cents
+
+# The account directory: a dictionary where the key is the account number (string)
+# and the value is the opening balance. Live balances are kept in the ledger
+# (integer cents, persisted to disk) which is seeded from this on first run.
 ACCOUNTS = {
-    "1234": 1500.50,  # PIN: 1234, Balance: $1500.50
-    "4321": 500.00,   # PIN: 4321, Balance: $500.00
-    "9999": 10000.00  # PIN: 9999, Balance: $10000.00
+    "100001": 1500.50,  # Balance: $1500.50
+    "100002": 500.00,   # Balance: $500.00
+    "100003": 10000.00  # Balance: $10000.00
+}
+
+# Demo PINs for the accounts above. They are only used to seed the credential
+# store, which keeps salted hashes; the PIN is no longer the account identity.
+DEFAULT_PINS = {
+    "100001": "1234",
+    "100002": "4321",
+    "100003": "9999"
 }
 
-# Variable to store the currently logged-in user's PIN
-current_pin = None
+# Variable to store the currently logged-in account number
+current_account = None
+
+# The persistent ledger holding live balances (opened by start_atm)
+ledger = None
+
+# Hashed PINs (opened by start_atm)
+credentials = None
+
+def open_ledger(directory=LEDGER_DIR):
+    """Opens the persistent ledger and seeds any accounts it does not know yet."""
+    global ledger
+    ledger = Ledger(directory)
+    for account, opening_balance in ACCOUNTS.items():
+        if account not in ledger:
+            ledger.open_account(account, to_cents(opening_balance))
+    return ledger
+
+def open_credentials(path=CREDENTIALS_FILE):
+    """Opens the credential store and hashes the demo PIN of any new account."""
+    global credentials
+    credentials = CredentialStore(path)
+    missing = [a for a in ACCOUNTS if a not in credentials]
+    for account in missing:
+        credentials.set_pin(account, DEFAULT_PINS[account], save=False)
+    if missing:
+        credentials.save()
+    return credentials
 
 # --- Core ATM Functions ---
 
 def authenticate():
-    """Authenticates the user using a PIN."""
-    global current_pin
-    
+    """Authenticates the user with an account number and PIN."""
+    global current_account
+
     print("\n--- Welcome to the ATM ---")
-    
+    session = AuthSession(credentials)
+
     for _ in range(3): # Allow 3 attempts
+        account = input("Please enter your account number: ").strip()
         pin = input("Please enter your 4-digit PIN: ").strip()
-        
-        # Accessing Dictionary Items: Check if the PIN exists as a key
-        if pin in ACCOUNTS:
-            current_pin = pin
-            print("✅ Authentication successful.")
-            return True
-        else:
-            print("❌ Invalid PIN. Please try again.")
-            
+
+        try:
+            if session.authenticate(account, pin):
+                current_account = account
+                print("✅ Authentication successful.")
+                return True
+            print("❌ Invalid account number or PIN. Please try again.")
+        except TooManyAttemptsError as e:
+            print(f"🔒 {e}")
+            return False
+
     print("🔒 Maximum attempts reached. Card retained.")
     return False
 
 def check_balance():
     """Check balance 🏦"""
-    if current_pin is None:
+    if current_account is None:
         return
         
-    # Accessing Dictionary Items: Retrieve the balance using the PIN
-    balance = ACCOUNTS[current_pin]
-    print(f"\nYour current balance is: 🏦 ${balance:,.2f}")
+    balance = ledger.balance(current_account)
+    print(f"\nYour current balance is: 🏦 ${format_cents(balance)}")
 
 def deposit():
     """Deposit money 💰"""
-    if current_pin is None:
+    if current_account is None:
         return
 
     while True:
         try:
-            amount = float(input("Enter the amount to DEPOSIT: $"))
+            amount = to_cents(input("Enter the amount to DEPOSIT: $"))
             if amount > 0:
-                # Updating Dictionary Items: Add the deposit amount to the current balance
-                ACCOUNTS[current_pin] += amount
-                print(f"✅ Successfully deposited ${amount:,.2f}.")
+                # The ledger logs the deposit before applying it
+                ledger.deposit(current_account, amount)
+                print(f"✅ Successfully deposited ${format_cents(amount)}.")
                 check_balance()
                 break
             else:
@@ -61,23 +102,22 @@ def deposit():
 
 def withdraw():
     """Withdraw money 💸"""
-    if current_pin is None:
+    if current_account is None:
         return
-        
-    current_balance = ACCOUNTS[current_pin]
 
     while True:
         try:
-            amount = float(input("Enter the amount to WITHDRAW: $"))
-            
+            amount = to_cents(input("Enter the amount to WITHDRAW: $"))
+            # Read the balance at withdrawal time, not once before the prompt
+            current_balance = ledger.balance(current_account)
+
             if amount <= 0:
                 print("Amount must be positive.")
             elif amount > current_balance:
-                print(f"❌ Insufficient funds. Your current balance is ${current_balance:,.2f}.")
+                print(f"❌ Insufficient funds. Your current balance is ${format_cents(current_balance)}.")
             else:
-                # Updating Dictionary Items: Subtract the withdrawal amount
-                ACCOUNTS[current_pin] -= amount
-                print(f"✅ Successfully withdrew ${amount:,.2f}.")
+                ledger.withdraw(current_account, amount)
+                print(f"✅ Successfully withdrew ${format_cents(amount)}.")
                 check_balance()
                 break
         except ValueError:
@@ -110,8 +150,13 @@ def main_menu():
 
 def start_atm():
     """Initializes and runs the ATM sequence."""
-    if authenticate():
-        main_menu()
+    open_ledger()
+    open_credentials()
+    try:
+        if authenticate():
+            main_menu()
+    finally:
+        ledger.close()
 
 # Run the main program
 if __name__ == "__main__":
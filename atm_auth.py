@@ -0,0 +1,246 @@
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+
+# --- Configuration ---
+CREDENTIALS_FILE = "atm_credentials.json"
+HASH_ITERATIONS = 200_000    # PBKDF2-SHA256 rounds per PIN check; raise to slow down guessing
+SALT_BYTES = 16
+MAX_FAILED_ATTEMPTS = 5      # Failed PINs allowed in a burst, per account
+FAILED_REFILL_SECONDS = 30   # One more failed attempt is allowed every N seconds
+MAX_TRACKED_ACCOUNTS = 10_000  # Buckets kept at most; beyond that, new ids share one bucket
+
+def hash_pin(pin, salt, iterations):
+    """Returns the slow salted hash of a PIN."""
+    return hashlib.pbkdf2_hmac('sha256', pin.encode('utf-8'), salt, iterations)
+
+# --- Errors ---
+
+class AuthenticationError(Exception):
+    """Raised when an account id / PIN pair does not verify."""
+
+class TooManyAttemptsError(AuthenticationError):
+    """Raised when an account has used up its failed-attempt allowance."""
+
+# --- Rate Limiting ---
+
+class TokenBucket:
+    """Classic token bucket: `capacity` tokens, refilled at `rate` per second."""
+
+    def __init__(self, capacity, rate, clock=time.monotonic):
+        self.capacity = capacity
+        self.rate = rate
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def has_tokens(self):
+        self._refill()
+        return self.tokens >= 1
+
+    def consume(self):
+        """Takes one token; returns False if the bucket was empty."""
+        self._refill()
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def refund(self):
+        """Gives back a token taken by consume()."""
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def is_full(self):
+        self._refill()
+        return self.tokens >= self.capacity
+
+class FailedAttemptLimiter:
+    """Per-account token buckets shared by every session using a CredentialStore.
+
+    Every attempt takes a token before the PIN is hashed and a successful one
+    gives it back, so only failures count, and parallel guesses cannot all
+    slip through while the first ones are still being hashed. A locked-out
+    account stays locked no matter how many sessions (or ATMs) the guesses
+    are spread across.
+
+    A full bucket is the same as no bucket, so full (or refilled) buckets
+    are dropped. At most max_tracked buckets are kept, which bounds the
+    memory that guesses on made-up account ids can take. A bucket that is
+    still counting failures is never dropped; once every tracked bucket is,
+    accounts without one share a single overflow bucket until room frees up.
+    """
+
+    def __init__(self, capacity=MAX_FAILED_ATTEMPTS, refill_seconds=FAILED_REFILL_SECONDS,
+                 clock=time.monotonic, max_tracked=MAX_TRACKED_ACCOUNTS):
+        self.capacity = capacity
+        self.rate = 1.0 / refill_seconds
+        self.clock = clock
+        self.max_tracked = max_tracked
+        self._buckets = {}
+        self._overflow = TokenBucket(capacity, self.rate, clock)
+        self._lock = threading.Lock()
+
+    def _bucket(self, account):
+        """The account's bucket, created if there is room, else the overflow bucket (lock held)."""
+        bucket = self._buckets.get(account)
+        if bucket is None:
+            if len(self._buckets) >= self.max_tracked:
+                self._evict()
+            if len(self._buckets) >= self.max_tracked:
+                return self._overflow
+            bucket = self._buckets[account] = TokenBucket(self.capacity, self.rate, self.clock)
+        return bucket
+
+    def _evict(self):
+        """Drops full and refilled buckets; live lockouts are kept (lock held)."""
+        for account in [a for a, bucket in self._buckets.items() if bucket.is_full()]:
+            del self._buckets[account]
+
+    def allowed(self, account):
+        """Whether an attempt would be let through now (takes nothing)."""
+        with self._lock:
+            bucket = self._buckets.get(account)
+            if bucket is None and len(self._buckets) >= self.max_tracked:
+                bucket = self._overflow
+            return bucket is None or bucket.has_tokens()
+
+    def acquire(self, account):
+        """Takes a token for an attempt; returns False while the account is locked out."""
+        with self._lock:
+            return self._bucket(account).consume()
+
+    def release(self, account):
+        """Refunds the token of an attempt that succeeded."""
+        with self._lock:
+            bucket = self._buckets.get(account)
+            if bucket is None:
+                self._overflow.refund()  # The attempt was counted in the overflow bucket
+                return
+            bucket.refund()
+            if bucket.is_full():
+                del self._buckets[account]
+
+# --- Credential Store ---
+
+class CredentialStore:
+    """Account id -> salted PBKDF2 hash of the PIN, persisted as JSON.
+
+    The account id is the identity; the PIN is only ever stored hashed, so
+    two customers may share a PIN.
+    """
+
+    def __init__(self, path=CREDENTIALS_FILE, iterations=HASH_ITERATIONS, limiter=None):
+        self.path = path
+        self.iterations = iterations
+        self.limiter = limiter or FailedAttemptLimiter()
+        self.credentials = {}
+        # Unknown accounts are checked against this, so they take as long as known ones
+        self._dummy = {"salt": secrets.token_bytes(SALT_BYTES), "iterations": iterations}
+        self._dummy["hash"] = hash_pin("0000", self._dummy["salt"], iterations)
+        if path and os.path.exists(path) and os.stat(path).st_size > 0:
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        self.credentials = {
+            account: {
+                "salt": bytes.fromhex(entry["salt"]),
+                "hash": bytes.fromhex(entry["hash"]),
+                "iterations": entry["iterations"],
+            }
+            for account, entry in stored.items()
+        }
+
+    def save(self):
+        """Writes the store atomically (temp file + rename)."""
+        if not self.path:
+            return
+        stored = {
+            account: {
+                "salt": entry["salt"].hex(),
+                "hash": entry["hash"].hex(),
+                "iterations": entry["iterations"],
+            }
+            for account, entry in self.credentials.items()
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(stored, f, indent=4)
+        os.replace(tmp_path, self.path)
+
+    def __contains__(self, account):
+        return account in self.credentials
+
+    def set_pin(self, account, pin, save=True):
+        """Stores (or replaces) the hashed PIN for an account."""
+        salt = secrets.token_bytes(SALT_BYTES)
+        self.credentials[account] = {
+            "salt": salt,
+            "hash": hash_pin(pin, salt, self.iterations),
+            "iterations": self.iterations,
+        }
+        if save:
+            self.save()
+
+    def check(self, account, pin):
+        """Slow, constant-time comparison of a PIN against the stored hash."""
+        entry = self.credentials.get(account, self._dummy)
+        candidate = hash_pin(pin, entry["salt"], entry["iterations"])
+        return hmac.compare_digest(candidate, entry["hash"]) and account in self.credentials
+
+    def verify(self, account, pin):
+        """Checks a PIN, applying the shared failed-attempt limit.
+
+        Returns True/False; raises TooManyAttemptsError while locked out.
+        """
+        # The token is taken before the slow hash, so concurrent guesses each pay for one
+        if not self.limiter.acquire(account):
+            raise TooManyAttemptsError(f"Too many failed attempts for {account}. Try again later.")
+        if self.check(account, pin):
+            self.limiter.release(account)
+            # Rehash entries created with an older (cheaper) cost setting
+            if self.credentials[account]["iterations"] != self.iterations:
+                self.set_pin(account, pin)
+            return True
+        return False
+
+class AuthSession:
+    """Caches successful verifications for the lifetime of one session.
+
+    A repeated check of the same account and PIN (e.g. confirming a large
+    withdrawal) costs one HMAC instead of a full PBKDF2 run. The cache is
+    keyed with a random per-session secret and never written anywhere.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._key = secrets.token_bytes(32)
+        self._verified = {}
+
+    def _tag(self, account, pin):
+        message = f"{account}\0{pin}".encode('utf-8')
+        return hmac.new(self._key, message, hashlib.sha256).digest()
+
+    def authenticate(self, account, pin):
+        """Returns True if the PIN is correct; raises TooManyAttemptsError when locked out."""
+        tag = self._tag(account, pin)
+        cached = self._verified.get(account)
+        if cached is not None and hmac.compare_digest(cached, tag):
+            return True
+        if self.store.verify(account, pin):
+            self._verified[account] = tag
+            return True
+        return False
+
+    def clear(self):
+        self._verified.clear()
@@ -0,0 +1,365 @@
+import json
+import os
+import threading
+import time
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# --- Configuration ---
+# The ledger keeps its files in one directory:
+#   wal.log        - append-only write-ahead log, one JSON record per line
+#   snapshot.json  - full balances as of a given log sequence number
+#   journal/       - the day journals (see Journal), which are never reset
+LEDGER_DIR = "atm_ledger"
+WAL_FILE = "wal.log"
+SNAPSHOT_FILE = "snapshot.json"
+SNAPSHOT_EVERY = 1000  # Write a snapshot (and reset the log) every N records
+JOURNAL_DIR = "journal"
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+TAIL_BYTES = 4096  # Read from the end of a journal file to find its last record
+
+# --- Amount Helpers ---
+
+def to_cents(amount):
+    """Converts a user amount (str, int, float or Decimal) to integer cents."""
+    try:
+        value = Decimal(str(amount).strip())
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {amount!r}")
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount: {amount!r}")
+    try:
+        return int(value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP) * 100)
+    except InvalidOperation:
+        # Too many digits to hold to the cent (e.g. "1e30")
+        raise ValueError(f"Amount too large: {amount!r}")
+
+def format_cents(cents):
+    """Formats integer cents as a dollar string, e.g. 150050 -> '1,500.50'."""
+    return f"{Decimal(cents) / 100:,.2f}"
+
+# --- Errors ---
+
+class LedgerError(Exception):
+    """Base class for ledger errors (unknown account, bad operation)."""
+
+class InsufficientFundsError(LedgerError):
+    """Raised when a withdrawal would take an account below zero."""
+
+# --- Log Records ---
+
+def apply_record(balances, record):
+    """Applies one log record to a {account: cents} dict."""
+    op = record["op"]
+    account = record["account"]
+    if op == "open":
+        balances[account] = record["cents"]
+    elif op == "deposit":
+        balances[account] += record["cents"]
+    elif op == "withdraw":
+        balances[account] -= record["cents"]
+    elif op == "transfer":
+        # Both legs live in one record, so a transfer is never half-applied
+        balances[account] -= record["cents"]
+        balances[record["to"]] += record["cents"]
+    else:
+        raise LedgerError(f"Unknown log operation: {op!r}")
+
+def read_balances(directory=LEDGER_DIR):
+    """The balances a restart would rebuild, read-only: nothing is truncated or journaled."""
+    seq, balances = 0, {}
+    snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+    if os.path.exists(snapshot_path):
+        with open(snapshot_path, 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        seq = snapshot["seq"]
+        balances = {k: int(v) for k, v in snapshot["balances"].items()}
+    wal_path = os.path.join(directory, WAL_FILE)
+    if os.path.exists(wal_path):
+        with open(wal_path, 'rb') as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break
+                if record["seq"] > seq:
+                    apply_record(balances, record)
+                    seq = record["seq"]
+    return balances
+
+# --- Day Journal ---
+# One tab-separated line per operation, with the balance(s) it left behind:
+#   seq  time  op  account  cents  balance  [to  to_balance]
+# The fields after the operation let the end-of-day settlement
+# (atm_settlement.py) check every balance against the one before it.
+
+def journal_path(directory, day):
+    return os.path.join(directory, f"journal-{day}.tsv")
+
+def journal_days(directory):
+    """Days ('YYYY-MM-DD') that have a journal file, oldest first."""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(n[len("journal-"):-len(".tsv")] for n in os.listdir(directory)
+                  if n.startswith("journal-") and n.endswith(".tsv"))
+
+def journal_line(seq, ts, op, account, cents, balance, to="", to_balance=""):
+    return f"{seq}\t{ts}\t{op}\t{account}\t{cents}\t{balance}\t{to}\t{to_balance}\n"
+
+def last_journal_seq(path):
+    """The seq of the last complete line of a journal file, or None if it has none."""
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - TAIL_BYTES))
+        tail = f.read()
+    lines = tail[:tail.rfind(b"\n") + 1].splitlines()
+    return int(lines[-1].split(b"\t", 1)[0]) if lines else None
+
+class Journal:
+    """Append-only record of every ledger operation, one file per day.
+
+    The write-ahead log is reset at every snapshot, so it cannot say what
+    happened during a day; the journal keeps all of it, in log order.
+    """
+
+    def __init__(self, directory, fsync=False):
+        self.directory = directory
+        self.fsync = fsync
+        self.last_seq = 0
+        self._day = None
+        self._file = None
+        self._second = None
+        self._ts = None
+        os.makedirs(directory, exist_ok=True)
+        self._recover()
+
+    def _recover(self):
+        """Drops a torn last line and finds the last journaled seq."""
+        for day in reversed(journal_days(self.directory)):
+            path = journal_path(self.directory, day)
+            with open(path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - TAIL_BYTES))
+                tail = f.read()
+            good = tail.rfind(b"\n") + 1
+            if size - len(tail) + good != size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size - len(tail) + good)
+            lines = tail[:good].splitlines()
+            if lines:
+                self.last_seq = int(lines[-1].split(b"\t", 1)[0])
+                return
+
+    def record(self, record, balances):
+        """Appends a log record with the balances it left (call after applying it)."""
+        second = int(time.time())
+        if second != self._second:
+            # Formatting the time once a second keeps this off the per-operation cost
+            self._second = second
+            self._ts = time.strftime(TIME_FORMAT, time.localtime(second))
+            if self._ts[:10] != self._day:
+                if self._file is not None:
+                    self._file.close()
+                self._day = self._ts[:10]
+                self._file = open(journal_path(self.directory, self._day), 'a', encoding='utf-8')
+        account = record["account"]
+        to = record.get("to", "")
+        self._file.write(journal_line(record["seq"], self._ts, record["op"], account, record["cents"],
+                                      balances[account], to, balances[to] if to else ""))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.last_seq = record["seq"]
+
+    def close(self):
+        if self._file is not None and not self._file.closed:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+
+# --- Ledger Engine ---
+
+class Ledger:
+    """Account balances in integer cents, persisted by a write-ahead log.
+
+    Every change is appended to the log before it is applied in memory, so a
+    restart (or a crash) rebuilds the same balances by loading the latest
+    snapshot and replaying the log records written after it.
+
+    Appending to the log is thread-safe. Check-then-act sequences (such as a
+    withdrawal's funds check) are not; concurrent callers must serialize per
+    account, as atm_server.ATMEngine does.
+
+    Every record is also written to the day journal (journal=False skips it).
+    """
+
+    def __init__(self, directory=LEDGER_DIR, snapshot_every=SNAPSHOT_EVERY, fsync=False, journal=True):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync  # fsync every record (power-loss safe, much slower)
+        self.balances = {}
+        self.seq = 0
+        self._records_since_snapshot = 0
+        self._log_lock = threading.Lock()
+
+        os.makedirs(directory, exist_ok=True)
+        self._wal_path = os.path.join(directory, WAL_FILE)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self.journal = Journal(os.path.join(directory, JOURNAL_DIR), fsync) if journal else None
+        self._recover()
+        self._wal = open(self._wal_path, 'a', encoding='utf-8')
+
+    # --- Recovery ---
+
+    def _recover(self):
+        """Loads the latest snapshot and replays the log written after it."""
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, 'r', encoding='utf-8') as f:
+                snapshot = json.load(f)
+            self.seq = snapshot["seq"]
+            self.balances = {k: int(v) for k, v in snapshot["balances"].items()}
+
+        if not os.path.exists(self._wal_path):
+            return
+
+        good_offset = 0
+        with open(self._wal_path, 'rb') as f:
+            for raw in f:
+                try:
+                    record = json.loads(raw)
+                except ValueError:
+                    break  # Torn write from a crash: everything after it is dropped
+                if not raw.endswith(b"\n"):
+                    break
+                good_offset += len(raw)
+                # Records already folded into the snapshot are skipped
+                if record["seq"] > self.seq:
+                    self._apply(record)
+                    self.seq = record["seq"]
+                    self._records_since_snapshot += 1
+                    # A crash between the log write and the journal write left this one out
+                    if self.journal and record["seq"] > self.journal.last_seq:
+                        self.journal.record(record, self.balances)
+
+        if good_offset != os.path.getsize(self._wal_path):
+            with open(self._wal_path, 'r+b') as f:
+                f.truncate(good_offset)
+
+    def _apply(self, record):
+        """Applies one log record to the in-memory balances."""
+        apply_record(self.balances, record)
+
+    # --- Write Path ---
+
+    def _commit(self, op, account, cents, **extra):
+        """Appends a record to the log, then applies it in memory."""
+        with self._log_lock:
+            record = {"seq": self.seq + 1, "op": op, "account": account, "cents": cents, **extra}
+            self._wal.write(json.dumps(record, separators=(',', ':')) + "\n")
+            self._wal.flush()
+            if self.fsync:
+                os.fsync(self._wal.fileno())
+            self._apply(record)
+            if self.journal:
+                self.journal.record(record, self.balances)
+            self.seq += 1
+            self._records_since_snapshot += 1
+            if self._records_since_snapshot >= self.snapshot_every:
+                self._snapshot_locked()
+
+    def _require(self, account):
+        if account not in self.balances:
+            raise LedgerError(f"Unknown account: {account!r}")
+
+    def open_account(self, account, cents=0):
+        """Creates an account with an opening balance in cents."""
+        if account in self.balances:
+            raise LedgerError(f"Account already exists: {account!r}")
+        if cents < 0:
+            raise ValueError("Opening balance cannot be negative.")
+        self._commit("open", account, cents)
+
+    def deposit(self, account, cents):
+        """Adds cents to an account and returns the new balance."""
+        self._require(account)
+        if cents <= 0:
+            raise ValueError("Amount must be positive.")
+        self._commit("deposit", account, cents)
+        return self.balances[account]
+
+    def withdraw(self, account, cents):
+        """Removes cents from an account and returns the new balance."""
+        self._require(account)
+        if cents <= 0:
+            raise ValueError("Amount must be positive.")
+        if cents > self.balances[account]:
+            raise InsufficientFundsError(
+                f"Insufficient funds: balance is ${format_cents(self.balances[account])}."
+            )
+        self._commit("withdraw", account, cents)
+        return self.balances[account]
+
+    def transfer(self, source, target, cents):
+        """Moves cents between two accounts as a single log record."""
+        self._require(source)
+        self._require(target)
+        if source == target:
+            raise LedgerError("Cannot transfer to the same account.")
+        if cents <= 0:
+            raise ValueError("Amount must be positive.")
+        if cents > self.balances[source]:
+            raise InsufficientFundsError(
+                f"Insufficient funds: balance is ${format_cents(self.balances[source])}."
+            )
+        self._commit("transfer", source, cents, to=target)
+        return self.balances[source]
+
+    def balance(self, account):
+        """Returns the current balance of an account in cents."""
+        self._require(account)
+        return self.balances[account]
+
+    def __contains__(self, account):
+        return account in self.balances
+
+    def copy_balances(self):
+        """A consistent copy of every balance: no operation is half-applied in it."""
+        with self._log_lock:
+            return dict(self.balances)
+
+    # --- Snapshots ---
+
+    def snapshot(self):
+        """Writes all balances atomically, then starts a fresh log."""
+        with self._log_lock:
+            self._snapshot_locked()
+
+    def _snapshot_locked(self):
+        tmp_path = self._snapshot_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"seq": self.seq, "balances": self.balances}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self._snapshot_path)
+
+        # A crash before this truncate is harmless: replay skips seq <= snapshot seq
+        self._wal.close()
+        self._wal = open(self._wal_path, 'w', encoding='utf-8')
+        self._records_since_snapshot = 0
+
+    def close(self):
+        """Flushes and closes the log file (and the journal)."""
+        with self._log_lock:
+            if not self._wal.closed:
+                self._wal.flush()
+                os.fsync(self._wal.fileno())
+                self._wal.close()
+            if self.journal:
+                self.journal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
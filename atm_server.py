@@ -0,0 +1,138 @@
+import threading
+
+from atm_auth import AuthSession, AuthenticationError
+from atm_ledger import Ledger, LedgerError, format_cents
+
+# ====================================================================
+# Multi-session ATM engine
+# ====================================================================
+# atm.py drives one customer at a time through module globals. The engine
+# below keeps all state on objects instead, so any number of sessions
+# (threads) can run against one shared ledger:
+#   - every account has its own lock, so sessions on different accounts
+#     never wait for each other;
+#   - a balance check and the update that depends on it happen under the
+#     same lock, so concurrent withdrawals cannot both spend the same money;
+#   - transfers take both account locks in a fixed (sorted) order, so two
+#     opposite transfers can never deadlock.
+
+class SessionClosedError(LedgerError):
+    """Raised when a closed session is used."""
+
+class ATMEngine:
+    """Shared account state for many concurrent ATM sessions."""
+
+    def __init__(self, ledger, credentials=None):
+        self.ledger = ledger
+        self.credentials = credentials  # atm_auth.CredentialStore, or None to skip PIN checks
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, account):
+        """Returns the lock for an account, creating it on first use."""
+        lock = self._locks.get(account)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._locks.setdefault(account, threading.Lock())
+        return lock
+
+    def open_session(self, account, pin=None):
+        """Starts a session bound to one account, verifying the PIN if configured."""
+        auth = None
+        if self.credentials is not None:
+            auth = AuthSession(self.credentials)
+            if not auth.authenticate(account, pin or ""):
+                raise AuthenticationError("Invalid account number or PIN.")
+        if account not in self.ledger:
+            raise LedgerError(f"Unknown account: {account!r}")
+        return Session(self, account, auth)
+
+    # --- Account Operations (all amounts in integer cents) ---
+
+    def balance(self, account):
+        with self._lock_for(account):
+            return self.ledger.balance(account)
+
+    def deposit(self, account, cents):
+        with self._lock_for(account):
+            return self.ledger.deposit(account, cents)
+
+    def withdraw(self, account, cents):
+        with self._lock_for(account):
+            return self.ledger.withdraw(account, cents)
+
+    def transfer(self, source, target, cents):
+        """Moves cents between accounts; locks are always taken in sorted order."""
+        if source == target:
+            raise LedgerError("Cannot transfer to the same account.")
+        first, second = sorted((source, target))
+        with self._lock_for(first), self._lock_for(second):
+            return self.ledger.transfer(source, target, cents)
+
+    def total_cents(self):
+        """Sum of all balances, from one consistent copy of the ledger."""
+        return sum(self.ledger.copy_balances().values())
+
+class Session:
+    """One customer's session; replaces atm.current_account."""
+
+    def __init__(self, engine, account, auth=None):
+        self.engine = engine
+        self.account = account
+        self.auth = auth
+        self.closed = False
+
+    def _check_open(self):
+        if self.closed:
+            raise SessionClosedError("Session is closed.")
+
+    def balance(self):
+        self._check_open()
+        return self.engine.balance(self.account)
+
+    def deposit(self, cents):
+        self._check_open()
+        return self.engine.deposit(self.account, cents)
+
+    def withdraw(self, cents):
+        self._check_open()
+        return self.engine.withdraw(self.account, cents)
+
+    def transfer_to(self, target, cents):
+        self._check_open()
+        return self.engine.transfer(self.account, target, cents)
+
+    def confirm_pin(self, pin):
+        """Re-checks the PIN; repeat checks in one session are served from its cache."""
+        self._check_open()
+        if self.auth is None:
+            return True
+        return self.auth.authenticate(self.account, pin)
+
+    def close(self):
+        self.closed = True
+        if self.auth is not None:
+            self.auth.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __str__(self):
+        state = "closed" if self.closed else "open"
+        return f"Session({self.account}, {state})"
+
+def open_engine(directory, accounts=None, credentials=None):
+    """Opens a ledger-backed engine, seeding {account: cents} if not present."""
+    ledger = Ledger(directory)
+    for account, cents in (accounts or {}).items():
+        if account not in ledger:
+            ledger.open_account(account, cents)
+    return ATMEngine(ledger, credentials)
+
+def describe(engine):
+    """Returns a one-line summary of the engine's accounts and total money."""
+    return (f"{len(engine.ledger.balances)} accounts, "
+            f"total ${format_cents(engine.total_cents())}")
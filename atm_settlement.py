@@ -0,0 +1,286 @@
+import csv
+import heapq
+import itertools
+import os
+import sys
+import time
+from operator import itemgetter
+
+from atm_ledger import (LEDGER_DIR, JOURNAL_DIR, format_cents, journal_days, journal_path,
+                        last_journal_seq, read_balances)
+
+# --- Configuration ---
+# Settling a day reads its journal and writes two files into the
+# settlements directory (inside the ledger directory):
+#   settlement-<day>.csv  - one row per account: opening, credits, debits,
+#                           operations, closing balance and status
+#   exceptions-<day>.csv  - every check that failed, one row each
+# The next day's settlement takes its opening balances from this one.
+SETTLEMENT_DIR = "settlements"
+
+SETTLEMENT_FIELDS = ["account", "opening_cents", "credits_cents", "debits_cents",
+                     "operations", "closing_cents", "status"]
+EXCEPTION_FIELDS = ["account", "seq", "check", "expected_cents", "actual_cents"]
+
+# --- Paths ---
+
+def settlement_path(directory, day):
+    return os.path.join(directory, f"settlement-{day}.csv")
+
+def exceptions_path(directory, day):
+    return os.path.join(directory, f"exceptions-{day}.csv")
+
+def previous_settlement(directory, day):
+    """The latest settlement file before `day`, or None."""
+    if not os.path.isdir(directory):
+        return None
+    days = sorted(n[len("settlement-"):-len(".csv")] for n in os.listdir(directory)
+                  if n.startswith("settlement-") and n.endswith(".csv"))
+    earlier = [d for d in days if d < day]
+    return settlement_path(directory, earlier[-1]) if earlier else None
+
+def read_settlement(path):
+    """Yields (account, closing cents) from a settlement file, in account order."""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        rows = csv.reader(f)
+        next(rows, None)
+        for row in rows:
+            yield row[0], int(row[5])
+
+# ====================================================================
+# Pipeline stages
+# ====================================================================
+# Each stage is a generator over the previous one, so a day of any length
+# streams through one line at a time; only the per-account totals are kept:
+#   read_journal -> check_sequence -> legs -> settle_accounts -> reconcile
+# Failed checks are reported through flag(account, seq, check, expected, actual).
+
+def read_journal(path, flag):
+    """Stage 1: journal lines as (seq, op, account, cents, balance, to, to_balance).
+
+    A line that does not parse is flagged as a "format" exception (with its
+    line number) and skipped; the balance checks then flag what it changed.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            if not line.endswith("\n"):
+                break  # A torn last line; the ledger drops it when it next opens
+            try:
+                seq, _, op, account, cents, balance, to, to_balance = line[:-1].split("\t")
+                record = int(seq), op, account, int(cents), int(balance), to, to_balance
+            except ValueError:
+                flag("", "", "format", "", f"line {number}")
+                continue
+            yield record
+
+def check_sequence(records, flag, last=None):
+    """Stage 2: passes records through, flagging gaps and repeats in the seq numbers.
+
+    last is the previous day's last seq, so a gap at the day boundary is caught too.
+    """
+    for record in records:
+        seq = record[0]
+        if last is not None and seq != last + 1:
+            flag("", seq, "sequence", last + 1, seq)
+        last = seq
+        yield record
+
+def legs(records):
+    """Stage 3: one (account, seq, delta, balance, op) leg per account an operation touched."""
+    for seq, op, account, cents, balance, to, to_balance in records:
+        if op == "withdraw":
+            yield account, seq, -cents, balance, op
+        elif op == "transfer":
+            yield account, seq, -cents, balance, op
+            yield to, seq, cents, int(to_balance), op
+        else:
+            yield account, seq, cents, balance, op
+
+def settle_accounts(legs, flag):
+    """Stage 4: (account, opening, credits, debits, operations, closing, breaks) per account.
+
+    Folds the legs into one running total per account, so memory grows with
+    the number of accounts (which the ledger holds in memory anyway), not
+    with the number of operations. Every leg's balance must be the one
+    before it plus the leg's amount; a mismatch (a lost, altered or
+    out-of-ledger change) is a "chain" break. Yields in account order.
+    """
+    totals = {}  # account -> [opening, credits, debits, operations, balance, breaks]
+    for account, seq, delta, balance, op in legs:
+        total = totals.get(account)
+        if total is None:
+            # The opening balance is the one before the account's first leg
+            opening = 0 if op == "open" else balance - delta
+            total = totals[account] = [opening, 0, 0, 0, opening, 0]
+        if balance != total[4] + delta:
+            flag(account, seq, "chain", total[4] + delta, balance)
+            total[5] += 1
+        if balance < 0:
+            flag(account, seq, "negative", 0, balance)
+            total[5] += 1
+        if delta > 0:
+            total[1] += delta
+        else:
+            total[2] -= delta
+        total[3] += 1
+        total[4] = balance
+    for account in sorted(totals):
+        yield (account,) + tuple(totals.pop(account))
+
+def reconcile(activity, previous, closing, flag):
+    """Stage 5: joins the day's activity with yesterday's closing and the ledger's balances.
+
+    All three are streams in account order (previous and closing may be
+    None when there is nothing to check against). Yields settlement rows
+    for every account in any of them; idle accounts carry their balance over.
+    """
+    streams = [((row[0], 0, row) for row in activity)]
+    if previous is not None:
+        streams.append(((account, 1, cents) for account, cents in previous))
+    if closing is not None:
+        streams.append(((account, 2, cents) for account, cents in closing))
+    for account, group in itertools.groupby(heapq.merge(*streams), key=itemgetter(0)):
+        row = opened = ledger = None
+        for _, source, value in group:
+            if source == 0:
+                row = value
+            elif source == 1:
+                opened = value
+            else:
+                ledger = value
+        if row is None:
+            balance = opened if opened is not None else (ledger or 0)
+            row = (account, balance, 0, 0, 0, balance, 0)
+        _, opening, credits, debits, operations, closing_cents, breaks = row
+        if previous is not None and opening != (opened or 0):
+            flag(account, "", "opening", opened or 0, opening)
+            breaks += 1
+        if closing is not None and closing_cents != (ledger or 0):
+            flag(account, "", "ledger", ledger or 0, closing_cents)
+            breaks += 1
+        yield (account, opening, credits, debits, operations, closing_cents,
+               "ok" if not breaks else "mismatch")
+
+# ====================================================================
+# Settlement
+# ====================================================================
+
+def settle_day(journal_file, settlement_file, exceptions_file, previous_file=None,
+               closing=None, previous_seq=None):
+    """Settles one journal file; returns a report of totals and exception counts.
+
+    previous_file is the prior settlement (its closing balances are today's
+    opening); closing is an account-ordered stream of (account, cents) the
+    day's closing balances must match, such as the ledger's balances;
+    previous_seq is the last seq journaled on the previous day.
+    """
+    report = {"operations": 0, "accounts": 0, "credits": 0, "debits": 0,
+              "opening": 0, "closing": 0, "exceptions": 0, "checks": {}}
+    tmp_paths = [settlement_file + ".tmp", exceptions_file + ".tmp"]
+    with open(tmp_paths[0], 'w', newline='', encoding='utf-8') as settlement_out, \
+            open(tmp_paths[1], 'w', newline='', encoding='utf-8') as exceptions_out:
+        exceptions = csv.writer(exceptions_out)
+        exceptions.writerow(EXCEPTION_FIELDS)
+
+        def flag(account, seq, check, expected, actual):
+            exceptions.writerow([account, seq, check, expected, actual])
+            report["exceptions"] += 1
+            report["checks"][check] = report["checks"].get(check, 0) + 1
+
+        def counted(records):
+            for record in records:
+                report["operations"] += 1
+                yield record
+
+        records = check_sequence(counted(read_journal(journal_file, flag)), flag, previous_seq)
+        activity = settle_accounts(legs(records), flag)
+        previous = read_settlement(previous_file) if previous_file else None
+        rows = reconcile(activity, previous, closing, flag)
+
+        settlement = csv.writer(settlement_out)
+        settlement.writerow(SETTLEMENT_FIELDS)
+        for row in rows:
+            settlement.writerow(row)
+            report["accounts"] += 1
+            report["opening"] += row[1]
+            report["credits"] += row[2]
+            report["debits"] += row[3]
+            report["closing"] += row[5]
+    # Both files appear only once the whole day has been settled
+    os.replace(tmp_paths[0], settlement_file)
+    os.replace(tmp_paths[1], exceptions_file)
+    return report
+
+def settle(day=None, directory=LEDGER_DIR, compare_ledger=None):
+    """Settles a day of the ledger in `directory` (default: its latest journal day).
+
+    The closing balances are compared with the ledger only for the latest
+    journal day (compare_ledger overrides), since later days have moved them on.
+    Returns (report, settlement file, exceptions file).
+    """
+    journal_dir = os.path.join(directory, JOURNAL_DIR)
+    days = journal_days(journal_dir)
+    if not days:
+        raise FileNotFoundError(f"No journal in {journal_dir}")
+    day = day or days[-1]
+    if day not in days:
+        raise FileNotFoundError(f"No journal for {day} in {journal_dir}")
+    if compare_ledger is None:
+        compare_ledger = day == days[-1]
+
+    out_dir = os.path.join(directory, SETTLEMENT_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+    closing = iter(sorted(read_balances(directory).items())) if compare_ledger else None
+    earlier = days[:days.index(day)]
+    previous_seq = last_journal_seq(journal_path(journal_dir, earlier[-1])) if earlier else None
+    files = settlement_path(out_dir, day), exceptions_path(out_dir, day)
+    report = settle_day(journal_path(journal_dir, day), *files, previous_settlement(out_dir, day),
+                        closing, previous_seq)
+    return (report,) + files
+
+# ====================================================================
+# Command line
+# ====================================================================
+
+USAGE = "Usage: python atm_settlement.py [YYYY-MM-DD] [--ledger DIR]"
+
+def main(argv):
+    """python atm_settlement.py [YYYY-MM-DD] [--ledger DIR] - settle a day of ATM operations."""
+    args = list(argv[1:])
+    directory = LEDGER_DIR
+    if "--ledger" in args:
+        i = args.index("--ledger")
+        if i + 1 >= len(args):
+            print(USAGE)
+            return 1
+        directory = args[i + 1]
+        del args[i:i + 2]
+    if len(args) > 1:
+        print(USAGE)
+        return 1
+
+    start = time.perf_counter()
+    try:
+        report, settlement_file, exceptions_file = settle(args[0] if args else None, directory)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        return 1
+    elapsed = time.perf_counter() - start
+
+    print(f"\n--- 🏦 Settlement: {os.path.basename(settlement_file)} ---")
+    print(f"Operations:       {report['operations']:,}")
+    print(f"Accounts:         {report['accounts']:,}")
+    print(f"Opening total:    ${format_cents(report['opening'])}")
+    print(f"Credits:          +${format_cents(report['credits'])}")
+    print(f"Debits:           -${format_cents(report['debits'])}")
+    print(f"Closing total:    ${format_cents(report['closing'])}")
+    if report["exceptions"]:
+        checks = ", ".join(f"{check}: {count:,}" for check, count in sorted(report["checks"].items()))
+        print(f"⚠️ {report['exceptions']:,} exception(s) ({checks}), see {exceptions_file}")
+    else:
+        print("✅ Every balance reconciles with the journal.")
+    print(f"({elapsed:.2f}s)")
+    return 1 if report["exceptions"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
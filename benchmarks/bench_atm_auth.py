@@ -0,0 +1,111 @@
+"""Benchmark: ATM authentication throughput of atm_auth.CredentialStore.
+
+Reports PIN verifications per second for several hashing costs, the cached
+(same-session) path, and checks that the shared failed-attempt limit locks
+an account regardless of which session the guesses come from.
+
+Run from the repository root:
+    python benchmarks/bench_atm_auth.py [--seconds 1.0]
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atm_auth import AuthSession, CredentialStore, FailedAttemptLimiter, TooManyAttemptsError
+
+
+def rate(fn, seconds):
+    """Calls fn repeatedly for about `seconds`; returns calls per second."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn()
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return calls / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    for iterations in (10_000, 50_000, 200_000, 600_000):
+        store = CredentialStore(path=None, iterations=iterations)
+        store.set_pin("100001", "1234")
+        per_second = rate(lambda: store.verify("100001", "1234"), args.seconds)
+        print(f"PBKDF2 {iterations:>7,} rounds: {per_second:>10,.1f} verifications/s")
+
+    store = CredentialStore(path=None)
+    store.set_pin("100001", "1234")
+    session = AuthSession(store)
+    session.authenticate("100001", "1234")
+    per_second = rate(lambda: session.authenticate("100001", "1234"), args.seconds)
+    print(f"Cached session check:    {per_second:>10,.1f} verifications/s")
+
+    # Failed attempts from separate sessions share the same bucket
+    sessions = [AuthSession(store) for _ in range(store.limiter.capacity + 1)]
+    locked = False
+    for s in sessions:
+        try:
+            s.authenticate("100001", "0000")
+        except TooManyAttemptsError:
+            locked = True
+    assert locked, "account was not rate limited across sessions"
+    print(f"Lockout after {store.limiter.capacity} failed attempts across sessions: OK")
+
+    # Parallel guesses: PBKDF2 releases the GIL, so these overlap in the hash
+    store = CredentialStore(path=None)
+    store.set_pin("100001", "1234")
+    guesses = []
+    barrier = threading.Barrier(4 * store.limiter.capacity)
+
+    def guess(pin):
+        barrier.wait()
+        try:
+            guesses.append(store.verify("100001", pin))
+        except TooManyAttemptsError:
+            pass
+
+    threads = [threading.Thread(target=guess, args=(f"{i:04d}",)) for i in range(barrier.parties)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(guesses) == store.limiter.capacity, f"{len(guesses)} parallel guesses got through"
+    print(f"Lockout after {store.limiter.capacity} of {barrier.parties} parallel guesses: OK")
+
+    # Correct PINs never use up the allowance
+    store = CredentialStore(path=None, iterations=1_000)
+    store.set_pin("100001", "1234")
+    for _ in range(3 * store.limiter.capacity):
+        assert store.verify("100001", "1234")
+
+    # Guesses on made-up account ids keep a bounded number of buckets, and
+    # cannot push a real account's lockout out of the limiter
+    store = CredentialStore(path=None, iterations=1_000, limiter=FailedAttemptLimiter(max_tracked=100))
+    store.set_pin("100001", "1234")
+    for _ in range(store.limiter.capacity):
+        store.verify("100001", "0000")
+    for i in range(1_000):
+        try:
+            store.verify(f"9{i:08d}", "0000")
+        except TooManyAttemptsError:
+            pass
+    assert len(store.limiter._buckets) <= 100
+    try:
+        store.verify("100001", "1234")
+        raise AssertionError("made-up ids evicted a live lockout")
+    except TooManyAttemptsError:
+        pass
+    print("Successful checks refund their token; unknown ids keep at most 100 buckets "
+          "and never evict a lockout: OK")
+
+
+if __name__ == "__main__":
+    main()
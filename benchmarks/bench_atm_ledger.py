@@ -0,0 +1,88 @@
+"""Benchmark: balance-update throughput and crash recovery of atm_ledger.Ledger.
+
+Also checks that to_cents rejects malformed and oversized amounts with
+ValueError, which is what atm.py's prompts catch.
+
+Run from the repository root:
+    python benchmarks/bench_atm_ledger.py [--ops 200000] [--accounts 1000]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atm_ledger import Ledger, InsufficientFundsError, to_cents
+
+
+def run_updates(ledger, accounts, ops, seed=42):
+    """Applies a random mix of deposits and withdrawals; returns elapsed seconds."""
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    for _ in range(ops):
+        account = accounts[rng.randrange(len(accounts))]
+        cents = rng.randint(1, 50_000)
+        if rng.random() < 0.5:
+            ledger.deposit(account, cents)
+        else:
+            try:
+                ledger.withdraw(account, cents)
+            except InsufficientFundsError:
+                pass
+    return time.perf_counter() - start
+
+
+def bench(ops, n_accounts, snapshot_every, fsync):
+    with tempfile.TemporaryDirectory() as directory:
+        ledger = Ledger(directory, snapshot_every=snapshot_every, fsync=fsync)
+        accounts = [f"ACC{i:06d}" for i in range(n_accounts)]
+        for account in accounts:
+            ledger.open_account(account, 100_000)
+
+        elapsed = run_updates(ledger, accounts, ops)
+        expected = dict(ledger.balances)
+        # Simulate a crash: drop the object without writing a final snapshot
+        ledger._wal.flush()
+        ledger._wal.close()
+
+        start = time.perf_counter()
+        recovered = Ledger(directory, snapshot_every=snapshot_every)
+        recovery = time.perf_counter() - start
+        assert recovered.balances == expected, "recovered balances differ"
+        recovered.close()
+
+    mode = "fsync" if fsync else "flush"
+    print(f"{mode:>5} | snapshot_every={snapshot_every:>6} | "
+          f"{ops / elapsed:>10,.0f} updates/s | recovery {recovery * 1000:8.1f} ms")
+
+
+def check_to_cents():
+    """Amounts round to the cent; bad input of any kind is a ValueError."""
+    assert to_cents("12.345") == 1235 and to_cents(" 0.1 ") == 10 and to_cents(7) == 700
+    for bad in ("abc", "", "nan", "inf", "1e30", "9" * 40):
+        try:
+            to_cents(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"to_cents({bad!r}) should raise ValueError")
+    print("to_cents: malformed, non-finite and oversized amounts raise ValueError")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--accounts", type=int, default=1_000)
+    args = parser.parse_args()
+
+    check_to_cents()
+    for snapshot_every in (1_000, 10_000, 100_000):
+        bench(args.ops, args.accounts, snapshot_every, fsync=False)
+    # fsync-per-record is bounded by the disk, so use fewer operations
+    bench(min(args.ops, 2_000), args.accounts, 1_000, fsync=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Load test: thousands of concurrent ATM sessions against shared accounts.
+
+Checks that money is conserved: the final total must equal the opening total
+plus successful deposits minus successful withdrawals (transfers net to zero),
+and that a ledger reopened from disk agrees with the in-memory balances.
+Also checks that total_cents() stays exact while transfers run and accounts
+are opened.
+
+Run from the repository root:
+    python benchmarks/bench_atm_server.py [--sessions 5000] [--threads 64] [--quick]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from atm_ledger import Ledger, InsufficientFundsError
+from atm_server import ATMEngine, describe
+
+
+def run_session(engine, accounts, ops, seed):
+    """One simulated customer; returns (deposited, withdrawn, op count)."""
+    rng = random.Random(seed)
+    deposited = withdrawn = 0
+    with engine.open_session(rng.choice(accounts)) as session:
+        for _ in range(ops):
+            cents = rng.randint(1, 20_000)
+            roll = rng.random()
+            try:
+                if roll < 0.3:
+                    session.deposit(cents)
+                    deposited += cents
+                elif roll < 0.6:
+                    session.withdraw(cents)
+                    withdrawn += cents
+                elif roll < 0.9:
+                    target = rng.choice(accounts)
+                    if target != session.account:
+                        session.transfer_to(target, cents)
+                else:
+                    session.balance()
+            except InsufficientFundsError:
+                pass
+    return deposited, withdrawn, ops
+
+
+def check_live_totals(directory, threads):
+    """total_cents() during transfers and account openings always sees the same money."""
+    ledger = Ledger(os.path.join(directory, "live"))
+    accounts = [f"LIVE{i:03d}" for i in range(20)]
+    for account in accounts:
+        ledger.open_account(account, 10_000)
+    engine = ATMEngine(ledger)
+    expected = engine.total_cents()
+    done = threading.Event()
+
+    def transfers(seed):
+        rng = random.Random(seed)
+        while not done.is_set():
+            source, target = rng.sample(accounts, 2)
+            try:
+                engine.transfer(source, target, rng.randint(1, 5_000))
+            except InsufficientFundsError:
+                pass
+
+    def openings():
+        for i in range(2_000):
+            ledger.open_account(f"NEW{i:05d}", 0)
+
+    workers = [threading.Thread(target=transfers, args=(seed,)) for seed in range(threads)]
+    workers.append(threading.Thread(target=openings))
+    for worker in workers:
+        worker.start()
+    totals = 0
+    while workers[-1].is_alive():
+        assert engine.total_cents() == expected, "total_cents saw a half-applied transfer"
+        totals += 1
+    done.set()
+    for worker in workers:
+        worker.join()
+    assert engine.total_cents() == expected
+    ledger.close()
+    print(f"Live totals: {totals:,} total_cents() calls during transfers and account openings, all exact")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5_000)
+    parser.add_argument("--ops", type=int, default=20, help="operations per session")
+    parser.add_argument("--accounts", type=int, default=50)
+    parser.add_argument("--threads", type=int, default=64)
+    parser.add_argument("--quick", action="store_true", help="fewer sessions and threads, for a test run")
+    args = parser.parse_args()
+    if args.quick:
+        args.sessions, args.threads = 300, 16
+
+    with tempfile.TemporaryDirectory() as directory:
+        ledger = Ledger(directory, snapshot_every=5_000)
+        accounts = [f"ACC{i:04d}" for i in range(args.accounts)]
+        for account in accounts:
+            ledger.open_account(account, 50_000)
+        engine = ATMEngine(ledger)
+        opening = engine.total_cents()
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            results = list(pool.map(
+                lambda seed: run_session(engine, accounts, args.ops, seed),
+                range(args.sessions),
+            ))
+        elapsed = time.perf_counter() - start
+
+        deposited = sum(r[0] for r in results)
+        withdrawn = sum(r[1] for r in results)
+        total_ops = sum(r[2] for r in results)
+        expected = opening + deposited - withdrawn
+        final = engine.total_cents()
+        assert final == expected, f"money not conserved: {final} != {expected}"
+        assert all(b >= 0 for b in ledger.balances.values()), "negative balance"
+
+        in_memory = dict(ledger.balances)
+        ledger.close()
+        reopened = Ledger(directory)
+        assert reopened.balances == in_memory, "ledger on disk disagrees"
+        reopened.close()
+
+        check_live_totals(directory, 8)
+
+    print(f"{args.sessions:,} sessions on {args.threads} threads: "
+          f"{total_ops / elapsed:,.0f} ops/s ({elapsed:.2f}s)")
+    print(f"Conserved: {describe(engine)} (opening {opening:,} cents "
+          f"+ {deposited:,} deposited - {withdrawn:,} withdrawn)")
+
+
+if __name__ == "__main__":
+    main()
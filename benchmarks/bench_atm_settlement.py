@@ -0,0 +1,196 @@
+"""Benchmark: end-of-day ATM settlement of a multi-million-operation journal.
+
+Writes one synthetic ATM day (the previous day's settlement, the day's
+journal and a ledger snapshot with the closing balances) and times
+atm_settlement.settle over it. The settlement must reconcile with no
+exceptions, and every account's closing balance must match the ledger.
+
+Also checked:
+  * memory stays flat as the day grows (tracemalloc peak for a day four
+    times longer, same accounts)
+  * injected faults are caught: an altered and a missing journal line, a
+    wrong opening balance and a ledger change made outside the journal
+  * a malformed journal line is reported and skipped, and a gap in the
+    seq numbers between two days is caught
+  * a live Ledger journals every operation, including ones it replays
+    from the write-ahead log after a crash
+
+Run from the repository root:
+    python benchmarks/bench_atm_settlement.py [--ops 3000000] [--accounts 100000]
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import atm_settlement
+import datagen
+from atm_ledger import JOURNAL_DIR, Ledger, journal_line, journal_path
+
+
+def settlement_rows(path):
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def check_memory(workdir, ops, accounts):
+    """tracemalloc peak of settling `ops` and 4 * `ops` operations over the same accounts."""
+    peaks = []
+    for n in (ops, 4 * ops):
+        directory = os.path.join(workdir, f"memory-{n}")
+        datagen.write_atm_day(directory, n, accounts)
+        tracemalloc.start()
+        report = atm_settlement.settle(directory=directory)[0]
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        assert report["operations"] == n and report["exceptions"] == 0
+    print(f"memory:       peak {peaks[0] / 1e6:6.2f} MB for {ops:,} ops, "
+          f"{peaks[1] / 1e6:6.2f} MB for {4 * ops:,} ops")
+    assert peaks[1] < 1.5 * peaks[0], "settlement memory grows with the number of operations"
+
+
+def check_faults(workdir):
+    """Tampers with a small day in four ways; exactly the affected accounts must be flagged."""
+    directory = os.path.join(workdir, "faults")
+    balances = datagen.write_atm_day(directory, 20_000, 500, seed=11)
+    path = journal_path(os.path.join(directory, JOURNAL_DIR), "2024-01-02")
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.readlines()
+
+    def fields(i):
+        return lines[i][:-1].split("\t")
+
+    # An altered balance on a deposit, and a transfer that went missing
+    altered = next(i for i in range(5_000, len(lines)) if fields(i)[2] == "deposit")
+    missing = next(i for i in range(12_000, len(lines)) if fields(i)[2] == "transfer")
+    expected = {fields(altered)[3], fields(missing)[3], fields(missing)[6]}
+    row = fields(altered)
+    row[5] = str(int(row[5]) + 1)
+    lines[altered] = "\t".join(row) + "\n"
+    del lines[missing]
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(lines)
+
+    # A wrong opening balance and a change made behind the journal's back
+    untouched = sorted(set(balances) - expected)
+    opening_account, ledger_account = untouched[0], untouched[-1]
+    expected |= {opening_account, ledger_account}
+    previous = atm_settlement.settlement_path(os.path.join(directory, atm_settlement.SETTLEMENT_DIR), "2024-01-01")
+    rows = settlement_rows(previous)
+    for row in rows:
+        if row["account"] == opening_account:
+            row["closing_cents"] = str(int(row["closing_cents"]) + 100)
+    with open(previous, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, atm_settlement.SETTLEMENT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    balances[ledger_account] += 100
+    with open(os.path.join(directory, "snapshot.json"), 'w', encoding='utf-8') as f:
+        json.dump({"seq": 20_000, "balances": balances}, f)
+
+    report, settlement_file, exceptions_file = atm_settlement.settle(directory=directory)
+    flagged = {row["account"] for row in settlement_rows(settlement_file) if row["status"] != "ok"}
+    assert flagged == expected, (flagged, expected)
+    assert report["checks"]["sequence"] == 1
+    assert len(settlement_rows(exceptions_file)) == report["exceptions"]
+    print(f"faults:       {report['exceptions']} exception(s) {report['checks']} on exactly the "
+          f"{len(expected)} tampered accounts")
+
+
+def check_malformed_and_boundary(workdir):
+    """Two hand-written days: a garbled line and a seq missing across midnight."""
+    directory = os.path.join(workdir, "boundary")
+    journal_dir = os.path.join(directory, JOURNAL_DIR)
+    os.makedirs(journal_dir)
+    with open(journal_path(journal_dir, "2024-01-01"), 'w', encoding='utf-8') as f:
+        f.write(journal_line(1, "2024-01-01 09:00:00", "open", "100001", 1_000, 1_000))
+        f.write(journal_line(2, "2024-01-01 09:00:01", "deposit", "100001", 100, 1_100))
+        f.write(journal_line(3, "2024-01-01 09:00:02", "open", "100002", 500, 500))
+    with open(journal_path(journal_dir, "2024-01-02"), 'w', encoding='utf-8') as f:
+        # seq 4 never made it into either day
+        f.write(journal_line(5, "2024-01-02 09:00:00", "deposit", "100001", 10, 1_110))
+        f.write("5\tnot a journal line\n")
+        f.write(journal_line(6, "2024-01-02 09:00:01", "withdraw", "100002", 100, 400))
+    assert atm_settlement.settle("2024-01-01", directory, compare_ledger=False)[0]["exceptions"] == 0
+    report, _, exceptions_file = atm_settlement.settle("2024-01-02", directory, compare_ledger=False)
+    assert report["operations"] == 2 and report["checks"] == {"sequence": 1, "format": 1}, report
+    rows = settlement_rows(exceptions_file)
+    assert {(row["check"], row["expected_cents"], row["actual_cents"]) for row in rows} == \
+        {("sequence", "4", "5"), ("format", "", "line 2")}
+    print("format:       a malformed line is reported and skipped; a seq gap across days is flagged")
+
+
+def check_live_ledger(workdir):
+    """Journals written by Ledger settle cleanly, across a crash between log and journal."""
+    directory = os.path.join(workdir, "live")
+    with Ledger(directory) as ledger:
+        ledger.open_account("100001", 150_050)
+        ledger.open_account("100002", 50_000)
+        ledger.deposit("100001", 2_500)
+        ledger.withdraw("100002", 10_000)
+        ledger.transfer("100001", "100002", 40_000)
+    # A record that reached the write-ahead log but not the journal
+    with Ledger(directory, journal=False) as ledger:
+        ledger.deposit("100002", 700)
+    with Ledger(directory) as ledger:
+        assert ledger.journal.last_seq == ledger.seq == 6
+        ledger.withdraw("100001", 1_000)
+
+    report, settlement_file, _ = atm_settlement.settle(directory=directory)
+    assert report["exceptions"] == 0 and report["operations"] == 7
+    rows = {row["account"]: row for row in settlement_rows(settlement_file)}
+    assert rows["100001"]["closing_cents"] == str(150_050 + 2_500 - 40_000 - 1_000)
+    assert rows["100002"]["closing_cents"] == str(50_000 - 10_000 + 40_000 + 700)
+
+    # Changing a balance without going through the ledger's operations is caught
+    with Ledger(directory) as ledger:
+        ledger.balances["100002"] += 1
+        ledger.snapshot()
+    report = atm_settlement.settle(directory=directory)[0]
+    assert report["checks"] == {"ledger": 1}
+    print("live ledger:  every operation journaled (including one replayed after a crash); "
+          "an unjournaled change is flagged")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=3_000_000)
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument("--memory-ops", type=int, default=100_000, help="smaller day for the memory check")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        directory = os.path.join(workdir, "atm_ledger")
+        start = time.perf_counter()
+        balances = datagen.write_atm_day(directory, args.ops, args.accounts)
+        size_mb = os.path.getsize(journal_path(os.path.join(directory, JOURNAL_DIR), "2024-01-02")) / 1e6
+        print(f"wrote {args.ops:,} operations over {args.accounts:,} accounts ({size_mb:,.0f} MB journal) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        report, settlement_file, _ = atm_settlement.settle(directory=directory)
+        elapsed = time.perf_counter() - start
+        assert report["exceptions"] == 0, report["checks"]
+        assert report["operations"] == args.ops and report["accounts"] == args.accounts
+        assert report["closing"] == sum(balances.values())
+        assert report["closing"] - report["opening"] == report["credits"] - report["debits"]
+        closing = atm_settlement.read_settlement(settlement_file)
+        assert all(balances[account] == cents for account, cents in closing)
+        print(f"settlement:   {elapsed:6.2f}s | {args.ops / elapsed:10,.0f} operations/s | "
+              f"{report['accounts']:,} accounts reconciled")
+
+        check_memory(workdir, args.memory_ops, 2_000)
+        check_faults(workdir)
+        check_malformed_and_boundary(workdir)
+        check_live_ledger(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark: storing employees in the JSON file vs. the SQLite repository.
+
+Run from the repository root:
+    python benchmarks/bench_employee_store.py [--employees 100000] [--json-employees 2000]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from employee_store import EmployeeRepository
+
+
+def records(n):
+    for i in range(n):
+        salary = 40_000 + (i * 37) % 60_000
+        yield {"name": f"Employee {i}", "id": f"E{i:06d}",
+               "salary": float(salary), "net_salary": salary * 0.85}
+
+
+def json_store_each(path, n):
+    """The original Employee.store_details pattern: load, update one key, rewrite."""
+    for record in records(n):
+        all_employees = {}
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                all_employees = json.load(f)
+        all_employees[record["id"]] = record
+        with open(path, 'w') as f:
+            json.dump(all_employees, f, indent=4)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=100_000)
+    parser.add_argument("--json-employees", type=int, default=2_000,
+                        help="the JSON rewrite is O(N^2), so it runs on fewer employees")
+    args = parser.parse_args()
+    n, m = args.employees, args.json_employees
+
+    with tempfile.TemporaryDirectory() as directory:
+        elapsed = timed(lambda: json_store_each(os.path.join(directory, "e.json"), m))
+        print(f"JSON rewrite per employee ({m:,}):  {m / elapsed:>10,.0f} employees/s")
+
+        with EmployeeRepository(os.path.join(directory, "each.db")) as repo:
+            elapsed = timed(lambda: [repo.upsert(r) for r in records(m)])
+            print(f"SQLite upsert per employee ({m:,}): {m / elapsed:>10,.0f} employees/s")
+
+        with EmployeeRepository(os.path.join(directory, "bulk.db")) as repo:
+            elapsed = timed(lambda: repo.store_many(records(n)))
+            assert len(repo) == n
+            print(f"SQLite store_many ({n:,}):        {n / elapsed:>10,.0f} employees/s")
+            # Re-storing the same ids updates rows in place
+            elapsed = timed(lambda: repo.store_many(records(n)))
+            assert len(repo) == n
+            print(f"SQLite store_many re-upsert:        {n / elapsed:>10,.0f} employees/s")
+            elapsed = timed(lambda: [repo.get(f"E{i:06d}") for i in range(0, n, max(1, n // 10_000))])
+            print(f"Keyed lookups:                      {min(n, 10_000) / elapsed:>10,.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    main()
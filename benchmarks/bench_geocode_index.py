@@ -0,0 +1,129 @@
+"""Benchmark: offline gazetteer lookups vs. the geocoding API.
+
+Builds a synthetic gazetteer, reports how fast a GeoIndex opens and how many
+exact and prefix lookups it answers per second (checking every answer against
+an in-memory dict), then geocodes the bundled cities once through the API
+(the local stub server with a simulated round trip) and once through the
+bundled gazetteer to show the latency saved on a cold cache.
+
+Run from the repository root:
+    python benchmarks/bench_geocode_index.py [--places 1000000] [--delay 0.05]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import info
+from geocode_index import GAZETTEER_FILE, GeoIndex, build_gazetteer, normalize
+from stub_weather_server import StubWeatherServer
+from weather_cache import LRUCache, TwoLevelCache
+
+
+def synthetic_rows(n, seed=7):
+    """n places with random pronounceable names (some shared, like real towns)."""
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "ra", "ten", "vor", "sa", "bel", "dun", "ix", "port", "ville"]
+    for i in range(n):
+        name = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4))).title()
+        yield {"name": name, "admin1": f"Region {i % 97}", "country": "Synthland",
+               "latitude": round(rng.uniform(-90, 90), 5),
+               "longitude": round(rng.uniform(-180, 180), 5),
+               "population": rng.randint(100, 5_000_000)}
+
+
+def bench_index(places, queries):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "gazetteer.tsv")
+        rows = list(synthetic_rows(places))
+        start = time.perf_counter()
+        build_gazetteer(rows, path)
+        build = time.perf_counter() - start
+
+        # Reference answers: the most populous place per normalized name
+        best = {}
+        for row in rows:
+            key = normalize(row["name"])
+            if key not in best or row["population"] > best[key]["population"]:
+                best[key] = row
+
+        rng = random.Random(1)
+        names = [rng.choice(rows)["name"] for _ in range(queries)]
+        misses = [f"Nowhere{i}" for i in range(queries // 10)]
+
+        start = time.perf_counter()
+        index = GeoIndex(path)
+        index.lookup(names[0])
+        first = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for name in names:
+            found = index.lookup(name)
+            assert found["population"] == best[normalize(name)]["population"], name
+        for name in misses:
+            assert index.lookup(name) is None
+        exact = (len(names) + len(misses)) / (time.perf_counter() - start)
+
+        prefixes = [name[:3] for name in names[:queries // 10]]
+        start = time.perf_counter()
+        for text in prefixes:
+            matches = index.prefix(text, limit=10)
+            assert matches and all(normalize(m["name"]).startswith(normalize(text)) for m in matches)
+        prefix = len(prefixes) / (time.perf_counter() - start)
+        index.close()
+
+    print(f"{places:,} places: build {build:.2f}s, open + first lookup {first * 1000:.2f} ms")
+    print(f"  exact lookups:  {exact:>12,.0f}/s")
+    print(f"  prefix lookups: {prefix:>12,.0f}/s")
+
+
+def geocode_all(cities):
+    """Geocodes every city on a cold in-memory cache; returns mean ms per city."""
+    info.CACHE = TwoLevelCache(LRUCache())
+    start = time.perf_counter()
+    for city in cities:
+        assert info.geocode(city) is not None, city
+    return (time.perf_counter() - start) * 1000 / len(cities)
+
+
+def bench_latency(delay):
+    index = GeoIndex(GAZETTEER_FILE)
+    with open(GAZETTEER_FILE, encoding="utf-8") as f:
+        cities = sorted({line.split("\t")[1] for line in f})
+
+    with StubWeatherServer(delay=delay) as server:
+        server.patch_info(info)
+        info.USE_GEO_INDEX = False
+        before = server.stats["requests"]
+        network = geocode_all(cities)
+        assert server.stats["requests"] - before == len(cities)
+
+        info.USE_GEO_INDEX = True
+        info.GEO_INDEX = index
+        before = server.stats["requests"]
+        local = geocode_all(cities)
+        assert server.stats["requests"] == before, "gazetteer hit went to the network"
+    index.close()
+
+    print(f"Bundled gazetteer, {len(cities)} cities, {delay * 1000:.0f} ms simulated round trip:")
+    print(f"  geocoding API: {network:8.3f} ms/city")
+    print(f"  gazetteer:     {local:8.3f} ms/city ({network - local:.3f} ms saved per cold lookup)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--places", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=100_000)
+    parser.add_argument("--delay", type=float, default=0.05, help="simulated API latency (s)")
+    args = parser.parse_args()
+
+    bench_index(args.places, args.queries)
+    bench_latency(args.delay)
+
+
+if __name__ == "__main__":
+    main()
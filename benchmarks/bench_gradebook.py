@@ -0,0 +1,87 @@
+"""Benchmark: columnar Gradebook analytics vs. per-student dict loops.
+
+Also checks that many updates with no query in between keep no more than
+PATCH_LIMIT pending changes per subject.
+
+Run from the repository root:
+    python benchmarks/bench_gradebook.py [--students 1000000] [--subjects 8]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gradebook import PATCH_LIMIT, Gradebook
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=1_000_000)
+    parser.add_argument("--subjects", type=int, default=8)
+    parser.add_argument("--dict-students", type=int, default=100_000,
+                        help="students for the Student.marks dict baseline")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    subjects = [f"Subject{j}" for j in range(args.subjects)]
+    names = [f"Student{i:07d}" for i in range(args.students)]
+    scores = rng.integers(0, 101, size=(args.students, args.subjects)).astype(float)
+    scores[rng.random(scores.shape) < 0.1] = np.nan  # ~10% not enrolled
+
+    # Baseline: Student.marks-style dicts, aggregated in Python
+    n = min(args.dict_students, args.students)
+    dicts = [{s: v for s, v in zip(subjects, row) if v == v} for row in scores[:n].tolist()]
+
+    def dict_aggregates():
+        out = {}
+        for s in subjects:
+            column = [m[s] for m in dicts if s in m]
+            out[s] = (statistics.fmean(column), statistics.median(column))
+        return out
+
+    _, elapsed = timed(dict_aggregates)
+    print(f"Dict loop, mean+median ({n:,} students):  {elapsed * 1000:9.1f} ms")
+
+    book = Gradebook(subjects, capacity=args.students)
+    _, elapsed = timed(lambda: book.load(names, subjects, scores))
+    print(f"Gradebook bulk load ({args.students:,}):      {elapsed * 1000:9.1f} ms")
+    _, elapsed = timed(lambda: (book.means(), book.medians()))
+    print(f"Gradebook mean+median (cold):           {elapsed * 1000:9.1f} ms")
+    _, elapsed = timed(lambda: [book.percentile_ranks(s) for s in subjects])
+    print(f"Percentile ranks, all subjects (warm):  {elapsed * 1000:9.1f} ms")
+    top, elapsed = timed(lambda: book.top_n(10))
+    print(f"Top-10 by average:                      {elapsed * 1000:9.1f} ms ({top[0][0]})")
+
+    # Incremental updates: a few marks change, then aggregates are queried again
+    updates = 50
+    for i in range(updates):
+        book.set_mark(names[i * 997 % args.students], subjects[i % args.subjects], 100 - i)
+    _, elapsed = timed(lambda: (book.means(), book.medians()))
+    print(f"After {updates} updates, mean+median:       {elapsed * 1000:9.1f} ms")
+
+    column = book.marks[:len(book), 0]
+    assert book.median(subjects[0]) == np.median(column[~np.isnan(column)])
+    assert np.isclose(book.mean(subjects[0]), np.nanmean(column))
+
+    # Unqueried updates do not pile up: past PATCH_LIMIT the column is just re-sorted
+    for i in range(100 * PATCH_LIMIT):
+        book.set_mark(names[i % args.students], subjects[0], i % 101)
+    assert all(p is None or len(p) <= PATCH_LIMIT for p in book._pending.values())
+    column = book.marks[:len(book), 0]
+    assert book.median(subjects[0]) == np.median(column[~np.isnan(column)])
+    print(f"{100 * PATCH_LIMIT:,} unqueried updates keep at most {PATCH_LIMIT} pending changes per subject")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Benchmark: pooled keep-alive session vs. a new connection per request.
+
+Runs repeated geocoding + forecast lookups against the local stub server,
+first with a plain requests.get per call (the previous behaviour), then
+through info's shared session, and reports latency and connection reuse.
+
+Run from the repository root:
+    python benchmarks/bench_http_session.py [--lookups 300]
+"""
+import argparse
+import os
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import info
+from stub_weather_server import StubWeatherServer
+
+
+def lookups(n, get_json):
+    """n city lookups (2 requests each); returns mean ms per request."""
+    start = time.perf_counter()
+    for i in range(n):
+        location = get_json(info.API_URL_GEO, info.build_geo_params(f"City{i % 25}"))["results"][0]
+        get_json(info.API_URL_WEATHER, info.build_weather_params(location["latitude"], location["longitude"]))
+    return (time.perf_counter() - start) * 1000 / (2 * n)
+
+
+def unpooled_get_json(url, params=None):
+    response = requests.get(url, params=params, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=300)
+    args = parser.parse_args()
+
+    with StubWeatherServer(delay=0) as server:
+        server.patch_info(info)
+
+        before = server.stats["connections"]
+        per_request = lookups(args.lookups, unpooled_get_json)
+        opened = server.stats["connections"] - before
+        print(f"requests.get per call: {per_request:7.3f} ms/request, "
+              f"{opened} connections for {2 * args.lookups} requests")
+
+        info.reset_http_metrics()
+        before = server.stats["connections"]
+        per_request = lookups(args.lookups, info.http_get_json)
+        opened = server.stats["connections"] - before
+        metrics = info.http_metrics()
+        assert metrics["new_connections"] == opened, (metrics, opened)
+        print(f"pooled session:        {per_request:7.3f} ms/request, "
+              f"{opened} connections for {2 * args.lookups} requests")
+        print(f"http_metrics(): {metrics}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark: import cost of the model classes, via python -X importtime.
+
+Imports each module in a fresh interpreter inside an empty directory and
+checks that the import prints nothing and creates no files. Reports the
+cumulative import time from -X importtime, the slowest sub-imports, and the
+wall time of a whole `python -c "import ..."` over a bare interpreter start.
+
+Run from the repository root:
+    python benchmarks/bench_import_time.py [--runs 10] [modules ...]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_MODULES = ["task_models", "task_models.employee", "task", "vector_array", "shape_collection"]
+
+
+def run_import(module, directory, importtime=False):
+    """Imports module in a fresh interpreter; returns the completed process."""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", f"import {module}"] if module else ["-c", "pass"]
+    return subprocess.run(command, cwd=directory, env=env, capture_output=True, text=True, check=True)
+
+
+def parse_importtime(stderr):
+    """[(self us, cumulative us, module name)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def wall_ms(module, directory, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        run_import(module, directory)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=10, help="interpreter starts per module")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        bare = wall_ms(None, directory, args.runs)
+        print(f"bare interpreter start: {bare:7.1f} ms (median of {args.runs})")
+
+        # What the interpreter imports at startup (site etc.) comes first in every run
+        startup = len(parse_importtime(run_import(None, directory, importtime=True).stderr))
+
+        for module in args.modules:
+            result = run_import(module, directory, importtime=True)
+            assert result.stdout == "", f"importing {module} printed output"
+            assert not os.listdir(directory), f"importing {module} created {os.listdir(directory)}"
+
+            rows = parse_importtime(result.stderr)[startup:]
+            cumulative = sum(self_us for self_us, _, _ in rows)
+            slowest = sorted(rows, reverse=True)[:3]
+            wall = wall_ms(module, directory, args.runs)
+            print(f"{module:<22} importtime {cumulative / 1000:7.2f} ms | "
+                  f"wall +{wall - bare:6.1f} ms | slowest self: "
+                  + ", ".join(f"{name} {self_us / 1000:.2f}" for self_us, _, name in slowest))
+
+    print("No module printed output or touched the working directory on import.")
+
+
+if __name__ == "__main__":
+    main()
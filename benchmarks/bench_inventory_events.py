@@ -0,0 +1,164 @@
+"""Benchmark: inventory event log replay, daily revenue fold and point-in-time queries.
+
+Writes --events synthetic restock/purchase events (with a snapshot every
+--snapshot-every events) and measures:
+
+  * recovery: opening the log (latest snapshot + the tail after it)
+  * full replay throughput, rebuilding the state from event 1
+  * the streaming daily revenue fold
+  * state_at() latency at random past times (nearest snapshot + short replay)
+
+Every figure is checked against the state the generator ended with, and
+state_at() answers are checked against the full replay. Finally the
+InventorySystem integration is exercised end to end.
+
+Run from the repository root:
+    python benchmarks/bench_inventory_events.py [--events 10000000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen
+import inventory
+from inventory_events import InventoryEventLog, apply_event, empty_state, events_dir_for, now
+
+
+def close_enough(a, b):
+    return abs(a - b) <= 1e-6 * max(1.0, abs(a), abs(b))
+
+
+def check_app_integration(workdir):
+    """Adds, restocks and sells through InventorySystem and reads the history back."""
+    old_data_file = inventory.DATA_FILE
+    os.makedirs(os.path.join(workdir, "app"))
+    inventory.DATA_FILE = os.path.join(workdir, "app", "inventory_data.json")
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            system = inventory.InventorySystem()
+            system.add_product("Laptop Pro", 1200.00, 5)
+            system.add_product("Wireless Mouse", 25.50, 50)
+            before = now()
+            time.sleep(1.1)  # Timestamps have one-second resolution
+            system.add_product("Wireless Mouse", 25.50, 10)
+            system.purchase(1001, 2)
+            system.purchase(1002, 4)
+            system.close()
+
+            # A restart replays the log into the same state
+            system = inventory.InventorySystem()
+            events = system.events
+            assert events.directory == events_dir_for(inventory.DATA_FILE)
+            assert events.seq == 5
+            current = {p.id: p.quantity for p in system.products}
+            assert {p["id"]: p["quantity"] for p in events.state["products"].values()} == current
+            assert close_enough(events.state["total_earnings"], system.total_earnings)
+
+            past = events.state_at(before)
+            assert [p["quantity"] for p in past["products"]] == [5, 50]
+            assert past["total_earnings"] == 0.0
+            assert events.state_at("2000-01-01")["products"] == []
+            revenue = events.daily_revenue()
+            assert list(revenue) == [now()[:10]] and close_enough(revenue[now()[:10]], 2502.0)
+            system.close()
+
+            # Changes logged but never saved (a crash between flushes) are replayed on open
+            system = inventory.InventorySystem(autosave=False)
+            system.purchase(1001, 1)
+            system.restock(1002, 7)
+            system.add_product("USB Hub", 15.00, 3)
+            system.events.close()
+            system = inventory.InventorySystem()
+            assert {p.id: p.quantity for p in system.products} == {1001: 2, 1002: 63, 1003: 3}
+            assert close_enough(system.total_earnings, 3702.0)
+            assert system.data["next_product_id"] == 1004
+            assert close_enough(system.events.daily_revenue()[now()[:10]], system.total_earnings)
+            system.close()
+    finally:
+        inventory.DATA_FILE = old_data_file
+    print("InventorySystem: restart, state_at and daily_revenue agree with the live state, "
+          "including after unsaved changes.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=10_000_000)
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--snapshot-every", type=int, default=10000)
+    parser.add_argument("--queries", type=int, default=200, help="state_at() calls to time")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        directory = os.path.join(workdir, "inventory_data.events")
+        start = time.perf_counter()
+        final = datagen.write_inventory_events_dir(directory, args.events, args.products, args.snapshot_every)
+        written = time.perf_counter() - start
+        size_mb = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)) / 1e6
+        print(f"wrote {args.events:,} events ({size_mb:,.0f} MB) in {written:.1f}s")
+
+        # Recovery only reads the latest snapshot and the tail after it
+        start = time.perf_counter()
+        log = InventoryEventLog(directory, snapshot_every=args.snapshot_every)
+        recovery = time.perf_counter() - start
+        assert log.seq == args.events
+        assert log.state["products"] == final["products"]
+        assert close_enough(log.state["total_earnings"], final["total_earnings"])
+        print(f"recovery (open):       {recovery * 1000:9.1f} ms")
+
+        # Times to check state_at() at, against a full replay: both ends and a few in between
+        rng = random.Random(7)
+        targets = sorted({datagen.event_time(0), log.state["ts"],
+                          *(datagen.event_time(rng.randrange(args.events)) for _ in range(5))})
+        expected = {}
+        state = empty_state()
+        pending = list(targets)
+        start = time.perf_counter()
+        for event in log.iter_events():
+            while pending and event["ts"] > pending[0]:
+                expected[pending.pop(0)] = (state["seq"], state["total_earnings"])
+            apply_event(state, event)
+        replay = time.perf_counter() - start
+        for target in pending:
+            expected[target] = (state["seq"], state["total_earnings"])
+        assert state["products"] == final["products"]
+        print(f"full replay:           {replay:9.1f} s  | {args.events / replay:12,.0f} events/s")
+
+        start = time.perf_counter()
+        revenue = log.daily_revenue()
+        fold = time.perf_counter() - start
+        assert close_enough(sum(revenue.values()), final["total_earnings"])
+        print(f"daily revenue fold:    {fold:9.1f} s  | {args.events / fold:12,.0f} events/s "
+              f"| {len(revenue)} days")
+
+        for target, (seq, earnings) in expected.items():
+            answer = log.state_at(target)
+            assert answer["seq"] == seq, (target, answer["seq"], seq)
+            assert close_enough(answer["total_earnings"], earnings)
+
+        samples = []
+        for _ in range(args.queries):
+            seq = rng.randint(1, args.events)
+            target = datagen.event_time(seq - 1)
+            start = time.perf_counter()
+            answer = log.state_at(target)
+            samples.append((time.perf_counter() - start) * 1000)
+            assert answer["seq"] == seq
+        samples.sort()
+        print(f"state_at():            p50 {statistics.median(samples):7.1f} ms | "
+              f"max {samples[-1]:7.1f} ms (at most {args.snapshot_every:,} events replayed)")
+        log.close()
+
+        check_app_integration(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark: sharded process-pool rollup of many per-user tracker ledgers.
+
+Writes --ledgers synthetic ledgers (one per user, mostly segmented stores,
+some legacy JSON files) into a ledger directory, then runs
+ledger_aggregate.aggregate with 1, 2, 4, ... worker processes and reports
+the speedup over one process. Every run must produce the same rollup, and
+that rollup must match the totals the generator wrote.
+
+Near-linear scaling needs as many idle cores as workers; on a machine with
+fewer cores the extra workers only add overhead, so the speedup column is
+reported rather than asserted.
+
+Run from the repository root:
+    python benchmarks/bench_ledger_aggregate.py [--ledgers 10000] [--per-ledger 50]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen
+import ledger_aggregate
+import tracker
+
+
+def close_enough(a, b):
+    return abs(a - b) <= 1e-9 * max(1.0, abs(a), abs(b))
+
+
+def check_per_user_api(directory):
+    """add_transaction/get_summary on two users' ledgers stay separate."""
+    alice = tracker.ledger_file("alice", directory)
+    bob = tracker.ledger_file("bob smith", directory)
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker.add_transaction("income", 100.0, "Salary", data_file=alice)
+        tracker.add_transaction("expense", 30.0, "Food", data_file=alice)
+        tracker.add_transaction("expense", 5.0, "Coffee", data_file=bob)
+    assert tracker.get_summary(alice)["net_balance"] == 70.0
+    assert tracker.get_summary(bob) == {"total_income": 0.0, "total_expenses": 5.0,
+                                        "net_balance": -5.0, "total_transactions": 1}
+    assert os.path.basename(bob) == "bob%20smith.json" and tracker.ledger_user(bob) == "bob smith"
+    assert tracker.list_ledgers(directory) == sorted([alice, bob])
+    # Names a lossy sanitizer would merge each get their own ledger
+    names = ["a b", "a/b", "a_b", "a%20b", "..a", "Zoë"]
+    assert len({tracker.ledger_file(name, directory) for name in names}) == len(names)
+    assert all(tracker.ledger_user(tracker.ledger_file(name, directory)) == name for name in names)
+    print("per-user ledgers: add_transaction/get_summary(data_file=...) keep users apart")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ledgers", type=int, default=10000)
+    parser.add_argument("--per-ledger", type=int, default=50, help="average transactions per ledger")
+    parser.add_argument("--workers", default=None, help="comma-separated worker counts (default 1,2,4,... up to 2x CPUs)")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    if args.workers:
+        counts = [int(w) for w in args.workers.split(",")]
+    else:
+        counts = [1]
+        while counts[-1] < max(2 * cpus, 4):
+            counts.append(counts[-1] * 2)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        check_per_user_api(os.path.join(workdir, "api"))
+
+        directory = os.path.join(workdir, "ledgers")
+        start = time.perf_counter()
+        transactions, income, expenses = datagen.write_tracker_ledgers(directory, args.ledgers, args.per_ledger)
+        print(f"wrote {args.ledgers:,} ledgers ({transactions:,} transactions) in {time.perf_counter() - start:.1f}s"
+              f" | {cpus} CPU(s)")
+
+        baseline = None
+        for workers in counts:
+            start = time.perf_counter()
+            rollup = ledger_aggregate.aggregate(directory, workers)
+            elapsed = time.perf_counter() - start
+            assert not rollup["errors"], rollup["errors"][:3]
+            assert rollup["ledgers"] == args.ledgers and rollup["transactions"] == transactions
+            assert close_enough(rollup["total_income"], income) and close_enough(rollup["total_expenses"], expenses)
+            if baseline is None:
+                baseline = (elapsed, rollup)
+            else:
+                assert rollup["top"] == baseline[1]["top"] and rollup["bottom"] == baseline[1]["bottom"]
+                assert rollup["negative_ledgers"] == baseline[1]["negative_ledgers"]
+            speedup = baseline[0] / elapsed
+            print(f"  {workers:>3} worker(s): {elapsed:7.2f}s | {args.ledgers / elapsed:9,.0f} ledgers/s | "
+                  f"speedup {speedup:5.2f}x | efficiency {speedup / min(workers, cpus):5.0%}")
+
+        # Read-only: the rollup must not have migrated the legacy ledgers
+        assert os.path.exists(os.path.join(directory, "user00000.json"))
+        assert not os.path.exists(os.path.join(directory, "user00000.segments"))
+        print("All worker counts produced the same rollup, matching the generated totals.")
+
+
+if __name__ == "__main__":
+    main()
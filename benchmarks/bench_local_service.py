@@ -0,0 +1,298 @@
+"""Load test: the local HTTP/JSON service, reporting requests/s and p99 latency.
+
+Starts local_service.py in a subprocess on generated data, then
+--connections keep-alive clients send a mix of requests for --seconds:
+inventory purchases, restocks and summaries, tracker transactions and
+summaries (spread over --users ledgers), and hospital bookings. Prints
+requests/s and latency percentiles per endpoint and overall.
+
+Every request must succeed. The service's summaries must agree with what
+the clients were told, and after the service is stopped (Ctrl+C, which
+triggers its final save) the saved files must hold exactly the same state.
+The /stats figures show how many saves the batching took.
+
+Run from the repository root:
+    python benchmarks/bench_local_service.py [--connections 32] [--seconds 5]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen
+import hospital
+import inventory
+import local_service
+import tracker
+from session_replay import percentile
+
+# (request kind, weight)
+MIX = [("purchase", 40), ("restock", 5), ("inventory_summary", 5), ("transaction", 25),
+       ("tracker_summary", 10), ("book", 15)]
+
+
+def close_enough(a, b):
+    return abs(a - b) <= 1e-6 * max(1.0, abs(a), abs(b))
+
+
+# --- Client ---
+
+async def request(reader, writer, method, path, payload=None):
+    """One request on a keep-alive connection; returns (status, decoded JSON body)."""
+    body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {local_service.HOST}\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+class Expected:
+    """What the clients were told, to check the service's state against."""
+
+    def __init__(self):
+        self.earnings = 0.0
+        self.stock_delta = {}  # product id -> restocked - purchased
+        self.ledgers = {}      # user -> [income, expenses, count]
+        self.bookings = 0
+
+    def record(self, kind, payload, body):
+        if kind == "purchase":
+            self.earnings += body["amount"]
+            self.stock_delta[body["product_id"]] = self.stock_delta.get(body["product_id"], 0) - body["quantity"]
+        elif kind == "restock":
+            self.stock_delta[body["product_id"]] = self.stock_delta.get(body["product_id"], 0) + body["quantity"]
+        elif kind == "transaction":
+            totals = self.ledgers.setdefault(payload["user"], [0.0, 0.0, 0])
+            totals[0 if payload["type"] == "income" else 1] += payload["amount"]
+            totals[2] += 1
+        elif kind == "book":
+            self.bookings += 1
+
+
+def build(kind, rng, product_ids, doctor_ids, users):
+    """(method, path, payload) for one request of this kind."""
+    if kind == "purchase":
+        return "POST", "/inventory/purchase", {"product_id": rng.choice(product_ids), "quantity": rng.randint(1, 3)}
+    if kind == "restock":
+        return "POST", "/inventory/restock", {"product_id": rng.choice(product_ids), "quantity": rng.randint(1, 50)}
+    if kind == "inventory_summary":
+        return "GET", "/inventory/summary", None
+    if kind == "transaction":
+        return "POST", "/tracker/transactions", {
+            "user": rng.choice(users), "type": rng.choice(("income", "expense")),
+            "amount": round(rng.uniform(1, 500), 2), "description": rng.choice(datagen.DESCRIPTIONS)}
+    if kind == "tracker_summary":
+        return "GET", f"/tracker/summary?user={rng.choice(users)}", None
+    return "POST", "/hospital/appointments", {
+        "doctor_id": rng.choice(doctor_ids), "name": f"Patient{rng.randrange(10 ** 6)}",
+        "age": rng.randint(1, 95), "disease": "checkup"}
+
+
+async def load(port, args, product_ids, doctor_ids, users):
+    """Runs the clients; returns ({kind: sorted latencies}, Expected, elapsed seconds)."""
+    kinds = [kind for kind, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    latencies = {kind: [] for kind in kinds}
+    expected = Expected()
+    failures = []
+
+    async def client(seed, deadline):
+        rng = random.Random(seed)
+        reader, writer = await asyncio.open_connection(local_service.HOST, port)
+        try:
+            while time.perf_counter() < deadline:
+                kind = rng.choices(kinds, weights)[0]
+                method, path, payload = build(kind, rng, product_ids, doctor_ids, users)
+                start = time.perf_counter()
+                status, body = await request(reader, writer, method, path, payload)
+                latencies[kind].append(time.perf_counter() - start)
+                if status != 200:
+                    failures.append((kind, status, body))
+                else:
+                    expected.record(kind, payload, body)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(i, start + args.seconds) for i in range(args.connections)))
+    elapsed = time.perf_counter() - start
+    assert not failures, failures[:3]
+    return {kind: sorted(samples) for kind, samples in latencies.items()}, expected, elapsed
+
+
+async def fetch(port, path):
+    reader, writer = await asyncio.open_connection(local_service.HOST, port)
+    try:
+        status, body = await request(reader, writer, "GET", path)
+    finally:
+        writer.close()
+    assert status == 200, (path, body)
+    return body
+
+
+# --- Error handling (in process) ---
+
+async def check_errors(data_dir):
+    """Bad input gets an HTTP error (never a dropped connection) and failed saves are retried."""
+    local_service.use_data_dir(data_dir)
+    with contextlib.redirect_stdout(io.StringIO()):
+        service = local_service.Service(flush_interval=3600)
+        service.inventory.add_product("Wireless Mouse", 25.50, 50)
+    ports = []
+    server = asyncio.create_task(service.serve(local_service.HOST, 0, ports.append))
+    while not ports:
+        await asyncio.sleep(0.01)
+    reader, writer = await asyncio.open_connection(local_service.HOST, ports[0])
+
+    status, body = await request(reader, writer, "POST", "/inventory/purchase", {"product_id": 1001, "quantity": 2.9})
+    assert status == 400, body
+    status, body = await request(reader, writer, "POST", "/inventory/purchase", {"product_id": "1001", "quantity": 2.0})
+    assert status == 200 and body["remaining"] == 48, body
+    service.routes[("GET", "/broken")] = lambda params: 1 / 0
+    with contextlib.redirect_stderr(io.StringIO()):
+        status, body = await request(reader, writer, "GET", "/broken")
+    assert status == 500, body
+    writer.close()
+
+    # A header line longer than the stream limit
+    reader, writer = await asyncio.open_connection(local_service.HOST, ports[0])
+    writer.write(b"GET /stats HTTP/1.1\r\nX-Padding: " + b"x" * 100_000 + b"\r\n\r\n")
+    assert (await reader.readline()).split()[1] == b"400"
+    writer.close()
+
+    # A save that fails keeps its store marked as changed, and the next flush saves it
+    def disk_full(state):
+        raise OSError("disk full")
+
+    write_state = service.inventory.write_state
+    service.inventory.write_state = disk_full
+    with contextlib.redirect_stderr(io.StringIO()):
+        await service.flush()
+    assert service.stats["save_errors"] == 1 and service.inventory in service._dirty
+    service.inventory.write_state = write_state
+    await service.flush()
+    assert service.stats["saves"] == 1 and not service._dirty
+
+    server.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await server
+    print("errors:       non-integer quantity -> 400, handler crash -> 500, long header -> 400, "
+          "failed save retried")
+
+
+# --- Service process ---
+
+def start_service(data_dir):
+    """Starts local_service.py on a free port; returns (process, port)."""
+    env = dict(os.environ, PYTHONIOENCODING="utf-8")
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "local_service.py"), "--port", "0", "--data-dir", data_dir],
+        stdout=subprocess.PIPE, text=True, encoding="utf-8", env=env, cwd=data_dir)
+    line = process.stdout.readline()
+    match = re.search(r":(\d+) ", line)
+    if match is None:
+        process.kill()
+        raise RuntimeError(f"local_service did not start: {line!r}")
+    return process, int(match.group(1))
+
+
+def stop_service(process):
+    """Ctrl+C, which makes the service save everything before it exits."""
+    process.send_signal(signal.SIGINT)
+    output, _ = process.communicate(timeout=60)
+    assert process.returncode == 0 and "Saved" in output, output
+
+
+def report(latencies, elapsed):
+    print(f"{'endpoint':<20} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    everything = sorted(sample for samples in latencies.values() for sample in samples)
+    for kind, samples in list(latencies.items()) + [("ALL", everything)]:
+        print(f"{kind:<20} {len(samples):>9,} {len(samples) / elapsed:>9,.0f} {percentile(samples, 50) * 1000:>8.2f}"
+              f" {percentile(samples, 99) * 1000:>8.2f} {samples[-1] * 1000 if samples else 0.0:>8.2f}")
+    return everything
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--doctors", type=int, default=50)
+    parser.add_argument("--users", type=int, default=20, help="tracker ledgers to spread transactions over")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        asyncio.run(check_errors(os.path.join(data_dir, "errors")))
+
+        # Deep stock, so purchases never run out
+        products = [{**p, "quantity": 10 ** 6} for p in datagen.products(args.products)]
+        datagen.write_json_stream(os.path.join(data_dir, "inventory_data.json"),
+                                  {"total_earnings": 0.0, "next_product_id": 1001 + args.products},
+                                  "products", iter(products))
+        datagen.write_hospital_file(os.path.join(data_dir, "hospital_data.json"), args.doctors, 1000)
+        product_ids = [p["id"] for p in products]
+        doctor_ids = [101 + i for i in range(args.doctors)]
+        users = [f"user{i:03d}" for i in range(args.users)]
+
+        process, port = start_service(data_dir)
+        try:
+            latencies, expected, elapsed = asyncio.run(load(port, args, product_ids, doctor_ids, users))
+            summary = asyncio.run(fetch(port, "/inventory/summary"))
+            ledgers = {user: asyncio.run(fetch(port, f"/tracker/summary?user={user}")) for user in expected.ledgers}
+            stats = asyncio.run(fetch(port, "/stats"))
+        finally:
+            if process.poll() is None:
+                stop_service(process)
+
+        everything = report(latencies, elapsed)
+        writes = sum(len(latencies[kind]) for kind in ("purchase", "restock", "transaction", "book"))
+        print(f"{len(everything) / elapsed:,.0f} requests/s over {args.connections} connections, "
+              f"p99 {percentile(everything, 99) * 1000:.2f} ms | {writes:,} writes saved in "
+              f"{stats['flushes']:,} flushes ({stats['saves']:,} store saves)")
+
+        # The live service agrees with its clients...
+        assert close_enough(summary["total_earnings"], expected.earnings)
+        for user, (income, expenses, count) in expected.ledgers.items():
+            assert ledgers[user]["total_transactions"] == count
+            assert close_enough(ledgers[user]["total_income"], income)
+            assert close_enough(ledgers[user]["total_expenses"], expenses)
+        assert stats["saves"] < writes
+
+        # ...and so do the files it saved on the way out
+        with contextlib.redirect_stdout(io.StringIO()):
+            local_service.use_data_dir(data_dir)
+            system = inventory.InventorySystem()
+            assert close_enough(system.total_earnings, expected.earnings)
+            for product_id, delta in expected.stock_delta.items():
+                assert system.find_product(product_id).quantity == 10 ** 6 + delta
+            system.close()
+            for user, (income, expenses, count) in expected.ledgers.items():
+                saved = tracker.get_summary(tracker.ledger_file(user))
+                assert saved["total_transactions"] == count and close_enough(saved["total_income"], income)
+            assert len(hospital.HospitalSystem().data["appointments"]) == 1000 + expected.bookings
+        print("Summaries and saved files match every response the clients received.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark and parity check: vectorized payroll vs. the scalar Employee methods.
+
+Run from the repository root:
+    python benchmarks/bench_payroll.py [--employees 500000] [--parity 20000] [--shards 8] [--quick]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from payroll import DEFAULT_BRACKETS, PayrollBatch, parity_mismatches, run_sharded, write_shard
+from task_models import Employee
+
+
+def records(n, seed=11):
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {"id": f"E{i:07d}", "name": f"Employee {i}",
+               "salary": round(rng.uniform(500, 15_000), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=500_000)
+    parser.add_argument("--parity", type=int, default=20_000)
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--quick", action="store_true", help="small batches, for a test run")
+    args = parser.parse_args()
+    if args.quick:
+        args.employees, args.parity, args.shards = 20_000, 2_000, 4
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Parity: exact equality with the scalar methods, flat and bracketed
+        for brackets in (None, DEFAULT_BRACKETS):
+            employees = [Employee(r["name"], r["id"], r["salary"]) for r in records(args.parity)]
+            with contextlib.redirect_stdout(io.StringIO()):
+                bad = parity_mismatches(employees, percentage=3.5, brackets=brackets)
+            assert not bad, f"{len(bad)} mismatches, e.g. {bad[:5]}"
+        print(f"Parity: {args.parity:,} employees match the scalar methods exactly")
+
+        # Scalar throughput (raise + bracketed net pay), without printing
+        employees = [Employee(r["name"], r["id"], r["salary"]) for r in records(args.parity)]
+        start = time.perf_counter()
+        for e in employees:
+            e.salary += e.salary * (3.5 / 100)
+            e.calculate_net_salary(brackets=DEFAULT_BRACKETS)
+        scalar = args.parity / (time.perf_counter() - start)
+        print(f"Scalar Employee loop:   {scalar:>12,.0f} employees/s")
+
+        batch = PayrollBatch.from_records(records(args.employees))
+        start = time.perf_counter()
+        batch.give_raise(3.5)
+        expected = batch.totals(brackets=DEFAULT_BRACKETS)
+        vector = args.employees / (time.perf_counter() - start)
+        print(f"Vectorized batch:       {vector:>12,.0f} employees/s ({vector / scalar:,.0f}x)")
+
+        # Sharded run across a process pool
+        all_records = list(records(args.employees))
+        size = -(-len(all_records) // args.shards)
+        paths = []
+        for i in range(args.shards):
+            path = os.path.join(directory, f"shard{i:03d}.csv")
+            write_shard(path, all_records[i * size:(i + 1) * size])
+            paths.append(path)
+        for processes in sorted({1, os.cpu_count() or 1}):
+            start = time.perf_counter()
+            totals = run_sharded(paths, percentage=3.5, brackets=DEFAULT_BRACKETS, processes=processes)
+            elapsed = time.perf_counter() - start
+            # Shard totals are summed in a different order, so allow rounding in the last places
+            assert totals["employees"] == expected["employees"]
+            assert all(abs(totals[k] - expected[k]) <= 1e-9 * expected[k] for k in ("gross", "tax", "net"))
+            print(f"Sharded, {processes:>2} processes: {totals['employees'] / elapsed:>12,.0f} employees/s "
+                  f"(net total ${totals['net']:,.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Benchmark: segmented checksummed storage vs one JSON file, with fault injection.
+
+For each size, saves a tracker ledger both ways and times a full load, an
+append-one-transaction save, and recovery from a damaged segment. Then
+injects faults and checks what survives:
+
+  * torn write at the end of the last segment -> only the torn item is lost
+  * flipped byte inside a middle segment      -> that segment keeps its prefix,
+                                                 every other segment is intact
+  * missing segment file                       -> only that segment is lost
+  * damaged manifest                           -> the previous manifest is used
+  * crash before the manifest swap             -> the old state loads
+  * corrupt legacy JSON file                   -> backed up, never overwritten
+
+Run from the repository root:
+    python benchmarks/bench_segment_store.py [--sizes 10000,100000,500000] [--quick]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen
+import segment_store
+import tracker
+from segment_store import SegmentedStore
+
+LISTS = ("transactions",)
+
+
+def timed_ms(fn):
+    start = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def segment_files(directory):
+    return sorted(f for f in os.listdir(directory) if f.endswith(".seg"))
+
+
+def entries(store):
+    with open(os.path.join(store.directory, "manifest.json"), encoding="utf-8") as f:
+        return json.load(f)["lists"]["transactions"]
+
+
+def quiet(fn):
+    with contextlib.redirect_stdout(io.StringIO()) as out:
+        result = fn()
+    return result, out.getvalue()
+
+
+# --- Timings ---
+
+def bench_size(n, workdir):
+    data = {"transactions": list(datagen.transactions(n))}
+    json_path = os.path.join(workdir, f"ledger_{n}.json")
+    store = SegmentedStore(os.path.join(workdir, f"ledger_{n}.segments"), LISTS)
+
+    def json_save():
+        with open(json_path, "w") as f:
+            json.dump(data, f, indent=4)
+
+    def json_load():
+        with open(json_path) as f:
+            return json.load(f)
+
+    json_save_ms, _ = timed_ms(json_save)
+    json_load_ms, _ = timed_ms(json_load)
+    store.save(data)
+    load_ms, loaded = timed_ms(store.load)
+    assert loaded == data
+
+    # Appending one transaction rewrites only the last segment (plus the manifest)
+    before = set(segment_files(store.directory))
+    data["transactions"].append({"id": n + 1, "date": "2025-01-01 00:00:00", "type": "income",
+                                 "amount": 1.0, "description": "Bench"})
+    append_json_ms, _ = timed_ms(json_save)
+    append_ms, _ = timed_ms(lambda: store.save(data))
+    written = set(segment_files(store.directory)) - before
+    assert len(written) == 1, written
+
+    # Recovery: tear the last segment mid-line and reload
+    last = os.path.join(store.directory, entries(store)[-1]["file"])
+    with open(last, "r+b") as f:
+        f.truncate(os.path.getsize(last) - 10)
+    recovery_ms, recovered = timed_ms(store.load)
+    assert recovered["transactions"] == data["transactions"][:-1]
+    assert len(store.last_recovery) == 1, store.last_recovery
+
+    print(f"{n:>9,} items | JSON save {json_save_ms:8.1f} load {json_load_ms:8.1f} append {append_json_ms:8.1f} ms"
+          f" | segmented load {load_ms:8.1f} append {append_ms:7.1f} load+repair {recovery_ms:8.1f} ms")
+    return recovery_ms - load_ms
+
+
+def bench_repair_cost(sizes, workdir):
+    """Time spent repairing one torn segment, independent of how many segments exist."""
+    print("\nRepair cost of one damaged segment (salvage + rewrite, median of 5):")
+    for n in sizes:
+        store = SegmentedStore(os.path.join(workdir, f"repair_{n}.segments"), LISTS)
+        store.save({"transactions": list(datagen.transactions(n))})
+        last = os.path.join(store.directory, entries(store)[-1]["file"])
+        with open(last, "rb") as f:
+            blob = f.read()[:-10]
+        samples = []
+        for _ in range(5):
+            start = time.perf_counter()
+            items, dropped = segment_store.salvage_segment(blob)
+            store._write_segment("scratch", 0, segment_store.encode_segment(items))
+            samples.append((time.perf_counter() - start) * 1000)
+        assert dropped == 1
+        print(f"  {n:>9,} items ({len(entries(store)):>4} segments): {sorted(samples)[2]:6.2f} ms")
+
+
+# --- Fault injection ---
+
+def check_faults(workdir):
+    n = 5 * segment_store.SEGMENT_SIZE + 10
+    original = {"transactions": list(datagen.transactions(n)), "note": "header survives"}
+    directory = os.path.join(workdir, "faults.segments")
+    store = SegmentedStore(directory, LISTS)
+
+    # Flipped byte in the middle of segment 2: its prefix is kept, the rest intact
+    store.save(original)
+    target = entries(store)[2]
+    path = os.path.join(directory, target["file"])
+    with open(path, "r+b") as f:
+        f.seek(os.path.getsize(path) // 2)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(bytes([byte[0] ^ 0x01]))
+    untouched = [e["file"] for i, e in enumerate(entries(store)) if i != 2]
+    data = store.load()
+    size = segment_store.SEGMENT_SIZE
+    kept = len(data["transactions"]) - (n - size)
+    assert 0 < kept < size, kept
+    assert data["transactions"][:2 * size] == original["transactions"][:2 * size]
+    assert data["transactions"][2 * size:2 * size + kept] == original["transactions"][2 * size:2 * size + kept]
+    assert data["transactions"][2 * size + kept:] == original["transactions"][3 * size:]
+    assert data["note"] == "header survives"
+    assert [e["file"] for i, e in enumerate(entries(store)) if i != 2] == untouched
+    assert any(".corrupt-" in f for f in os.listdir(directory)), "damaged segment was not backed up"
+    assert store.load()["transactions"] == data["transactions"] and not store.last_recovery
+    print(f"flipped byte: kept {kept}/{size} items of the damaged segment, other segments untouched")
+
+    # Missing segment file: only that segment is lost
+    store.save(original)
+    os.remove(os.path.join(directory, entries(store)[1]["file"]))
+    data = store.load()
+    assert data["transactions"] == original["transactions"][:size] + original["transactions"][2 * size:]
+    print("missing segment: only its items were lost")
+
+    # Damaged manifest: the previous manifest (and its segments) still load
+    store.save(original)
+    store.save(original)  # .bak now describes the same state
+    with open(os.path.join(directory, "manifest.json"), "w") as f:
+        f.write("{ not json")
+    assert store.load() == original
+    assert any("previous manifest" in p for p in store.last_recovery), store.last_recovery
+    print("damaged manifest: fell back to the previous one")
+
+    # Crash between writing a new segment and swapping the manifest: old state loads
+    store.save(original)
+    orphan = os.path.join(directory, "transactions-000005-deadbeef.seg")
+    with open(orphan, "w") as f:
+        f.write("half a save\n")
+    with open(os.path.join(directory, "leftover.seg.tmp"), "w") as f:
+        f.write("torn")
+    assert store.load() == original
+    store.save(original)
+    assert not os.path.exists(orphan) and not os.path.exists(os.path.join(directory, "leftover.seg.tmp"))
+    print("crash before manifest swap: old state loaded, orphans cleaned on next save")
+
+    # Corrupt legacy JSON: backed up, and the backup is byte-for-byte the original
+    old_data_file = tracker.DATA_FILE
+    tracker.DATA_FILE = os.path.join(workdir, "finance_data.json")
+    try:
+        damaged = b'{"transactions": [{"id": 1, "amount": 5'
+        with open(tracker.DATA_FILE, "wb") as f:
+            f.write(damaged)
+        summary, output = quiet(tracker.get_summary)
+        assert summary["total_transactions"] == 0
+        assert "corrupted" in output
+        backups = [f for f in os.listdir(workdir) if f.startswith("finance_data.json.corrupt-")]
+        assert len(backups) == 1, backups
+        with open(os.path.join(workdir, backups[0]), "rb") as f:
+            assert f.read() == damaged
+        quiet(lambda: tracker.add_transaction("income", 10, "After recovery"))
+        assert tracker.get_summary()["total_transactions"] == 1
+        with open(os.path.join(workdir, backups[0]), "rb") as f:
+            assert f.read() == damaged, "the backup was overwritten"
+    finally:
+        tracker.DATA_FILE = old_data_file
+    print("corrupt legacy JSON: moved to a .corrupt- backup and never overwritten")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000,500000")
+    parser.add_argument("--quick", action="store_true", help="small stores, for a test run")
+    args = parser.parse_args()
+    if args.quick:
+        args.sizes = "2000,20000"
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for n in sizes:
+            bench_size(n, workdir)
+        bench_repair_cost(sizes, workdir)
+        print()
+        check_faults(workdir)
+
+
+if __name__ == "__main__":
+    main()
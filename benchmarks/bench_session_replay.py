@@ -0,0 +1,53 @@
+"""Load test: replay generated sessions against every app, headless and concurrent.
+
+Generates a JSONL script per app with session_replay.generate_script, then
+replays each one by a single headless user and by --users concurrent users,
+printing ops/s and latency percentiles per operation. Every operation must
+either succeed or fail with a business error; anything else aborts the run.
+Each replay must leave the apps' module globals (data files) as it found them.
+
+Run from the repository root:
+    python benchmarks/bench_session_replay.py [--ops 500] [--users 16]
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import atm
+import hospital
+import inventory
+import library
+import tracker
+from session_replay import DRIVERS, format_report, generate_script, replay, save_script
+
+
+def app_globals():
+    return (tracker.DATA_FILE, inventory.DATA_FILE, hospital.DATA_FILE, library.library_inventory, atm.ledger)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=500, help="operations per script")
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--apps", default=",".join(DRIVERS))
+    args = parser.parse_args()
+
+    before = app_globals()
+    with tempfile.TemporaryDirectory() as directory:
+        for app in args.apps.split(","):
+            path = os.path.join(directory, f"{app}.jsonl")
+            save_script(generate_script(app, args.ops, seed=1), path)
+
+            for users in (1, args.users):
+                report = replay([path], users=users)
+                assert report["ops"] == args.ops * users, report["ops"]
+                assert all(a is b for a, b in zip(app_globals(), before)), "replay left app globals patched"
+                print(f"\n=== {app}, {users} user(s) ===")
+                print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
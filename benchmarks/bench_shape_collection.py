@@ -0,0 +1,69 @@
+"""Benchmark: ShapeCollection bulk areas and range queries vs. per-object area().
+
+Run from the repository root:
+    python benchmarks/bench_shape_collection.py [--shapes 1000000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shape_collection import ShapeCollection
+from task_models import Circle, Rectangle
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shapes", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=1_000)
+    args = parser.parse_args()
+
+
+    rng = random.Random(4)
+    shapes = [
+        Circle(rng.uniform(0.1, 10)) if rng.random() < 0.5
+        else Rectangle(rng.uniform(0.1, 20), rng.uniform(0.1, 20))
+        for _ in range(args.shapes)
+    ]
+
+    def per_object_totals():
+        totals = {}
+        for s in shapes:
+            name = type(s).__name__
+            totals[name] = totals.get(name, 0.0) + s.area()
+        return totals
+
+    expected, slow = timed(per_object_totals)
+    collection, build = timed(lambda: ShapeCollection(shapes))
+    totals, fast = timed(collection.totals_by_type)
+    for name, (_, total) in totals.items():
+        assert abs(total - expected[name]) <= 1e-9 * expected[name], name
+    per_object = np.array([s.area() for s in shapes])
+    assert np.allclose(collection.areas(), per_object, rtol=1e-12, atol=0)
+
+    print(f"Per-object area() totals:   {slow * 1000:9.1f} ms")
+    print(f"ShapeCollection build:      {build * 1000:9.1f} ms")
+    print(f"Vectorized totals by type:  {fast * 1000:9.1f} ms ({slow / fast:,.0f}x)")
+
+    bounds = [sorted((rng.uniform(0, 300), rng.uniform(0, 300))) for _ in range(args.queries)]
+    _, elapsed = timed(collection._sorted_index)
+    print(f"Area index build:           {elapsed * 1000:9.1f} ms")
+    _, elapsed = timed(lambda: [collection.count_in_area_range(a, b) for a, b in bounds])
+    print(f"Range counts:               {args.queries / elapsed:>9,.0f} queries/s")
+    a, b = bounds[0]
+    assert collection.count_in_area_range(a, b) == int(((per_object >= a) & (per_object <= b)).sum())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""Benchmark: writer throughput with and without a concurrent reporter.
+
+Writer threads run inventory purchases (or tracker add_transaction calls)
+for --seconds while a reporter thread keeps producing summaries, in three
+modes:
+
+  none      no reporter
+  snapshot  the reporter reads published immutable versions (summary(),
+            get_summary()) and never takes the writer lock; every tenth
+            inventory report also rescans the whole snapshot as a check
+  locked    the reporter holds the writer lock while it scans the live
+            state, which is what a consistent read costs without versions
+
+Both reporters run at the same pace (--interval), so the modes differ only
+in whether writers wait for the reporter. With one CPU and the GIL a busy
+reporter still takes its share of CPU in either mode; the snapshot mode's
+gain shows up as writer latency that no longer includes a locked scan.
+
+Every report is checked for consistency: purchases move value from stock to
+earnings, so stock value + earnings must stay constant, and every tracker
+transaction here is 1.00 of income, so income must equal the count added.
+A tracker summary taken between a writer's save and its publish must not
+wait for that writer either.
+
+Run from the repository root:
+    python benchmarks/bench_snapshot_reads.py [--products 200000] [--writers 4] [--seconds 3]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import datagen
+import inventory
+import tracker
+
+MODES = ("none", "snapshot", "locked")
+
+
+def percentile(samples, pct):
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))] if samples else 0.0
+
+
+def run(writer, reporter, writers, seconds, interval):
+    """Runs writer threads (and a reporter, if any); returns (ops, latencies, reports, bad reports)."""
+    stop = threading.Event()
+    latencies = []
+    reports = [0, 0]  # done, inconsistent
+
+    def write_loop(seed):
+        rng = random.Random(seed)
+        samples = []
+        while not stop.is_set():
+            start = time.perf_counter()
+            writer(rng)
+            samples.append(time.perf_counter() - start)
+        latencies.extend(samples)
+
+    def report_loop():
+        while not stop.is_set():
+            reports[0] += 1
+            if not reporter():
+                reports[1] += 1
+            if interval:
+                time.sleep(interval)
+
+    threads = [threading.Thread(target=write_loop, args=(i,)) for i in range(writers)]
+    if reporter is not None:
+        threads.append(threading.Thread(target=report_loop))
+    with contextlib.redirect_stdout(io.StringIO()):
+        for t in threads:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in threads:
+            t.join()
+    latencies.sort()
+    return len(latencies), latencies, reports[0], reports[1]
+
+
+def print_row(app, mode, seconds, result):
+    ops, latencies, reports, bad = result
+    print(f"{app:<10} {mode:<9} | writers {ops / seconds:8,.0f} ops/s | p50 {percentile(latencies, 50) * 1000:8.3f}"
+          f" p99 {percentile(latencies, 99) * 1000:8.3f} max {latencies[-1] * 1000:8.3f} ms"
+          f" | reports {reports:>5,} | inconsistent {bad}")
+
+
+# --- Inventory ---
+
+def bench_inventory(args, workdir):
+    inventory.DATA_FILE = os.path.join(workdir, "inventory_data.json")
+    # Deep stock, so purchases never run out
+    products = ({**p, "quantity": 10 ** 6} for p in datagen.products(args.products))
+    header = {"total_earnings": 0.0, "next_product_id": 1001 + args.products}
+    datagen.write_json_stream(inventory.DATA_FILE, header, "products", products)
+    results = {}
+    for mode in MODES:
+        with contextlib.redirect_stdout(io.StringIO()):
+            # Persistence is the same in every mode and would swamp the read path; saves are batched here
+            system = inventory.InventorySystem(autosave=args.autosave)
+        ids = [p.id for p in system.products]
+        conserved = system.version.stock_value + system.version.total_earnings
+
+        def writer(rng):
+            system.purchase(ids[rng.randrange(len(ids))], 1)
+
+        def snapshot_reporter():
+            version = system.snapshot()
+            summary = version.summary()
+            consistent = abs(summary["total_stock_value"] + summary["total_earnings"] - conserved) < 1e-6 * conserved
+            if version.number % 10 == 0 or not consistent:
+                scanned = sum(p.price * p.quantity for p in version.products)
+                consistent = consistent and abs(scanned - version.stock_value) < 1e-6 * conserved
+            return consistent
+
+        def locked_reporter():
+            with system._lock:
+                scanned = sum(p.price * p.quantity for p in system.products)
+                earnings = system.total_earnings
+            return abs(scanned + earnings - conserved) < 1e-6 * conserved
+
+        reporter = {"none": None, "snapshot": snapshot_reporter, "locked": locked_reporter}[mode]
+        results[mode] = run(writer, reporter, args.writers, args.seconds, args.interval)
+        print_row("inventory", mode, args.seconds, results[mode])
+        assert results[mode][3] == 0, f"inventory {mode}: inconsistent reports"
+        system.close()
+    return results
+
+
+# --- Tracker ---
+
+def bench_tracker(args, workdir):
+    results = {}
+    for mode in MODES:
+        tracker.DATA_FILE = os.path.join(workdir, f"finance_data_{mode}.json")
+        datagen.write_tracker_file(tracker.DATA_FILE, args.transactions)
+        start = tracker.get_summary()
+
+        def writer(rng):
+            tracker.add_transaction("income", 1.0, "Benchmark")
+
+        def snapshot_reporter():
+            summary = tracker.get_summary()
+            added = summary["total_transactions"] - start["total_transactions"]
+            return abs(summary["total_income"] - start["total_income"] - added) < 1e-6
+
+        def locked_reporter():
+            with tracker._lock_for(tracker.DATA_FILE):
+                data = tracker._load_data()
+            income, _ = tracker._totals(data["transactions"])
+            added = len(data["transactions"]) - start["total_transactions"]
+            return abs(income - start["total_income"] - added) < 1e-6
+
+        reporter = {"none": None, "snapshot": snapshot_reporter, "locked": locked_reporter}[mode]
+        results[mode] = run(writer, reporter, args.writers, args.seconds, args.interval)
+        print_row("tracker", mode, args.seconds, results[mode])
+        assert results[mode][3] == 0, f"tracker {mode}: inconsistent reports"
+        assert tracker.get_summary()["total_transactions"] == start["total_transactions"] + results[mode][0]
+    return results
+
+
+def check_tracker_mid_write(workdir):
+    """get_summary while a writer has saved but not yet published returns at once."""
+    tracker.DATA_FILE = os.path.join(workdir, "finance_data_mid_write.json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        tracker.add_transaction("income", 5.0, "Benchmark")
+    published = tracker.get_summary()
+    summaries = []
+    with tracker._lock_for(tracker.DATA_FILE):
+        # What add_transaction does before it publishes: the saved store is now ahead
+        data = tracker._load_data()
+        data["transactions"].append(tracker.new_transaction(data["transactions"], "income", 1.0, "Benchmark"))
+        tracker._save_data(data)
+        reader = threading.Thread(target=lambda: summaries.append(tracker.get_summary()))
+        reader.start()
+        reader.join(timeout=2.0)
+        assert not reader.is_alive(), "get_summary waited for a writer"
+    assert summaries == [published]
+    print("tracker: a summary between a writer's save and publish returns the last version at once")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=200000)
+    parser.add_argument("--transactions", type=int, default=5000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--interval", type=float, default=0.01, help="reporter pause between reports (s)")
+    parser.add_argument("--autosave", action="store_true", help="save inventory after every purchase")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        old_files = inventory.DATA_FILE, tracker.DATA_FILE
+        try:
+            for results in (bench_inventory(args, workdir), bench_tracker(args, workdir)):
+                none, snapshot, locked = (results[mode][0] for mode in MODES)
+                print(f"  writer throughput with a reporter: snapshot {snapshot / none:5.0%} of none, "
+                      f"locked {locked / none:5.0%} of none\n")
+            check_tracker_mid_write(workdir)
+        finally:
+            inventory.DATA_FILE, tracker.DATA_FILE = old_files
+
+
+if __name__ == "__main__":
+    main()
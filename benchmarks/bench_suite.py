@@ -0,0 +1,263 @@
+"""Benchmark suite: hot operations of the CLI apps at 1k to 10M records.
+
+For each scale, builds deterministic synthetic state (see datagen.py) and
+times the operations each app performs per user action:
+
+    tracker    add_transaction, get_summary
+    inventory  add_product, purchase (the core of process_purchase)
+    hospital   add_doctor, book (the core of book_appointment)
+    library    check_out / check_in (the cores of borrow_book / return_book)
+    atm        deposit, withdraw (the ledger calls behind atm.deposit / withdraw)
+
+Each case runs --ops operations or until its --budget of seconds is spent
+(at least 3 operations). Results are written as JSON, and with --baseline they
+are compared against a stored run: any case whose median time per operation
+grew by more than --threshold (and by more than a few microseconds of timer
+noise) is reported and the exit status is 1.
+
+Run from the repository root:
+    python benchmarks/bench_suite.py [--scales 1000,10000] [--output results.json]
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json [--threshold 0.5]
+    python benchmarks/bench_suite.py --save-baseline benchmarks/baseline.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import atm
+import hospital
+import inventory
+import library
+import tracker
+
+import datagen
+
+
+# --- Cases ---
+# Each case is (name, setup, op): setup(n, workdir) builds the state and
+# returns it, op(state, i) performs the i-th operation.
+
+def tracker_setup(n, workdir):
+    tracker.DATA_FILE = os.path.join(workdir, "finance_data.json")
+    datagen.write_tracker_file(tracker.DATA_FILE, n)
+    tracker._load_data()  # Import the JSON file into the segmented store outside the timed ops
+    return n
+
+
+def tracker_add(n, i):
+    tracker.add_transaction("expense" if i % 3 else "income", 10 + i % 90, "Benchmark")
+
+
+def tracker_summary(n, i):
+    assert tracker.get_summary()["total_transactions"] >= n
+
+
+def inventory_setup(n, workdir):
+    inventory.DATA_FILE = os.path.join(workdir, "inventory_data.json")
+    datagen.write_inventory_file(inventory.DATA_FILE, n)
+    return inventory.InventorySystem()
+
+
+def inventory_add(system, i):
+    # Alternate new products and restocks of existing ones (both scan the catalog by name)
+    name = f"New Product {i}" if i % 2 else f"Product {i * 7919 % len(system.products):08d}"
+    system.add_product(name, 9.99, 5)
+
+
+def inventory_purchase(system, i):
+    product = system.products[i * 7919 % len(system.products)]
+    if product.quantity == 0:
+        system.restock(product.id, 10)  # Through the API, so the lock, version and event log see it
+    system.purchase(product.id, 1)
+
+
+def hospital_setup(n, workdir):
+    hospital.DATA_FILE = os.path.join(workdir, "hospital_data.json")
+    datagen.write_hospital_file(hospital.DATA_FILE, max(n // 10, 1), n)
+    return hospital.HospitalSystem()
+
+
+def hospital_add(system, i):
+    system.add_doctor(f"Bench{i}", "General Medicine", "Mon-Fri 9AM-5PM")
+
+
+def hospital_book(system, i):
+    doctor = system.doctors[i * 7919 % len(system.doctors)]
+    system.book(doctor.id, hospital.Patient(f"Patient{i}", 30 + i % 50, "checkup"))
+
+
+def library_setup(n, workdir):
+    library.library_inventory = dict(datagen.books(n))
+    return list(library.library_inventory)
+
+
+def library_borrow(titles, i):
+    title = titles[i * 7919 % len(titles)]
+    if library.library_inventory[title] == 0:
+        library.check_in(title)
+    library.check_out(title)
+
+
+def library_return(titles, i):
+    library.check_in(titles[i * 7919 % len(titles)])
+
+
+def atm_setup(n, workdir):
+    directory = os.path.join(workdir, "atm_ledger")
+    datagen.write_ledger_dir(directory, n)
+    ledger = atm.open_ledger(directory)
+    return ledger, sorted(ledger.balances)
+
+
+def atm_deposit(state, i):
+    ledger, accounts = state
+    ledger.deposit(accounts[i * 7919 % len(accounts)], 100 + i % 5_000)
+
+
+def atm_withdraw(state, i):
+    ledger, accounts = state
+    account = accounts[i * 7919 % len(accounts)]
+    cents = min(100 + i % 5_000, ledger.balance(account))
+    if cents > 0:
+        ledger.withdraw(account, cents)
+
+
+def atm_teardown(state):
+    state[0].close()
+
+
+CASES = [
+    ("tracker.add_transaction", tracker_setup, tracker_add),
+    ("tracker.get_summary", tracker_setup, tracker_summary),
+    ("inventory.add_product", inventory_setup, inventory_add),
+    ("inventory.purchase", inventory_setup, inventory_purchase),
+    ("hospital.add_doctor", hospital_setup, hospital_add),
+    ("hospital.book", hospital_setup, hospital_book),
+    ("library.check_out", library_setup, library_borrow),
+    ("library.check_in", library_setup, library_return),
+    ("atm.deposit", atm_setup, atm_deposit),
+    ("atm.withdraw", atm_setup, atm_withdraw),
+]
+TEARDOWN = {"atm.deposit": atm_teardown, "atm.withdraw": atm_teardown}
+
+
+# --- Runner ---
+
+NOISE_MS = 0.005  # Slowdowns smaller than this (timer jitter on sub-microsecond ops) never count
+
+
+def percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+
+def run_case(name, setup, op, n, max_ops, budget):
+    """Builds the state for n records and times up to max_ops operations."""
+    with tempfile.TemporaryDirectory() as workdir:
+        start = time.perf_counter()
+        state = setup(n, workdir)
+        setup_time = time.perf_counter() - start
+
+        timings = []
+        with contextlib.redirect_stdout(io.StringIO()) as sink:
+            begin = time.perf_counter()
+            for i in range(max_ops):
+                start = time.perf_counter()
+                op(state, i)
+                timings.append(time.perf_counter() - start)
+                sink.seek(0)
+                sink.truncate()
+                if len(timings) >= 3 and time.perf_counter() - begin > budget:
+                    break
+        if name in TEARDOWN:
+            TEARDOWN[name](state)
+
+    timings.sort()
+    total = sum(timings)
+    return {
+        "case": name,
+        "n": n,
+        "ops": len(timings),
+        "setup_s": round(setup_time, 4),
+        "mean_ms": total * 1000 / len(timings),
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "ops_per_sec": len(timings) / total if total else float("inf"),
+    }
+
+
+def compare(results, baseline, threshold, noise_ms=NOISE_MS):
+    """Returns (key, baseline ms, current ms) for every case slower than allowed."""
+    previous = baseline.get("results", {})
+    regressions = []
+    for key, result in results.items():
+        if key in previous:
+            before = previous[key]["p50_ms"]
+            after = result["p50_ms"]
+            if after > before * (1 + threshold) and after - before > noise_ms:
+                regressions.append((key, before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1000,10000",
+                        help="comma-separated record counts, e.g. 1000,100000,10000000")
+    parser.add_argument("--ops", type=int, default=200, help="max operations per case")
+    parser.add_argument("--budget", type=float, default=2.0, help="seconds per case")
+    parser.add_argument("--cases", default="", help="comma-separated case name prefixes")
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--baseline", help="compare against this results JSON")
+    parser.add_argument("--threshold", type=float, default=0.5,
+                        help="allowed slowdown vs. baseline (0.5 = 50%%)")
+    parser.add_argument("--save-baseline", help="write these results as the new baseline")
+    args = parser.parse_args()
+
+    scales = [int(s) for s in args.scales.split(",") if s]
+    prefixes = [p for p in args.cases.split(",") if p]
+    cases = [c for c in CASES if not prefixes or c[0].startswith(tuple(prefixes))]
+
+    results = {}
+    for n in scales:
+        for name, setup, op in cases:
+            result = run_case(name, setup, op, n, args.ops, args.budget)
+            results[f"{name}@{n}"] = result
+            print(f"{name:<24} n={n:>10,} | {result['ops']:>5} ops | "
+                  f"mean {result['mean_ms']:10.4f} ms | p95 {result['p95_ms']:10.4f} ms | "
+                  f"{result['ops_per_sec']:>12,.0f} ops/s | setup {result['setup_s']:.2f}s")
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "ops": args.ops,
+            "budget": args.budget,
+        },
+        "results": results,
+    }
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for key, before, after in regressions:
+            print(f"REGRESSION {key}: {before:.4f} ms -> {after:.4f} ms "
+                  f"(+{(after / before - 1) * 100:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}.")
+
+
+if __name__ == "__main__":
+    main()
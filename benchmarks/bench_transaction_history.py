@@ -0,0 +1,103 @@
+"""Benchmark: balance reconstruction and statements on a large BankAccount history.
+
+Writes a synthetic JSONL history (with a checkpoint every CHECKPOINT_EVERY
+records) and compares a full replay with checkpoint-based reconstruction and
+a one-day statement. Also checks that a BankAccount with only a legacy
+plain-text history imports it instead of starting from zero.
+
+Run from the repository root:
+    python benchmarks/bench_transaction_history.py [--lines 10000000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_models import BankAccount
+from transaction_history import CHECKPOINT_EVERY, TransactionHistory
+from transaction_log import TransactionLogger
+
+
+def write_history(path, lines, seed=3):
+    """Writes `lines` records one second apart; returns (final balance, first ts)."""
+    rng = random.Random(seed)
+    ts = datetime(2025, 1, 1)
+    balance = 50_000  # cents
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f'{{"ts":"{ts.isoformat()}","type":"initial","amount":500.0,"balance":500.0}}\n')
+        for i in range(1, lines):
+            ts += timedelta(seconds=1)
+            if i % (CHECKPOINT_EVERY + 1) == 0:
+                kind, cents = "checkpoint", 0
+            else:
+                cents = rng.randint(1, 10_000)
+                kind = "deposit" if rng.random() < 0.5 or cents > balance else "withdrawal"
+                balance += cents if kind == "deposit" else -cents
+            f.write(f'{{"ts":"{ts.isoformat()}","type":"{kind}","amount":{cents / 100},'
+                    f'"balance":{balance / 100}}}\n')
+    return balance / 100
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def check_legacy_import(directory):
+    """An account whose history predates JSONL keeps its balance and records."""
+    legacy = os.path.join(directory, "legacy")
+    os.makedirs(legacy)
+    with open(os.path.join(legacy, "Alice_transactions.txt"), 'w') as f:
+        f.write("Initial Balance: 500.00\nDeposit: +100.50\nWithdrawal: -50.00\n")
+    logger = TransactionLogger()
+    with contextlib.chdir(legacy), contextlib.redirect_stdout(io.StringIO()):
+        account = BankAccount("Alice", logger=logger)
+        account.deposit(10)
+        assert account.statement()["closing_balance"] == 560.50
+        logger.close()
+        # Imported once: reopening reads the JSONL file, which now holds every transaction
+        assert BankAccount("Alice", logger=logger).statement()["transactions"] == 3
+    logger.close()
+    print("Legacy plain-text history: imported once, balance carried over")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench_transactions.jsonl")
+        expected, elapsed = timed(lambda: write_history(path, args.lines))
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"Generated {args.lines:,} lines ({size_mb:,.0f} MB) in {elapsed:.1f}s")
+
+        history = TransactionHistory(path)
+        (balance, replayed), elapsed = timed(history.rebuild)
+        assert abs(balance - expected) < 0.005, (balance, expected)
+        print(f"Checkpoint rebuild: {elapsed * 1000:10.1f} ms ({replayed} records replayed)")
+
+        full, elapsed = timed(history.rebuild_full)
+        assert abs(full - expected) < 0.005, (full, expected)
+        print(f"Full replay:        {elapsed * 1000:10.1f} ms ({args.lines / elapsed:,.0f} lines/s)")
+
+        # A one-day statement from the middle of the history
+        day = datetime(2025, 1, 1) + timedelta(seconds=args.lines // 2)
+        start, end = day.isoformat(), (day + timedelta(days=1)).isoformat()
+        stmt, elapsed = timed(lambda: history.statement(start, end))
+        print(f"One-day statement:  {elapsed * 1000:10.1f} ms "
+              f"({stmt['transactions']:,} transactions, closing ${stmt['closing_balance']:,.2f})")
+
+        check_legacy_import(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark: batched TransactionLogger vs. open/append/close per record.
+
+Both sides write the same prebuilt JSONL lines, so the comparison measures
+file handling only; the "serialization only" line is the ceiling set by
+json.dumps, which the logger still pays per record. Each configuration
+writes into its own fresh directory and the best of --repeat runs is kept:
+sharing one directory made later configurations look slower only because
+they opened files in a directory that already held the earlier ones.
+
+Also checks that records logged to an otherwise idle logger reach the
+file within its flush interval, without another log() or flush() call.
+
+Run from the repository root:
+    python benchmarks/bench_transaction_log.py [--accounts 2000] [--records 100000] [--quick]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from transaction_log import FLUSH_EVERY, MAX_OPEN_FILES, TransactionLogger, make_record, read_records
+
+MIN_SPEEDUP = 1.5  # Default batched logger vs. open/append/close per record (about 2-3x measured)
+CONFIGS = ((64, 100), (256, 100), (64, 1_000), (1_024, 1_000))  # (max_open_files, flush_every)
+DEFAULT = (MAX_OPEN_FILES, FLUSH_EVERY)
+
+
+def serialize_only(records):
+    start = time.perf_counter()
+    for record in records:
+        json.dumps(record, separators=(',', ':'))
+    return time.perf_counter() - start
+
+
+def per_call(paths, picks, records):
+    """The original BankAccount._save_transaction pattern, writing the same JSON lines."""
+    start = time.perf_counter()
+    for i, record in zip(picks, records):
+        with open(paths[i], 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, separators=(',', ':')) + "\n")
+    return time.perf_counter() - start
+
+
+def batched(paths, picks, records, max_open_files, flush_every):
+    logger = TransactionLogger(max_open_files=max_open_files, flush_every=flush_every)
+    start = time.perf_counter()
+    for i, record in zip(picks, records):
+        logger.log(paths[i], record)
+    logger.close()
+    elapsed = time.perf_counter() - start
+    assert logger.open_files() == 0
+    return elapsed
+
+
+def best_of(repeat, parent, accounts, expected, run):
+    """Best time of `repeat` runs, each writing `accounts` files into a fresh directory."""
+    times = []
+    for _ in range(repeat):
+        directory = tempfile.mkdtemp(dir=parent)
+        paths = [os.path.join(directory, f"acct{i}.jsonl") for i in range(accounts)]
+        times.append(run(paths))
+        count = sum(sum(1 for _ in read_records(p)) for p in paths if os.path.exists(p))
+        assert count == expected, f"parsed {count} of {expected} records"
+    return min(times)
+
+
+def check_idle_flush(directory):
+    """A few records and then silence: the background flush writes them out."""
+    path = os.path.join(directory, "idle.jsonl")
+    logger = TransactionLogger(flush_every=1_000, flush_interval=0.2)
+    for i in range(3):
+        logger.log(path, make_record("deposit", i, i))
+    assert not os.path.exists(path) or not list(read_records(path))
+    deadline = time.monotonic() + 2.0
+    while time.monotonic() < deadline and not (os.path.exists(path) and len(list(read_records(path))) == 3):
+        time.sleep(0.05)
+    assert len(list(read_records(path))) == 3, "idle records were not flushed on the interval"
+    logger.close()
+    print("idle logger: buffered records written within the flush interval")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=2_000)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="small run that still checks the speedup")
+    args = parser.parse_args()
+    if args.quick:
+        args.accounts, args.records = 200, 30_000
+
+    rng = random.Random(7)
+    picks = [rng.randrange(args.accounts) for _ in range(args.records)]
+    records = [make_record("deposit", i % 100, 0) for i in picks]
+
+    def rate(elapsed):
+        return f"{args.records / elapsed:>10,.0f} records/s"
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"serialization only (ceiling):             {rate(serialize_only(records))}")
+
+        baseline = best_of(args.repeat, directory, args.accounts, args.records,
+                           lambda paths: per_call(paths, picks, records))
+        print(f"open/append/close per record:             {rate(baseline)}")
+
+        for max_open, flush_every in CONFIGS:
+            elapsed = best_of(args.repeat, directory, args.accounts, args.records,
+                              lambda paths: batched(paths, picks, records, max_open, flush_every))
+            default = (max_open, flush_every) == DEFAULT
+            print(f"batched (pool={max_open:>4}, flush_every={flush_every:>5}){' *' if default else '  '}: "
+                  f"{rate(elapsed)}  {baseline / elapsed:4.1f}x")
+            if default:
+                assert baseline / elapsed >= MIN_SPEEDUP, \
+                    f"default logger only {baseline / elapsed:.1f}x faster than per-record open/append/close"
+        print("* default settings")
+
+        check_idle_flush(directory)
+
+
+if __name__ == "__main__":
+    main()
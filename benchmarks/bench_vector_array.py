@@ -0,0 +1,81 @@
+"""Benchmark: summing vectors with VectorArray vs. one task_models.Vector per element.
+
+Also checks that NumPy operands on the left defer to VectorArray's
+reflected operators.
+
+Run from the repository root:
+    python benchmarks/bench_vector_array.py [--vectors 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_models import Vector
+from vector_array import VectorArray
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def check_numpy_operands():
+    """ndarray and NumPy scalars on the left still give VectorArray results."""
+    batch = VectorArray([1.0, 2.0, 3.0], [4.0, 5.0, 6.0])
+    scaled = np.array([1.0, 2.0, 3.0]) * batch
+    assert isinstance(scaled, VectorArray) and scaled == VectorArray([1.0, 4.0, 9.0], [4.0, 10.0, 18.0])
+    assert isinstance(np.float64(2.0) * batch, VectorArray)
+    try:
+        np.zeros(3) + batch
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("ndarray + VectorArray should not broadcast into an object array")
+    print("NumPy operands:         ndarray * VectorArray -> VectorArray, ndarray + VectorArray -> TypeError")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=1_000_000)
+    args = parser.parse_args()
+    n = args.vectors
+
+    rng = np.random.default_rng(9)
+    xs, ys = rng.integers(-100, 100, n), rng.integers(-100, 100, n)
+
+    objects = [Vector(int(x), int(y)) for x, y in zip(xs, ys)]
+    shift = Vector(1, -1)
+
+    def object_loop():
+        total = Vector(0, 0)
+        for v in objects:
+            total = total + (v + shift)
+        return total
+
+    batch = VectorArray(xs, ys)
+
+    def batched():
+        return (batch + shift).sum()
+
+    expected, slow = timed(object_loop)
+    result, fast = timed(batched)
+    assert (result.x, result.y) == (expected.x, expected.y)
+    print(f"Object-per-vector loop: {n / slow:>14,.0f} vectors/s")
+    print(f"VectorArray:            {n / fast:>14,.0f} vectors/s ({slow / fast:,.0f}x)")
+
+    _, elapsed = timed(lambda: batch.__iadd__(shift))
+    print(f"In-place += Vector:     {n / elapsed:>14,.0f} vectors/s")
+    _, elapsed = timed(lambda: (batch.dot(batch), batch.norm(), batch * 2.5))
+    print(f"dot + norm + scale:     {n / elapsed:>14,.0f} vectors/s")
+
+    check_numpy_operands()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Scaling check: async batch weather fetching against a local stub server.
+
+Each stub request takes --delay seconds. A batch of N cities needs 2N requests,
+so wall time should be about 2N * delay / concurrency; the run fails unless
+concurrency 4 is at least MIN_SPEEDUP[4] times faster than concurrency 1, and
+16 at least MIN_SPEEDUP[16] times. The batch also contains a city the stub
+fails for and one it cannot find; both must come back as per-city errors
+while the rest succeed.
+
+Run from the repository root:
+    python benchmarks/bench_weather_async.py [--cities 48] [--delay 0.05] [--quick]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import info
+from stub_weather_server import StubWeatherServer
+from weather_async import fetch_weather_batch
+
+# Required speedup over concurrency=1 (well below the ideal 4x and 16x, to
+# leave room for scheduling noise and the per-request CPU work)
+MIN_SPEEDUP = {4: 2.0, 16: 4.0}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cities", type=int, default=48)
+    parser.add_argument("--delay", type=float, default=0.05)
+    parser.add_argument("--quick", action="store_true", help="fewer cities, for a run of a few seconds")
+    args = parser.parse_args()
+    if args.quick:
+        args.cities = 16
+
+    cities = [f"City{i}" for i in range(args.cities)] + ["BrokenTown", "Nowhereville"]
+    requests_needed = 2 * args.cities + 2 + 1  # BrokenTown is tried twice, Nowhereville once
+
+    timings = {}
+    with StubWeatherServer(delay=args.delay) as server:
+        server.patch_info(info)
+        for concurrency in (1, 4, 16):
+            start = time.perf_counter()
+            results = fetch_weather_batch(cities, concurrency=concurrency, use_cache=False,
+                                          retries=2, backoff_base=0.01)
+            elapsed = timings[concurrency] = time.perf_counter() - start
+
+            errors = {r["city"]: r["error"] for r in results if r["error"]}
+            assert set(errors) == {"BrokenTown", "Nowhereville"}, errors
+            assert [r["city"] for r in results] == cities
+            ideal = requests_needed * args.delay / concurrency
+            print(f"concurrency={concurrency:>2}: {elapsed:6.2f}s for {len(cities)} cities "
+                  f"(ideal ~{ideal:.2f}s, {len(errors)} per-city errors)")
+
+    for concurrency, minimum in MIN_SPEEDUP.items():
+        speedup = timings[1] / timings[concurrency]
+        assert speedup >= minimum, f"concurrency={concurrency} only {speedup:.1f}x faster than 1"
+    print(f"Wall time scales with the concurrency limit: "
+          f"{timings[1] / timings[4]:.1f}x at 4, {timings[1] / timings[16]:.1f}x at 16")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: bulk grid-bucketed weather vs. one request per site.
+
+Generates sites clustered around a few towns, then fetches current weather
+for all of them against the local stub server: once with a request per site
+(get_current_weather), once through weather_bulk.fetch_weather_bulk. Checks
+that every site gets the forecast of its own grid cell, that a repeat run is
+answered from the cache, and reports upstream calls saved.
+
+Run from the repository root:
+    python benchmarks/bench_weather_bulk.py [--sites 500] [--towns 25] [--delay 0.02]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import info
+from stub_weather_server import StubWeatherServer
+from weather_bulk import GRID_STEP, fetch_weather_bulk, snap
+from weather_cache import LRUCache, TwoLevelCache
+
+
+def clustered_sites(n, towns, seed=3):
+    """n sites within a few km of `towns` random centres."""
+    rng = random.Random(seed)
+    centres = [(rng.uniform(-60, 60), rng.uniform(-170, 170)) for _ in range(towns)]
+    sites = {}
+    for i in range(n):
+        lat, lon = rng.choice(centres)
+        sites[f"site{i:05d}"] = (lat + rng.uniform(-0.05, 0.05), lon + rng.uniform(-0.05, 0.05))
+    return sites
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sites", type=int, default=500)
+    parser.add_argument("--towns", type=int, default=25)
+    parser.add_argument("--delay", type=float, default=0.02, help="stub latency per request (s)")
+    args = parser.parse_args()
+
+    sites = clustered_sites(args.sites, args.towns)
+
+    with StubWeatherServer(delay=args.delay) as server:
+        server.patch_info(info)
+
+        info.CACHE = TwoLevelCache(LRUCache())
+        before = server.stats["requests"]
+        start = time.perf_counter()
+        single = {site: info.get_current_weather(lat, lon) for site, (lat, lon) in sites.items()}
+        single_time = time.perf_counter() - start
+        single_calls = server.stats["requests"] - before
+
+        info.CACHE = TwoLevelCache(LRUCache())
+        before = server.stats["requests"]
+        start = time.perf_counter()
+        bulk, stats = fetch_weather_bulk(sites)
+        bulk_time = time.perf_counter() - start
+        assert server.stats["requests"] - before == stats["upstream_calls"]
+        assert stats["failed_buckets"] == 0
+        assert set(bulk) == set(sites)
+        for site, (lat, lon) in sites.items():
+            expected = info.get_current_weather(*snap(lat, lon))  # Cached by the bulk run
+            assert bulk[site] == expected, site
+            # The stub's temperature follows latitude, so a cell's forecast is close to the site's
+            assert round(abs(bulk[site]["temperature"] - single[site]["temperature"]), 6) <= 0.1
+
+        before = server.stats["requests"]
+        _, repeat = fetch_weather_bulk(sites)
+        assert repeat["upstream_calls"] == 0 and server.stats["requests"] == before
+
+        # No bucketing (tiny grid): still chunked multi-coordinate requests
+        _, exact = fetch_weather_bulk(sites, step=1e-6, use_cache=False)
+
+    print(f"{args.sites} sites around {args.towns} towns, {args.delay * 1000:.0f} ms per request:")
+    print(f"  one request per site: {single_calls:>4} calls, {single_time:6.2f}s")
+    print(f"  grid {GRID_STEP} deg + bulk:  {stats['upstream_calls']:>4} calls, {bulk_time:6.2f}s "
+          f"({stats['buckets']} buckets, {stats['calls_saved']} calls saved)")
+    print(f"  bulk without grid:    {exact['upstream_calls']:>4} calls "
+          f"({exact['buckets']} buckets)")
+    print(f"  repeat within TTL:    {repeat['upstream_calls']:>4} calls")
+
+
+if __name__ == "__main__":
+    main()
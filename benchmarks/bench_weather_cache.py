@@ -0,0 +1,117 @@
+"""Benchmark: info.fetch_weather latency with the two-level response cache.
+
+Runs fully offline: info's shared HTTP session is replaced by a stub that
+answers like Open-Meteo after a simulated network delay. Also checks that
+the hit/miss counters add up exactly when many threads share the cache.
+
+Run from the repository root:
+    python benchmarks/bench_weather_cache.py [--delay 0.05] [--lookups 1000]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import info
+from weather_cache import DiskCache, LRUCache, TwoLevelCache
+
+
+class StubResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class StubSession:
+    """Stands in for info.SESSION; records the URL of every call."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.calls.append(url)
+        time.sleep(self.delay)
+        if url == info.API_URL_GEO:
+            return StubResponse({"results": [{
+                "name": params["name"], "admin1": "Stub State", "country": "Stubland",
+                "latitude": 10.0 + sum(map(ord, params["name"])) % 50, "longitude": 20.0,
+            }]})
+        return StubResponse({"current_weather": {
+            "temperature": 21.5, "windspeed": 12.0, "winddirection": 200, "time": "2025-10-15T08:45",
+        }})
+
+
+def per_lookup_ms(cities, repeat):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            for city in cities:
+                info.fetch_weather(city)
+    return (time.perf_counter() - start) * 1000 / (repeat * len(cities))
+
+
+def check_threaded_counters(threads=8, gets=20_000):
+    """Every get() from every thread is counted exactly once."""
+    cache = TwoLevelCache(LRUCache(maxsize=50))
+    for i in range(50):
+        cache.set(f"key{i}", i, 3600)
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # Switch threads often, so unlocked counters would lose updates
+    try:
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(lambda t: [cache.get(f"key{i % 100}") for i in range(gets)], range(threads)))
+    finally:
+        sys.setswitchinterval(interval)
+    stats = cache.counters()
+    assert stats["memory_hits"] + stats["misses"] == threads * gets, stats
+    assert stats["memory_hits"] == stats["misses"] == threads * gets // 2, stats
+    print(f"Threaded counters: {threads} threads x {gets:,} gets, every one counted")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--delay", type=float, default=0.05, help="simulated seconds per HTTP call")
+    parser.add_argument("--lookups", type=int, default=1_000)
+    args = parser.parse_args()
+
+    info.SESSION = StubSession(args.delay)
+    calls = info.SESSION.calls
+    cities = [f"City{i}" for i in range(10)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        disk = DiskCache(os.path.join(directory, "cache.db"))
+        info.CACHE = TwoLevelCache(LRUCache(), disk)
+
+        miss = per_lookup_ms(cities, 1)
+        assert len(calls) == 2 * len(cities)
+        memory_hit = per_lookup_ms(cities, max(1, args.lookups // len(cities)))
+        assert len(calls) == 2 * len(cities), "cache hits must not call the network"
+
+        # A fresh process: empty memory layer, warm disk layer
+        info.CACHE = TwoLevelCache(LRUCache(), disk)
+        disk_hit = per_lookup_ms(cities, 1)
+        assert len(calls) == 2 * len(cities)
+        disk.close()
+
+        print(f"Cold (2 stubbed HTTP calls): {miss:9.3f} ms per lookup")
+        print(f"Memory hit:                  {memory_hit:9.3f} ms per lookup")
+        print(f"Disk hit (after restart):    {disk_hit:9.3f} ms per lookup")
+        print(f"Cache stats: {info.cache_stats()}")
+
+    check_threaded_counters()
+
+
+if __name__ == "__main__":
+    main()
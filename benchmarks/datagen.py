@@ -0,0 +1,261 @@
+"""Deterministic synthetic data for the benchmark suite.
+
+Every generator takes a size and a seed and yields records in the format the
+corresponding app persists, so the same (n, seed) always gives the same data.
+The write_* helpers stream records straight to disk, which keeps memory flat
+when building files with millions of entries.
+"""
+import json
+import os
+import random
+from datetime import datetime, timedelta
+
+from atm_ledger import JOURNAL_DIR, journal_line, journal_path
+from atm_settlement import SETTLEMENT_DIR, SETTLEMENT_FIELDS, settlement_path
+from inventory_events import apply_event, empty_state, log_path, write_snapshot
+from segment_store import save_state
+
+SEED = 2024
+START = datetime(2024, 1, 1)
+
+DESCRIPTIONS = ["Salary", "Groceries", "Rent", "Utilities", "Freelance", "Dining", "Fuel", "Gift"]
+SPECIALIZATIONS = ["Cardiology", "Pediatrics", "Neurology", "Oncology", "Dermatology", "Orthopedics"]
+TIMINGS = ["Mon-Fri 9AM-5PM", "Mon, Wed, Fri 10AM-2PM", "Tue, Thu 9AM-5PM", "Sat 8AM-12PM"]
+
+
+# --- Generators ---
+
+def transactions(n, seed=SEED):
+    """Tracker ledger entries (finance_data.json "transactions")."""
+    rng = random.Random(seed)
+    for i in range(n):
+        kind = "income" if rng.random() < 0.3 else "expense"
+        yield {
+            "id": i + 1,
+            "date": (START + timedelta(minutes=7 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+            "type": kind,
+            "amount": round(rng.uniform(1, 3000 if kind == "income" else 300), 2),
+            "description": rng.choice(DESCRIPTIONS),
+        }
+
+
+def products(n, seed=SEED):
+    """Inventory catalog entries (inventory_data.json "products")."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "id": 1001 + i,
+            "name": f"Product {i:08d}",
+            "price": round(rng.uniform(0.5, 2000), 2),
+            "quantity": rng.randint(0, 500),
+        }
+
+
+def doctors(n, seed=SEED):
+    """Hospital roster entries (hospital_data.json "doctors")."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield {
+            "id": 101 + i,
+            "name": f"Doctor{i:07d}",
+            "specialization": rng.choice(SPECIALIZATIONS),
+            "timings": rng.choice(TIMINGS),
+        }
+
+
+def appointments(n, n_doctors, seed=SEED):
+    """Hospital appointments spread over n_doctors doctors."""
+    rng = random.Random(seed + 1)
+    for i in range(n):
+        doctor = rng.randrange(max(n_doctors, 1))
+        yield {
+            "id": i + 1,
+            "doctor_id": 101 + doctor,
+            "doctor_name": f"Doctor{doctor:07d}",
+            "patient": f"Patient{i:08d} (Age: {rng.randint(1, 95)}, Condition: checkup)",
+            "time": (START + timedelta(minutes=15 * i)).strftime("%Y-%m-%d %H:%M:%S"),
+            "status": "Scheduled",
+        }
+
+
+def books(n, seed=SEED):
+    """(title, copies) pairs for library.library_inventory."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield f"Book Title {i:08d}", rng.randint(0, 10)
+
+
+def accounts(n, seed=SEED):
+    """(account number, balance in cents) pairs for the ATM ledger."""
+    rng = random.Random(seed)
+    for i in range(n):
+        yield f"{200000 + i}", rng.randint(0, 5_000_000)
+
+
+_DAYS = {}
+
+
+def event_time(i, seconds_apart=3):
+    """Timestamp of the i-th generated inventory event (0-based)."""
+    seconds = i * seconds_apart
+    day = _DAYS.get(seconds // 86400)
+    if day is None:
+        day = _DAYS[seconds // 86400] = (START + timedelta(days=seconds // 86400)).strftime("%Y-%m-%d")
+    rest = seconds % 86400
+    return f"{day} {rest // 3600:02d}:{rest // 60 % 60:02d}:{rest % 60:02d}"
+
+
+def inventory_events(n, n_products=1000, seed=SEED):
+    """Inventory event stream: n_products "add" events, then purchases (~80%) and restocks.
+
+    Events are 3 seconds apart from START (see event_time); stock never goes negative.
+    """
+    rng = random.Random(seed)
+    prices = [round(rng.uniform(1, 500), 2) for _ in range(n_products)]
+    stock = [0] * n_products
+    for i in range(n):
+        event = {"seq": i + 1, "ts": event_time(i)}
+        if i < n_products:
+            stock[i] = 100
+            event.update(type="add", product_id=1001 + i, quantity=100, name=f"Product {i:08d}", price=prices[i])
+        else:
+            index = rng.randrange(min(i, n_products))
+            quantity = rng.randint(1, 5)
+            if stock[index] >= quantity and rng.random() < 0.8:
+                stock[index] -= quantity
+                event.update(type="purchase", product_id=1001 + index, quantity=quantity,
+                             amount=round(quantity * prices[index], 2))
+            else:
+                stock[index] += quantity * 10
+                event.update(type="restock", product_id=1001 + index, quantity=quantity * 10)
+        yield event
+
+
+# --- Writers ---
+
+def write_json_stream(path, header, key, items):
+    """Writes {**header, key: [items...]} one item at a time."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("{")
+        for name, value in header.items():
+            f.write(f"{json.dumps(name)}: {json.dumps(value)}, ")
+        f.write(f"{json.dumps(key)}: [")
+        for i, item in enumerate(items):
+            f.write(",\n" if i else "\n")
+            f.write(json.dumps(item))
+        f.write("\n]}")
+
+
+def write_tracker_file(path, n, seed=SEED):
+    write_json_stream(path, {}, "transactions", transactions(n, seed))
+
+
+def write_inventory_file(path, n, seed=SEED):
+    header = {"total_earnings": 0.0, "next_product_id": 1001 + n}
+    write_json_stream(path, header, "products", products(n, seed))
+
+
+def write_hospital_file(path, n_doctors, n_appointments, seed=SEED):
+    """The doctors and appointments lists are both needed, so the roster is built in memory."""
+    data = {
+        "doctors": list(doctors(n_doctors, seed)),
+        "next_doctor_id": 101 + n_doctors,
+        "next_appointment_id": 1 + n_appointments,
+    }
+    write_json_stream(path, data, "appointments", appointments(n_appointments, n_doctors, seed))
+
+
+def write_tracker_ledgers(directory, n_ledgers, per_ledger=50, legacy_every=10, seed=SEED):
+    """One tracker ledger per synthetic user: user00000.json, user00001.json, ...
+
+    Ledger sizes vary from 1 to 2 * per_ledger transactions. Most are written
+    as segmented stores, every legacy_every-th as a not-yet-migrated JSON
+    file. Returns the expected (transactions, total income, total expenses).
+    """
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    expected = [0, 0.0, 0.0]
+    for i in range(n_ledgers):
+        path = os.path.join(directory, f"user{i:05d}.json")
+        items = list(transactions(rng.randint(1, 2 * per_ledger), seed + i))
+        if legacy_every and i % legacy_every == 0:
+            write_json_stream(path, {}, "transactions", items)
+        else:
+            save_state(path, ("transactions",), {"transactions": items})
+        expected[0] += len(items)
+        for t in items:
+            expected[1 if t["type"] == "income" else 2] += t["amount"]
+    return tuple(expected)
+
+
+def write_inventory_events_dir(directory, n, n_products=1000, snapshot_every=10000, seed=SEED):
+    """An inventory_events directory holding n events, laid out as InventoryEventLog writes it."""
+    os.makedirs(directory, exist_ok=True)
+    state = empty_state()
+    f = open(log_path(directory, 1), 'w', encoding='utf-8')
+    for event in inventory_events(n, n_products, seed):
+        f.write(json.dumps(event, separators=(',', ':')) + "\n")
+        apply_event(state, event)
+        if event["seq"] % snapshot_every == 0:
+            f.close()
+            write_snapshot(directory, state)
+            f = open(log_path(directory, event["seq"] + 1), 'w', encoding='utf-8')
+    f.close()
+    return state
+
+
+def write_ledger_dir(directory, n, seed=SEED):
+    """An atm_ledger snapshot holding n accounts (no log records)."""
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, "snapshot.json"), 'w', encoding='utf-8') as f:
+        f.write('{"seq": 0, "balances": {')
+        for i, (account, cents) in enumerate(accounts(n, seed)):
+            f.write(f'{"," if i else ""}"{account}": {cents}')
+        f.write("}}")
+
+
+def write_atm_day(directory, n_ops, n_accounts, day="2024-01-02", seed=SEED):
+    """One ATM day, laid out as the ledger and the settlement job leave it.
+
+    Writes the previous day's settlement (the opening balances), the day's
+    journal with n_ops deposits, withdrawals and transfers, and a ledger
+    snapshot holding the closing balances, which are also returned.
+    """
+    rng = random.Random(seed)
+    balances = dict(accounts(n_accounts, seed))
+    numbers = sorted(balances)
+    previous = (datetime.strptime(day, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+    os.makedirs(os.path.join(directory, SETTLEMENT_DIR), exist_ok=True)
+    with open(settlement_path(os.path.join(directory, SETTLEMENT_DIR), previous), 'w', encoding='utf-8') as f:
+        f.write(",".join(SETTLEMENT_FIELDS) + "\n")
+        for account in numbers:
+            f.write(f"{account},{balances[account]},0,0,0,{balances[account]},ok\n")
+
+    os.makedirs(os.path.join(directory, JOURNAL_DIR), exist_ok=True)
+    start = datetime.strptime(day, "%Y-%m-%d")
+    stamp_second, stamp = None, None
+    with open(journal_path(os.path.join(directory, JOURNAL_DIR), day), 'w', encoding='utf-8') as f:
+        for seq in range(1, n_ops + 1):
+            second = (seq - 1) * 86400 // n_ops
+            if second != stamp_second:
+                stamp_second, stamp = second, (start + timedelta(seconds=second)).strftime("%Y-%m-%d %H:%M:%S")
+            account = numbers[rng.randrange(n_accounts)]
+            cents = rng.randint(100, 50_000)
+            roll = rng.random()
+            if roll < 0.2 and balances[account] >= cents:
+                to = numbers[rng.randrange(n_accounts)]
+                if to != account:
+                    balances[account] -= cents
+                    balances[to] += cents
+                    f.write(journal_line(seq, stamp, "transfer", account, cents, balances[account], to, balances[to]))
+                    continue
+            if roll < 0.55 and balances[account] >= cents:
+                balances[account] -= cents
+                f.write(journal_line(seq, stamp, "withdraw", account, cents, balances[account]))
+            else:
+                balances[account] += cents
+                f.write(journal_line(seq, stamp, "deposit", account, cents, balances[account]))
+
+    with open(os.path.join(directory, "snapshot.json"), 'w', encoding='utf-8') as f:
+        json.dump({"seq": n_ops, "balances": balances}, f)
+    return balances
@@ -0,0 +1,60 @@
+"""Runs the checks of every benchmark that has a --quick mode, as a fast test pass.
+
+Each bench_*.py that accepts --quick shrinks its workload to a few seconds
+but keeps all of its assertions (load, parity, fault injection, scaling).
+This script runs each of them in its own interpreter and exits with status
+1 if any fails.
+
+Run from the repository root:
+    python benchmarks/run_checks.py [names ...]   e.g. run_checks.py atm_server payroll
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+TIMEOUT = 300  # Seconds per benchmark
+
+
+def quick_benchmarks():
+    """Paths of the bench_*.py scripts that accept --quick, sorted."""
+    paths = []
+    for name in sorted(os.listdir(BENCH_DIR)):
+        if name.startswith("bench_") and name.endswith(".py"):
+            path = os.path.join(BENCH_DIR, name)
+            with open(path, 'r', encoding='utf-8') as f:
+                if '"--quick"' in f.read():
+                    paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("names", nargs="*", help="only these benchmarks (without bench_ and .py)")
+    args = parser.parse_args()
+
+    paths = quick_benchmarks()
+    if args.names:
+        paths = [p for p in paths if os.path.basename(p)[len("bench_"):-len(".py")] in args.names]
+    failed = []
+    for path in paths:
+        start = time.perf_counter()
+        try:
+            result = subprocess.run([sys.executable, path, "--quick"], cwd=REPO_ROOT,
+                                    capture_output=True, text=True, timeout=TIMEOUT)
+            ok, output = result.returncode == 0, result.stdout + result.stderr
+        except subprocess.TimeoutExpired:
+            ok, output = False, f"timed out after {TIMEOUT}s"
+        print(f"{'ok' if ok else 'FAIL':<5} {os.path.basename(path):<32} {time.perf_counter() - start:6.1f}s")
+        if not ok:
+            failed.append(path)
+            print(output)
+    print(f"{len(paths) - len(failed)} of {len(paths)} passed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
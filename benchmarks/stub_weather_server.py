@@ -0,0 +1,107 @@
+"""Local stand-in for the Open-Meteo geocoding and forecast APIs.
+
+Used by the weather benchmarks so they run offline and with a controlled
+per-request delay. Point info.py at it with StubWeatherServer.patch_info().
+
+City names starting with "Nowhere" geocode to no results, and names starting
+with "Broken" make the geocoding endpoint answer HTTP 500.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so clients can reuse connections
+    disable_nagle_algorithm = True  # Headers and body are separate writes
+
+    def log_message(self, format, *args):
+        pass
+
+    def setup(self):
+        super().setup()
+        with self.server.stats_lock:
+            self.server.stats["connections"] += 1
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        with self.server.stats_lock:
+            self.server.stats["requests"] += 1
+        time.sleep(self.server.delay)
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if url.path.endswith("/search"):
+            name = query.get("name", "")
+            if name.startswith("Broken"):
+                return self._send(500, {"error": True, "reason": "stub failure"})
+            if name.startswith("Nowhere"):
+                return self._send(200, {})
+            seed = sum(map(ord, name))
+            return self._send(200, {"results": [{
+                "name": name, "admin1": "Stub State", "country": "Stubland",
+                "latitude": round(-60 + seed % 120 + (seed % 7) / 10, 4),
+                "longitude": round(-170 + seed % 340 + (seed % 11) / 10, 4),
+            }]})
+
+        if url.path.endswith("/forecast"):
+            lats = query.get("latitude", "0").split(",")
+            lons = query.get("longitude", "0").split(",")
+            points = [{
+                "latitude": float(lat), "longitude": float(lon),
+                "current_weather": {
+                    "temperature": round(15 + float(lat) / 10, 1), "windspeed": 10.0,
+                    "winddirection": int(abs(float(lon))) % 360, "time": "2025-10-15T08:45",
+                },
+            } for lat, lon in zip(lats, lons)]
+            # Like Open-Meteo: one coordinate -> object, several -> list
+            return self._send(200, points[0] if len(points) == 1 else points)
+
+        self._send(404, {"error": True, "reason": "not found"})
+
+
+class _Server(ThreadingHTTPServer):
+    request_queue_size = 128  # The default backlog of 5 drops bursts of connections
+
+
+class StubWeatherServer:
+    """Threaded HTTP server on 127.0.0.1 with an artificial delay per request."""
+
+    def __init__(self, delay=0.05):
+        self.httpd = _Server(("127.0.0.1", 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.delay = delay
+        self.httpd.stats = {"requests": 0, "connections": 0}
+        self.httpd.stats_lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def stats(self):
+        return dict(self.httpd.stats)
+
+    def patch_info(self, info):
+        """Points info.API_URL_GEO / API_URL_WEATHER at this server."""
+        info.API_URL_GEO = self.base_url + "/v1/search"
+        info.API_URL_WEATHER = self.base_url + "/v1/forecast"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.httpd.shutdown()
+        self.httpd.server_close()
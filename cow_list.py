@@ -0,0 +1,55 @@
+from itertools import chain
+
+# --- Configuration ---
+CHUNK_SIZE = 256  # Items per chunk; an update copies one chunk plus the chunk index
+
+class CowList:
+    """Immutable list that shares structure between versions (copy-on-write).
+
+    Items live in fixed-size tuple chunks. set() and append() return a new
+    CowList that copies only the chunk being changed and the tuple of chunk
+    references, so publishing a new version after each write costs
+    O(CHUNK_SIZE + n / CHUNK_SIZE) and readers holding an older version are
+    never affected by later writes.
+    """
+
+    __slots__ = ("_chunks", "_length")
+
+    def __init__(self, items=(), _chunks=None, _length=None):
+        if _chunks is not None:
+            self._chunks = _chunks
+            self._length = _length
+            return
+        items = tuple(items)
+        self._chunks = tuple(items[i:i + CHUNK_SIZE] for i in range(0, len(items), CHUNK_SIZE))
+        self._length = len(items)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return chain.from_iterable(self._chunks)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("CowList index out of range")
+        return self._chunks[index // CHUNK_SIZE][index % CHUNK_SIZE]
+
+    def set(self, index, item):
+        """A new version with item at index."""
+        if not 0 <= index < self._length:
+            raise IndexError("CowList index out of range")
+        k, j = divmod(index, CHUNK_SIZE)
+        chunk = self._chunks[k]
+        chunks = self._chunks[:k] + (chunk[:j] + (item,) + chunk[j + 1:],) + self._chunks[k + 1:]
+        return CowList(_chunks=chunks, _length=self._length)
+
+    def append(self, item):
+        """A new version with item added at the end."""
+        if self._length % CHUNK_SIZE:
+            chunks = self._chunks[:-1] + (self._chunks[-1] + (item,),)
+        else:
+            chunks = self._chunks + ((item,),)
+        return CowList(_chunks=chunks, _length=self._length + 1)
@@ -0,0 +1,94 @@
+import json
+import os
+import sqlite3
+
+# --- Configuration ---
+DB_FILE = "employee_data.db"
+
+# ====================================================================
+# Keyed employee storage
+# ====================================================================
+# Employee.store_details used to load the whole JSON file, change one key and
+# rewrite everything, so storing N employees cost O(N^2) and two writers
+# could overwrite each other. The repository below keeps one SQLite row per
+# employee: an upsert touches only that row, and SQLite's locking serializes
+# concurrent writers instead of losing their updates.
+
+class EmployeeRepository:
+    """SQLite-backed store of employee records keyed by employee id."""
+
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS employees ("
+            " id TEXT PRIMARY KEY,"
+            " name TEXT NOT NULL,"
+            " salary REAL NOT NULL,"
+            " net_salary REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    _UPSERT = (
+        "INSERT INTO employees (id, name, salary, net_salary)"
+        " VALUES (:id, :name, :salary, :net_salary)"
+        " ON CONFLICT(id) DO UPDATE SET"
+        " name = excluded.name, salary = excluded.salary, net_salary = excluded.net_salary"
+    )
+
+    def upsert(self, record):
+        """Inserts or updates one employee record and commits."""
+        with self.conn:
+            self.conn.execute(self._UPSERT, record)
+
+    def store_many(self, records):
+        """Upserts many records in a single transaction (one commit)."""
+        with self.conn:
+            self.conn.executemany(self._UPSERT, records)
+
+    def get(self, emp_id):
+        """Returns the record for an employee id, or None."""
+        row = self.conn.execute(
+            "SELECT id, name, salary, net_salary FROM employees WHERE id = ?", (emp_id,)
+        ).fetchone()
+        return self._to_dict(row) if row else None
+
+    def all(self):
+        """Yields every record, ordered by id."""
+        cursor = self.conn.execute("SELECT id, name, salary, net_salary FROM employees ORDER BY id")
+        for row in cursor:
+            yield self._to_dict(row)
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+
+    @staticmethod
+    def _to_dict(row):
+        return {"name": row[1], "id": row[0], "salary": row[2], "net_salary": row[3]}
+
+    # --- Migration ---
+
+    def import_json(self, path="employee_data.json"):
+        """Loads records from the legacy {id: record} JSON file; returns the count."""
+        if not os.path.exists(path) or os.stat(path).st_size == 0:
+            return 0
+        with open(path, 'r') as f:
+            data = json.load(f)
+        self.store_many(data.values())
+        return len(data)
+
+    def export_json(self, path="employee_data.json"):
+        """Writes all records in the legacy {id: record} JSON layout."""
+        with open(path, 'w') as f:
+            json.dump({r["id"]: r for r in self.all()}, f, indent=4)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,134 @@
+import csv
+import mmap
+import os
+import re
+import sys
+import unicodedata
+
+# --- Configuration ---
+# The bundled gazetteer sits next to this module; pass another path to use your own
+GAZETTEER_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gazetteer.tsv")
+FIELDS = ["name", "admin1", "country", "latitude", "longitude", "population"]
+
+# ====================================================================
+# Offline geocoding index
+# ====================================================================
+# A gazetteer is a tab-separated text file, one place per line:
+#   key  name  admin1  country  latitude  longitude  population
+# where `key` is the normalized name. Lines are sorted by key, and places
+# sharing a key by descending population, so the first match is the most
+# likely one. Lookups binary-search the memory-mapped file directly: there
+# is no parsing at startup, and only the pages a lookup touches are read.
+
+def normalize(name):
+    """Case-, accent- and punctuation-insensitive form of a place name."""
+    name = unicodedata.normalize('NFKD', name)
+    name = "".join(ch for ch in name if not unicodedata.combining(ch))
+    name = re.sub(r"[^\w\s]", " ", name.casefold())
+    return " ".join(name.split())
+
+def build_gazetteer(rows, path=GAZETTEER_FILE):
+    """Writes rows (dicts with FIELDS) as a sorted gazetteer; returns the count."""
+    entries = []
+    for row in rows:
+        key = normalize(row["name"])
+        if not key:
+            continue
+        entries.append((key, -int(row.get("population") or 0), row))
+    entries.sort(key=lambda e: (e[0].encode('utf-8'), e[1]))
+
+    with open(path, 'w', encoding='utf-8', newline='\n') as f:
+        for key, _, row in entries:
+            values = [key] + [str(row.get(field) or "").replace("\t", " ") for field in FIELDS]
+            f.write("\t".join(values) + "\n")
+    return len(entries)
+
+class GeoIndex:
+    """Exact and prefix lookups over a sorted, memory-mapped gazetteer file."""
+
+    def __init__(self, path=GAZETTEER_FILE):
+        self.path = path
+        self._file = None
+        self._mm = None
+
+    def _open(self):
+        """Maps the file on first use, so creating an index costs nothing."""
+        if self._mm is None:
+            self._file = open(self.path, 'rb')
+            if os.fstat(self._file.fileno()).st_size == 0:
+                self._mm = b""
+            else:
+                self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mm
+
+    def close(self):
+        if isinstance(self._mm, mmap.mmap):
+            self._mm.close()
+        if self._file is not None:
+            self._file.close()
+        self._mm = self._file = None
+
+    def _lower_bound(self, target):
+        """Offset of the first line whose key is >= target (bytes)."""
+        mm = self._open()
+        lo, hi = 0, len(mm)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = mm.rfind(b"\n", 0, mid) + 1
+            key_end = mm.find(b"\t", start)
+            if mm[start:key_end] < target:
+                lo = mm.find(b"\n", start) + 1 or len(mm)
+            else:
+                hi = start
+        return lo
+
+    def _entries_from(self, offset):
+        """Yields (key, location) for the lines from offset onwards."""
+        mm = self._open()
+        while offset < len(mm):
+            end = mm.find(b"\n", offset)
+            if end == -1:
+                end = len(mm)
+            parts = mm[offset:end].decode('utf-8').split("\t")
+            offset = end + 1
+            location = dict(zip(FIELDS, parts[1:]))
+            location["latitude"] = float(location["latitude"])
+            location["longitude"] = float(location["longitude"])
+            location["population"] = int(location["population"] or 0)
+            yield parts[0], location
+
+    def lookup(self, name):
+        """Best match for an exact (normalized) name, in geocoding API format, or None."""
+        key = normalize(name)
+        if not key:
+            return None
+        for found_key, location in self._entries_from(self._lower_bound(key.encode('utf-8'))):
+            return location if found_key == key else None
+        return None
+
+    def prefix(self, text, limit=10):
+        """Places whose normalized name starts with text, in key order."""
+        key = normalize(text)
+        matches = []
+        if not key:
+            return matches
+        for found_key, location in self._entries_from(self._lower_bound(key.encode('utf-8'))):
+            if not found_key.startswith(key) or len(matches) >= limit:
+                break
+            matches.append(location)
+        return matches
+
+def main(argv):
+    """python geocode_index.py SOURCE.csv [OUTPUT.tsv] - build a gazetteer from a CSV file."""
+    if len(argv) not in (2, 3):
+        print("Usage: python geocode_index.py SOURCE.csv [OUTPUT.tsv]")
+        print(f"SOURCE.csv needs a header with: {', '.join(FIELDS)}")
+        return 1
+    output = argv[2] if len(argv) == 3 else "gazetteer.tsv"
+    with open(argv[1], 'r', encoding='utf-8', newline='') as f:
+        count = build_gazetteer(csv.DictReader(f), output)
+    print(f"✅ Wrote {count} places to {output}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,200 @@
+import numpy as np
+
+# --- Configuration ---
+INITIAL_CAPACITY = 1024   # Student rows allocated up front; grows by doubling
+PATCH_LIMIT = 64          # Pending changes per subject patched into its sorted cache
+                          # one by one; beyond this the column is simply re-sorted
+
+# ====================================================================
+# Columnar gradebook for task_models.Student marks
+# ====================================================================
+# Marks live in one float64 matrix (student rows x subject columns, NaN for
+# "not enrolled"). Means come from running per-subject and per-student sums,
+# so they are O(1) after any update. Medians, percentiles and percentile
+# ranks use a sorted copy of each subject column that is only refreshed for
+# subjects that changed since the last query.
+
+class Gradebook:
+    """Marks for many students, stored column-wise for vectorized analytics."""
+
+    def __init__(self, subjects=(), capacity=INITIAL_CAPACITY):
+        self.names = []
+        self._rows = {}       # student name -> row index
+        self.subjects = []
+        self._cols = {}       # subject -> column index
+        self.marks = np.full((max(1, capacity), max(1, len(subjects))), np.nan)
+        self._col_sum = np.zeros(self.marks.shape[1])
+        self._col_count = np.zeros(self.marks.shape[1], dtype=np.int64)
+        self._row_sum = np.zeros(self.marks.shape[0])
+        self._row_count = np.zeros(self.marks.shape[0], dtype=np.int64)
+        self._sorted = {}     # column -> sorted non-NaN scores
+        self._pending = {}    # column -> [(old, new), ...] not yet in the sorted cache
+        for subject in subjects:
+            self._column(subject)
+
+    # --- Storage ---
+
+    def __len__(self):
+        return len(self.names)
+
+    def _grow(self, rows, cols):
+        """Reallocates the matrix (doubling) so it holds at least rows x cols."""
+        old_rows, old_cols = self.marks.shape
+        new_rows = old_rows if rows <= old_rows else max(rows, old_rows * 2)
+        new_cols = old_cols if cols <= old_cols else max(cols, old_cols * 2)
+        if (new_rows, new_cols) == (old_rows, old_cols):
+            return
+        marks = np.full((new_rows, new_cols), np.nan)
+        marks[:old_rows, :old_cols] = self.marks
+        self.marks = marks
+        self._col_sum = np.concatenate([self._col_sum, np.zeros(new_cols - old_cols)])
+        self._col_count = np.concatenate([self._col_count, np.zeros(new_cols - old_cols, dtype=np.int64)])
+        self._row_sum = np.concatenate([self._row_sum, np.zeros(new_rows - old_rows)])
+        self._row_count = np.concatenate([self._row_count, np.zeros(new_rows - old_rows, dtype=np.int64)])
+
+    def _row(self, name):
+        row = self._rows.get(name)
+        if row is None:
+            row = len(self.names)
+            self._grow(row + 1, self.marks.shape[1])
+            self._rows[name] = row
+            self.names.append(name)
+        return row
+
+    def _column(self, subject):
+        col = self._cols.get(subject)
+        if col is None:
+            col = len(self.subjects)
+            self._grow(self.marks.shape[0], col + 1)
+            self._cols[subject] = col
+            self.subjects.append(subject)
+            self._sorted[col] = np.empty(0)
+        return col
+
+    # --- Updates ---
+
+    def set_mark(self, name, subject, score):
+        """Adds or updates one mark, adjusting the running aggregates in O(1)."""
+        row, col = self._row(name), self._column(subject)
+        old = self.marks[row, col]
+        if not np.isnan(old):
+            self._col_sum[col] -= old
+            self._col_count[col] -= 1
+            self._row_sum[row] -= old
+            self._row_count[row] -= 1
+        score = float(score)
+        self.marks[row, col] = score
+        self._col_sum[col] += score
+        self._col_count[col] += 1
+        self._row_sum[row] += score
+        self._row_count[row] += 1
+        pending = self._pending.setdefault(col, [])
+        if pending is not None:  # None means the column is re-sorted anyway
+            pending.append((old, score))
+            if len(pending) > PATCH_LIMIT:
+                self._pending[col] = None  # Stop collecting: the next query re-sorts
+
+    def add_student(self, student):
+        """Registers a task_models.Student (or anything with .name and .marks)."""
+        self._row(student.name)
+        for subject, score in student.marks.items():
+            self.set_mark(student.name, subject, score)
+
+    def load(self, names, subjects, scores):
+        """Bulk-loads a (len(names) x len(subjects)) score matrix; NaN = no mark."""
+        scores = np.asarray(scores, dtype=np.float64)
+        rows = np.array([self._row(n) for n in names], dtype=np.int64)
+        cols = np.array([self._column(s) for s in subjects], dtype=np.int64)
+        block = self.marks[np.ix_(rows, cols)]
+        if not np.isnan(block).all():
+            raise ValueError("load() only adds new marks; use set_mark() to change existing ones.")
+        self.marks[np.ix_(rows, cols)] = scores
+        present = ~np.isnan(scores)
+        filled = np.where(present, scores, 0.0)
+        np.add.at(self._col_sum, cols, filled.sum(axis=0))
+        np.add.at(self._col_count, cols, present.sum(axis=0))
+        np.add.at(self._row_sum, rows, filled.sum(axis=1))
+        np.add.at(self._row_count, rows, present.sum(axis=1))
+        for col in cols:
+            self._pending[int(col)] = None  # Too many changes: re-sort on next query
+
+    # --- Sorted cache ---
+
+    def _sorted_scores(self, col):
+        """Sorted non-NaN scores of a column, refreshed only if it changed."""
+        pending = self._pending.pop(col, [])
+        if pending is None or len(pending) > PATCH_LIMIT:
+            column = self.marks[:len(self.names), col]
+            self._sorted[col] = np.sort(column[~np.isnan(column)])
+        else:
+            values = self._sorted[col]
+            for old, new in pending:
+                if not np.isnan(old):
+                    values = np.delete(values, np.searchsorted(values, old))
+                values = np.insert(values, np.searchsorted(values, new), new)
+            self._sorted[col] = values
+        return self._sorted[col]
+
+    # --- Aggregates ---
+
+    def mean(self, subject):
+        col = self._cols[subject]
+        count = self._col_count[col]
+        return float(self._col_sum[col] / count) if count else float('nan')
+
+    def means(self):
+        """{subject: mean} for every subject."""
+        n = len(self.subjects)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = self._col_sum[:n] / self._col_count[:n]
+        return dict(zip(self.subjects, values.tolist()))
+
+    def percentile(self, subject, q):
+        """q-th percentile (0-100) of a subject's marks."""
+        values = self._sorted_scores(self._cols[subject])
+        return float(np.percentile(values, q)) if len(values) else float('nan')
+
+    def median(self, subject):
+        return self.percentile(subject, 50)
+
+    def medians(self):
+        return {s: self.median(s) for s in self.subjects}
+
+    def percentile_ranks(self, subject):
+        """Percentage of marks <= each student's mark (NaN if not enrolled)."""
+        col = self._cols[subject]
+        values = self._sorted_scores(col)
+        column = self.marks[:len(self.names), col]
+        ranks = np.full(len(column), np.nan)
+        present = ~np.isnan(column)
+        if len(values):
+            ranks[present] = np.searchsorted(values, column[present], side='right') * 100.0 / len(values)
+        return ranks
+
+    def percentile_rank(self, name, subject):
+        col = self._cols[subject]
+        values = self._sorted_scores(col)
+        score = self.marks[self._rows[name], col]
+        if np.isnan(score) or not len(values):
+            return float('nan')
+        return float(np.searchsorted(values, score, side='right') * 100.0 / len(values))
+
+    def averages(self):
+        """Each student's average over their enrolled subjects."""
+        n = len(self.names)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._row_sum[:n] / self._row_count[:n]
+
+    def top_n(self, n, subject=None):
+        """[(name, score), ...] of the n best students, by subject or by average."""
+        if subject is None:
+            scores = self.averages()
+        else:
+            scores = self.marks[:len(self.names), self._cols[subject]]
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+        n = min(n, len(scores))
+        if n <= 0:
+            return []
+        best = np.argpartition(-scores, n - 1)[:n]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        return [(self.names[i], float(scores[i])) for i in best if scores[i] != -np.inf]
@@ -1,39 +1,34 @@
-import json
-import os
 from datetime import datetime
 
+import instrumentation
+from instrumentation import timed
+from segment_store import load_state, save_state
+
 # --- Configuration ---
+# Data lives in hospital_data.segments/ next to DATA_FILE (see segment_store);
+# an existing JSON file is imported on first load.
 DATA_FILE = "hospital_data.json"
+SEGMENTED_LISTS = ("doctors", "appointments")
 
 # --- Data Persistence Functions ---
 
+def _empty_data():
+    """Initial empty structure."""
+    return {
+        "doctors": [],
+        "appointments": [],
+        "next_doctor_id": 101,
+        "next_appointment_id": 1
+    }
+
+@timed("hospital.load")
 def _load_data():
-    """Loads all system data (doctors, appointments) from the JSON file."""
-    if not os.path.exists(DATA_FILE) or os.stat(DATA_FILE).st_size == 0:
-        # Initial empty structure
-        return {
-            "doctors": [],
-            "appointments": [],
-            "next_doctor_id": 101,
-            "next_appointment_id": 1
-        }
-    
-    with open(DATA_FILE, 'r') as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            print(f"⚠️ Warning: {DATA_FILE} is corrupted. Initializing new system data.")
-            return {
-                "doctors": [],
-                "appointments": [],
-                "next_doctor_id": 101,
-                "next_appointment_id": 1
-            }
+    """Loads all system data (doctors, appointments) from the segmented store."""
+    return load_state(DATA_FILE, SEGMENTED_LISTS, _empty_data)
 
 def _save_data(data):
-    """Saves all system data to the JSON file."""
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
+    """Saves all system data, rewriting only the segments that changed."""
+    save_state(DATA_FILE, SEGMENTED_LISTS, data)
 
 # --- Classes ---
 
@@ -66,14 +61,28 @@ class Patient:
 # --- Core Management System ---
 
 class HospitalSystem:
-    def __init__(self):
+    def __init__(self, autosave=True):
         self.data = _load_data()
-        self.doctors = [Doctor(**d) for d in self.data["doctors"]]
+        self.doctors = [Doctor(d["id"], d["name"], d["specialization"], d["timings"]) for d in self.data["doctors"]]
+        self.autosave = autosave  # Save after every change; otherwise call save()
+
+    def save(self):
+        """Saves the current state now (for systems created with autosave=False)."""
+        self._save_state()
         
+    def saved_state(self):
+        """A detached copy of what save() writes; write_state() can store it from any thread."""
+        return dict(self.data, doctors=[d.to_dict() for d in self.doctors],
+                    appointments=list(self.data["appointments"]))
+
+    def write_state(self, state):
+        """Writes a state taken by saved_state()."""
+        _save_data(state)
+
+    @timed("hospital.save")
     def _save_state(self):
-        """Prepares and saves the current state to the JSON file."""
-        self.data["doctors"] = [d.to_dict() for d in self.doctors]
-        _save_data(self.data)
+        """Prepares and saves the current state to the data store."""
+        _save_data(self.saved_state())
         
     def add_doctor(self, name, specialization, timings):
         """Adds a new doctor to the system."""
@@ -81,9 +90,40 @@ class HospitalSystem:
         new_doctor = Doctor(doctor_id, name, specialization, timings)
         self.doctors.append(new_doctor)
         self.data["next_doctor_id"] += 1
-        self._save_state()
+        if self.autosave:
+            self._save_state()
         print(f"✅ Doctor {name} ({specialization}) added with ID: {doctor_id}")
 
+    @timed("hospital.lookup")
+    def find_doctor(self, doctor_id):
+        """Returns the doctor with this ID, or None."""
+        return next((d for d in self.doctors if d.id == doctor_id), None)
+
+    def book(self, doctor_id, patient):
+        """Books an appointment for a Patient and returns the appointment record.
+
+        Raises ValueError for an unknown doctor ID. book_appointment calls this
+        once the doctor and patient have been entered.
+        """
+        doctor = self.find_doctor(doctor_id)
+        if doctor is None:
+            raise ValueError(f"Invalid Doctor ID: {doctor_id}.")
+
+        new_appointment = {
+            "id": self.data["next_appointment_id"],
+            "doctor_id": doctor_id,
+            "doctor_name": doctor.name,
+            "patient": patient.__str__(), # Store patient details as a string
+            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "status": "Scheduled"
+        }
+        
+        self.data["appointments"].append(new_appointment)
+        self.data["next_appointment_id"] += 1
+        if self.autosave:
+            self._save_state()
+        return new_appointment
+
     def register_patient(self):
         """Registers a new patient and returns the Patient object."""
         name = input("Enter patient's name: ").strip()
@@ -131,7 +171,7 @@ class HospitalSystem:
                 if not doc_id_input: return # Allow canceling
                 
                 doc_id = int(doc_id_input)
-                selected_doctor = next((d for d in self.doctors if d.id == doc_id), None)
+                selected_doctor = self.find_doctor(doc_id)
                 
                 if selected_doctor:
                     doctor_id = doc_id
@@ -146,20 +186,7 @@ class HospitalSystem:
         patient_obj = self.register_patient()
         
         # 3. Book Details
-        appointment_id = self.data["next_appointment_id"]
-        
-        new_appointment = {
-            "id": appointment_id,
-            "doctor_id": doctor_id,
-            "doctor_name": selected_doctor.name,
-            "patient": patient_obj.__str__(), # Store patient details as a string
-            "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "status": "Scheduled"
-        }
-        
-        self.data["appointments"].append(new_appointment)
-        self.data["next_appointment_id"] += 1
-        self._save_state()
+        appointment_id = self.book(doctor_id, patient_obj)["id"]
         
         print(f"\n🎉 Appointment Booked Successfully!")
         print(f"Appointment ID: {appointment_id}")
@@ -230,4 +257,5 @@ def main():
             print("Invalid choice. Please enter a number from 1 to 5.")
 
 if __name__ == "__main__":
-    main()
+    with instrumentation.session("hospital"):
+        main()
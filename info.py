@@ -1,6 +1,18 @@
 import requests
 import json
+import os
+import threading
 import time
+from collections import deque
+
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+import instrumentation
+from geocode_index import GAZETTEER_FILE, GeoIndex
+from instrumentation import count, timed
+from weather_cache import CACHE_FILE, DiskCache, LRUCache, TwoLevelCache, cache_key
 
 # --- API Endpoints ---
 # Open-Meteo Geocoding API: Used to convert city names to coordinates (Latitude/Longitude)
@@ -8,6 +20,32 @@ API_URL_GEO = 'https://geocoding-api.open-meteo.com/v1/search'
 # Open-Meteo Weather API: Used to fetch weather data using coordinates
 API_URL_WEATHER = 'https://api.open-meteo.com/v1/forecast'
 
+# --- Command Line ---
+# Several cities at one prompt are separated by ';' (not ',', which
+# qualifies a single city, as in "Portland, Oregon")
+CITY_SEPARATOR = ';'
+
+# --- HTTP Session ---
+HTTP_TIMEOUT = (3.05, 10)   # (connect, read) timeouts in seconds
+POOL_CONNECTIONS = 4        # Per-host connection pools kept (geocoding + forecast hosts)
+POOL_MAXSIZE = 16           # Keep-alive connections per host; >= the async batch concurrency
+CONNECT_RETRIES = 2         # Transport-level retries (e.g. a stale keep-alive socket)
+SESSION = None              # Shared requests.Session, created on first use
+
+# Request latency and connection reuse, see http_metrics()
+_metrics_lock = threading.Lock()
+_metrics = {"requests": 0, "errors": 0, "new_connections": 0, "total_latency": 0.0}
+_latencies = deque(maxlen=1000)  # Most recent request latencies (seconds)
+
+# --- Response Cache ---
+GEO_CACHE_TTL = 30 * 24 * 3600   # Seconds; city coordinates practically never change
+WEATHER_CACHE_TTL = 10 * 60      # Seconds; current weather is only refreshed every few minutes
+CACHE = None                     # weather_cache.TwoLevelCache, created on first use
+
+# --- Offline Geocoding ---
+USE_GEO_INDEX = True             # Look city names up in the local gazetteer before the API
+GEO_INDEX = None                 # geocode_index.GeoIndex, created on first use
+
 def get_wind_direction(deg):
     """Converts wind degrees (0-360) to cardinal direction."""
     directions = ['N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW']
@@ -15,84 +53,245 @@ def get_wind_direction(deg):
     index = round(deg / 45) % 8
     return directions[index]
 
+class _CountingPoolMixin:
+    """Counts every new TCP/TLS connection a pool has to open."""
+
+    def _new_conn(self):
+        with _metrics_lock:
+            _metrics["new_connections"] += 1
+        return super()._new_conn()
+
+class _CountingHTTPPool(_CountingPoolMixin, HTTPConnectionPool):
+    pass
+
+class _CountingHTTPSPool(_CountingPoolMixin, HTTPSConnectionPool):
+    pass
+
+class _PooledAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report new connections."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPPool,
+            "https": _CountingHTTPSPool,
+        }
+
+def make_session(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 connect_retries=CONNECT_RETRIES):
+    """Builds a keep-alive session with a tuned connection-pool adapter.
+
+    The adapter only retries transport failures (connect errors, a dropped
+    keep-alive socket); HTTP error statuses are left to fetch_with_retry.
+    """
+    retry = Retry(total=connect_retries, connect=connect_retries, read=0, status=0,
+                  backoff_factor=0.2, allowed_methods=frozenset({"GET"}))
+    adapter = _PooledAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                             max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def get_session():
+    """Returns the shared session, creating it on first use."""
+    global SESSION
+    if SESSION is None:
+        SESSION = make_session()
+    return SESSION
+
+def http_metrics():
+    """Request count, latency (ms) and connection reuse since start (or reset)."""
+    with _metrics_lock:
+        latencies = sorted(_latencies)
+        stats = dict(_metrics)
+    requests_made = stats.pop("requests")
+    total_latency = stats.pop("total_latency")
+    stats["requests"] = requests_made
+    stats["reused_connections"] = max(0, requests_made - stats["new_connections"])
+    stats["mean_latency_ms"] = total_latency * 1000 / requests_made if requests_made else 0.0
+    stats["p50_latency_ms"] = latencies[len(latencies) // 2] * 1000 if latencies else 0.0
+    stats["p95_latency_ms"] = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0.0
+    return stats
+
+def reset_http_metrics():
+    with _metrics_lock:
+        _metrics.update(requests=0, errors=0, new_connections=0, total_latency=0.0)
+        _latencies.clear()
+
+def http_get_json(url, params=None):
+    """Performs a single GET request and returns the decoded JSON body."""
+    start = time.perf_counter()
+    try:
+        response = get_session().get(url, params=params, timeout=HTTP_TIMEOUT)
+        response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
+        return response.json()
+    except requests.exceptions.RequestException:
+        with _metrics_lock:
+            _metrics["errors"] += 1
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        with _metrics_lock:
+            _metrics["requests"] += 1
+            _metrics["total_latency"] += elapsed
+            _latencies.append(elapsed)
+
+@timed("weather.fetch")
 def fetch_with_retry(url, params=None, retries=3):
     """Utility to handle API requests with exponential backoff."""
     for i in range(retries):
         try:
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-            return response.json()
+            return http_get_json(url, params)
         except requests.exceptions.RequestException as e:
             if i < retries - 1:
+                count("weather.retries")
                 delay = 2 ** i
                 print(f"⚠️ Request failed ({e}). Retrying in {delay} second(s)...")
                 time.sleep(delay)
             else:
                 raise
 
+def get_cache():
+    """Returns the shared response cache (memory LRU + SQLite file)."""
+    global CACHE
+    if CACHE is None:
+        CACHE = TwoLevelCache(LRUCache(), DiskCache(CACHE_FILE))
+    return CACHE
+
+def cache_stats():
+    """Returns the cache hit/miss counters."""
+    return get_cache().counters()
+
+def cached_fetch(url, params, ttl):
+    """fetch_with_retry, answered from the cache while the entry is fresh."""
+    cache = get_cache()
+    key = cache_key(url, params)
+    found, data = cache.get(key)
+    if found:
+        count("weather.cache_hits")
+        return data
+    count("weather.cache_misses")
+    data = fetch_with_retry(url, params=params)
+    cache.set(key, data, ttl)
+    return data
+
+def build_geo_params(city_name):
+    """Query parameters for the geocoding API."""
+    return {
+        'name': city_name,
+        'count': 1,
+        'language': 'en',
+        'format': 'json'
+    }
+
+def build_weather_params(lat, lon):
+    """Query parameters for the current-weather API."""
+    return {
+        'latitude': lat,
+        'longitude': lon,
+        'current_weather': 'true',
+        'temperature_unit': 'celsius',
+        'wind_speed_unit': 'kmh',
+        'timezone': 'auto'
+    }
+
+def get_geo_index():
+    """Returns the local gazetteer index, or None if disabled or missing."""
+    global GEO_INDEX
+    if GEO_INDEX is None and USE_GEO_INDEX and os.path.exists(GAZETTEER_FILE):
+        GEO_INDEX = GeoIndex(GAZETTEER_FILE)
+    return GEO_INDEX if USE_GEO_INDEX else None
+
+@timed("weather.geo_lookup")
+def local_geocode(city_name):
+    """Looks a city up in the local gazetteer only; None if it is not there."""
+    index = get_geo_index()
+    return index.lookup(city_name) if index is not None else None
+
+def geocode(city_name):
+    """Returns the first geocoding result for a city name, or None.
+
+    The local gazetteer answers known cities without a network round trip;
+    anything it does not know goes to the geocoding API.
+    """
+    location = local_geocode(city_name)
+    if location is not None:
+        return location
+    geo_data = cached_fetch(API_URL_GEO, build_geo_params(city_name), GEO_CACHE_TTL)
+    results = geo_data.get('results')
+    return results[0] if results else None
+
+def get_current_weather(lat, lon):
+    """Returns the 'current_weather' block for a coordinate, or None."""
+    weather_data = cached_fetch(API_URL_WEATHER, build_weather_params(lat, lon), WEATHER_CACHE_TTL)
+    return weather_data.get('current_weather')
+
+def format_location(location):
+    """Construct display name (City, State/Admin, Country)."""
+    display_name = location['name']
+    if location.get('admin1'):
+        display_name += f", {location['admin1']}"
+    if location.get('country'):
+        display_name += f", {location['country']}"
+    return display_name
+
+def display_weather(display_name, current_weather):
+    """Prints a formatted current-weather report."""
+    # Extract and format data
+    temp = current_weather['temperature']
+    wind_speed = current_weather['windspeed']
+    wind_dir = current_weather['winddirection']
+    time_updated = current_weather['time'].replace('T', ' ')
+    
+    wind_direction_str = get_wind_direction(wind_dir)
+
+    # --- Display Results ---
+    print("\n=============================================")
+    print(f"  🌎 Weather in {display_name}")
+    print("=============================================")
+    print(f"  🌡️  Temperature: {temp}°C")
+    print(f"  💨 Wind Speed: {wind_speed} km/h")
+    print(f"  ➡️  Wind Direction: {wind_direction_str}")
+    print(f"  ⏰ Last Updated: {time_updated}")
+    print("=============================================")
+
+def fetch_weather_many(city_names):
+    """Fetches several cities concurrently and displays each result."""
+    # Imported here: weather_async itself imports this module
+    from weather_async import fetch_weather_batch
+
+    print(f"\nSearching for weather in {len(city_names)} cities...")
+    for result in fetch_weather_batch(city_names):
+        if result.get("error"):
+            print(f"❌ {result['city']}: {result['error']}")
+        else:
+            display_weather(format_location(result["location"]), result["weather"])
+
 def fetch_weather(city_name):
     """Fetches and displays the current weather for the given city."""
     print(f"\nSearching for weather in '{city_name}'...")
     
     try:
         # --- Step 1: Geocoding (City Name to Coordinates) ---
-        geo_params = {
-            'name': city_name,
-            'count': 1,
-            'language': 'en',
-            'format': 'json'
-        }
-        geo_data = fetch_with_retry(API_URL_GEO, params=geo_params)
+        location = geocode(city_name)
 
-        if not geo_data.get('results'):
+        if location is None:
             print(f"❌ City '{city_name}' not found. Please check the spelling.")
             return
 
-        location = geo_data['results'][0]
         lat = location['latitude']
         lon = location['longitude']
-        
-        # Construct display name (City, State/Admin, Country)
-        display_name = location['name']
-        if location.get('admin1'):
-            display_name += f", {location['admin1']}"
-        if location.get('country'):
-            display_name += f", {location['country']}"
+        display_name = format_location(location)
 
         # --- Step 2: Fetch Current Weather ---
-        weather_params = {
-            'latitude': lat,
-            'longitude': lon,
-            'current_weather': 'true',
-            'temperature_unit': 'celsius',
-            'wind_speed_unit': 'kmh',
-            'timezone': 'auto'
-        }
-        weather_data = fetch_with_retry(API_URL_WEATHER, params=weather_params)
-
-        current_weather = weather_data.get('current_weather')
+        current_weather = get_current_weather(lat, lon)
 
         if not current_weather:
             print("❌ Could not retrieve current weather data for this location.")
             return
 
-        # Extract and format data
-        temp = current_weather['temperature']
-        wind_speed = current_weather['windspeed']
-        wind_dir = current_weather['winddirection']
-        time_updated = current_weather['time'].replace('T', ' ')
-        
-        wind_direction_str = get_wind_direction(wind_dir)
-
-        # --- Display Results ---
-        print("\n=============================================")
-        print(f"  🌎 Weather in {display_name}")
-        print("=============================================")
-        print(f"  🌡️  Temperature: {temp}°C")
-        print(f"  💨 Wind Speed: {wind_speed} km/h")
-        print(f"  ➡️  Wind Direction: {wind_direction_str}")
-        print(f"  ⏰ Last Updated: {time_updated}")
-        print("=============================================")
+        display_weather(display_name, current_weather)
 
     except requests.exceptions.HTTPError as err:
         print(f"❌ API Error: Failed to fetch data. Status code: {err.response.status_code}")
@@ -105,6 +304,7 @@ def main():
     """Main application loop."""
     print("--- Python Weather CLI ---")
     print("Type 'exit' or 'quit' to close the application.")
+    print(f"Separate several cities with '{CITY_SEPARATOR}' to fetch them all at once.")
     
     while True:
         city = input("\nEnter city name: ").strip()
@@ -113,8 +313,11 @@ def main():
             print("Goodbye! 👋")
             break
             
-        if city:
-            fetch_weather(city)
+        cities = [c.strip() for c in city.split(CITY_SEPARATOR) if c.strip()]
+        if len(cities) > 1:
+            fetch_weather_many(cities)
+        elif cities:
+            fetch_weather(cities[0])
         else:
             print("Please enter a city name to search.")
 
@@ -122,7 +325,8 @@ if __name__ == "__main__":
     # Check for the required 'requests' library
     try:
         import requests
-        main()
+        with instrumentation.session("weather"):
+            main()
     except ImportError:
         print("\n========================================================")
         print("    ERROR: The 'requests' library is not installed.")
@@ -0,0 +1,319 @@
+import bisect
+import functools
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+# --- Configuration ---
+# Instrumentation is off unless enabled in code or through the environment:
+#   APP_METRICS=1              collect timers, counters and histograms
+#   APP_METRICS_FILE=path      export there (".prom" = Prometheus text, else JSON)
+#   APP_METRICS_INTERVAL=secs  rewrite the export file periodically (default: at exit only)
+#   APP_PROFILE=cprofile|tracemalloc   capture a profile of the whole CLI session
+ENV_ENABLE = "APP_METRICS"
+ENV_FILE = "APP_METRICS_FILE"
+ENV_INTERVAL = "APP_METRICS_INTERVAL"
+ENV_PROFILE = "APP_PROFILE"
+
+# Latency histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# ====================================================================
+# Metrics registry
+# ====================================================================
+# Counters and latency histograms live in one registry guarded by a lock.
+# When instrumentation is disabled, `timed` functions cost one flag check
+# before calling straight through and `timer` hands out a shared no-op
+# context manager, so the hooks can stay in hot paths permanently.
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus layout)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """[(upper bound, observations <= bound)], ending with +Inf."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th quantile (0 if empty)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in self.cumulative():
+            if total >= rank:
+                return bound
+        return float("inf")
+
+class Registry:
+    """Named counters and histograms."""
+
+    def __init__(self):
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name, seconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+    def snapshot(self):
+        """JSON-ready view of every metric."""
+        with self._lock:
+            histograms = {}
+            for name, h in self.histograms.items():
+                histograms[name] = {
+                    "count": h.count,
+                    "sum_s": h.sum,
+                    "mean_ms": h.sum * 1000 / h.count if h.count else 0.0,
+                    "p50_ms_le": h.quantile(0.5) * 1000,
+                    "p95_ms_le": h.quantile(0.95) * 1000,
+                    "buckets": {("+Inf" if b == float("inf") else str(b)): c for b, c in h.cumulative()},
+                }
+            return {"timestamp": time.time(), "counters": dict(self.counters), "histograms": histograms}
+
+    def to_prometheus(self, prefix="app"):
+        """Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            for name, value in sorted(self.counters.items()):
+                metric = _metric_name(prefix, name) + "_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+            for name, h in sorted(self.histograms.items()):
+                metric = _metric_name(prefix, name) + "_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                for bound, total in h.cumulative():
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{metric}_bucket{{le="{le}"}} {total}')
+                lines.append(f"{metric}_sum {h.sum}")
+                lines.append(f"{metric}_count {h.count}")
+        return "\n".join(lines) + "\n"
+
+def _metric_name(prefix, name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{name}")
+
+REGISTRY = Registry()
+
+# --- Switches ---
+
+def enable():
+    REGISTRY.enabled = True
+
+def disable():
+    REGISTRY.enabled = False
+
+def is_enabled():
+    return REGISTRY.enabled
+
+# --- Recording ---
+
+def count(name, amount=1):
+    """Adds to a counter (no-op while disabled)."""
+    if REGISTRY.enabled:
+        REGISTRY.count(name, amount)
+
+def observe(name, seconds):
+    """Records one latency sample (no-op while disabled)."""
+    if REGISTRY.enabled:
+        REGISTRY.observe(name, seconds)
+
+class _Timer:
+    """Context manager that records its duration and counts errors."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        REGISTRY.observe(self.name, time.perf_counter() - self.start)
+        if exc_type is not None:
+            REGISTRY.count(self.name + ".errors")
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+def timer(name):
+    """`with timer("inventory.save"):` - times the block while enabled."""
+    return _Timer(name) if REGISTRY.enabled else _NULL_TIMER
+
+def timed(name):
+    """Decorator form of timer()."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not REGISTRY.enabled:
+                return func(*args, **kwargs)
+            with _Timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+# ====================================================================
+# Export
+# ====================================================================
+
+def export(path):
+    """Writes the current metrics atomically; '.prom' files get Prometheus text, others JSON."""
+    if path.endswith(".prom"):
+        content = REGISTRY.to_prometheus()
+    else:
+        content = json.dumps(REGISTRY.snapshot(), indent=2)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+class PeriodicExporter:
+    """Background thread that rewrites the export file every `interval` seconds."""
+
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            export(self.path)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the thread and writes a final export."""
+        self._stop.set()
+        self._thread.join()
+        export(self.path)
+
+# ====================================================================
+# Profiling
+# ====================================================================
+
+class Profiler:
+    """Opt-in cProfile or tracemalloc capture, written to `output` on stop()."""
+
+    def __init__(self, mode, output, top=25):
+        if mode not in ("cprofile", "tracemalloc"):
+            raise ValueError("Profile mode must be 'cprofile' or 'tracemalloc'.")
+        self.mode = mode
+        self.output = output
+        self.top = top
+        self._profile = None
+
+    def start(self):
+        if self.mode == "cprofile":
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            import tracemalloc
+            tracemalloc.start(25)
+        return self
+
+    def stop(self):
+        if self.mode == "cprofile":
+            import pstats
+            self._profile.disable()
+            self._profile.dump_stats(self.output)  # Open with: python -m pstats FILE
+            stats = pstats.Stats(self._profile, stream=sys.stderr).sort_stats("cumulative")
+            stats.print_stats(self.top)
+        else:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(self.output, 'w', encoding='utf-8') as f:
+                f.write(f"current {current} bytes, peak {peak} bytes\n")
+                for stat in snapshot.statistics("lineno")[:self.top]:
+                    f.write(f"{stat}\n")
+
+class CLISession:
+    """One CLI run, configured from the environment (see ENV_* above).
+
+    With nothing set this does nothing. Otherwise metrics are exported to
+    APP_METRICS_FILE (default <name>_metrics.json) when the session ends, and
+    APP_PROFILE writes <name>.prof (cProfile) or <name>_memory.txt (tracemalloc).
+    """
+
+    def __init__(self, name, environ=None):
+        environ = os.environ if environ is None else environ
+        self.name = name
+        self.metrics = environ.get(ENV_ENABLE, "") not in ("", "0") or bool(environ.get(ENV_FILE))
+        self.path = environ.get(ENV_FILE) or f"{name}_metrics.json"
+        self.interval = float(environ.get(ENV_INTERVAL) or 0)
+        self.profile_mode = environ.get(ENV_PROFILE, "").lower()
+        self._exporter = None
+        self._profiler = None
+
+    def __enter__(self):
+        if self.metrics:
+            enable()
+            if self.interval > 0:
+                self._exporter = PeriodicExporter(self.path, self.interval).start()
+        if self.profile_mode:
+            output = f"{self.name}.prof" if self.profile_mode == "cprofile" else f"{self.name}_memory.txt"
+            self._profiler = Profiler(self.profile_mode, output).start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profiler is not None:
+            self._profiler.stop()
+        if self._exporter is not None:
+            self._exporter.stop()
+        elif self.metrics:
+            export(self.path)
+        return False
+
+def session(name, environ=None):
+    """Context manager for a CLI entry point:
+
+        with instrumentation.session("inventory"):
+            main()
+    """
+    return CLISession(name, environ)
@@ -1,37 +1,41 @@
-import json
-import os
+import threading
 import time 
+from collections import namedtuple
+
+import instrumentation
+from cow_list import CowList
+from instrumentation import timed
+from inventory_events import InventoryEventLog, events_dir_for
+from segment_store import load_state, save_state
 
 # --- Configuration ---
+# Data lives in inventory_data.segments/ next to DATA_FILE (see segment_store);
+# an existing JSON file is imported on first load. Every add, restock and
+# purchase is also appended to inventory_data.events/ (see inventory_events),
+# which answers point-in-time and daily revenue questions. Events are logged
+# before the state is saved, and the saved state records the last event it
+# includes (event_seq), so on open any events after it are replayed into it.
 DATA_FILE = "inventory_data.json"
+SEGMENTED_LISTS = ("products",)
 
 # --- Data Persistence Functions ---
 
+def _empty_data():
+    """Initial empty structure."""
+    return {
+        "products": [],
+        "total_earnings": 0.0,
+        "next_product_id": 1001
+    }
+
+@timed("inventory.load")
 def _load_data():
-    """Loads all system data (products and earnings) from the JSON file."""
-    if not os.path.exists(DATA_FILE) or os.stat(DATA_FILE).st_size == 0:
-        # Initial empty structure
-        return {
-            "products": [],
-            "total_earnings": 0.0,
-            "next_product_id": 1001
-        }
-    
-    with open(DATA_FILE, 'r') as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            print(f"⚠️ Warning: {DATA_FILE} is corrupted. Initializing new system data.")
-            return {
-                "products": [],
-                "total_earnings": 0.0,
-                "next_product_id": 1001
-            }
+    """Loads all system data (products and earnings) from the segmented store."""
+    return load_state(DATA_FILE, SEGMENTED_LISTS, _empty_data)
 
 def _save_data(data):
-    """Saves all system data to the JSON file."""
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
+    """Saves all system data, rewriting only the segments that changed."""
+    save_state(DATA_FILE, SEGMENTED_LISTS, data)
 
 # --- Classes ---
 
@@ -54,39 +58,203 @@ class Product:
     def __str__(self):
         return f"{self.name} (ID: {self.id}) | Price: ${self.price:,.2f} | Stock: {self.quantity}"
 
+# --- Read Snapshots ---
+# Writers mutate Product objects under InventorySystem's lock and then publish
+# a new InventoryVersion by swapping one attribute. A version is immutable and
+# shares unchanged chunks with its predecessor (see cow_list), so reports
+# read a consistent inventory without taking the lock or slowing purchases.
+
+ProductView = namedtuple("ProductView", "id name price quantity")
+
+class InventoryVersion:
+    """Immutable inventory state as of one write."""
+
+    __slots__ = ("number", "products", "total_earnings", "stock_value")
+
+    def __init__(self, number, products, total_earnings, stock_value):
+        self.number = number
+        self.products = products  # CowList of ProductView
+        self.total_earnings = total_earnings
+        self.stock_value = stock_value  # Kept up to date per write, so summaries are O(1)
+
+    def summary(self):
+        return {
+            "version": self.number,
+            "total_earnings": self.total_earnings,
+            "total_stock_value": self.stock_value,
+            "product_count": len(self.products),
+        }
+
+def _view(product):
+    return ProductView(product.id, product.name, product.price, product.quantity)
+
 # --- Core Management System ---
 
 class InventorySystem:
-    def __init__(self):
+    def __init__(self, autosave=True):
         self.data = _load_data()
         # Re-create Product objects from stored data
-        self.products = [Product(**p) for p in self.data["products"]]
+        self.products = [Product(p["id"], p["name"], p["price"], p["quantity"]) for p in self.data["products"]]
         self.total_earnings = self.data["total_earnings"]
+        self.autosave = autosave  # Save after every change; otherwise call save()
+        self.events = InventoryEventLog(events_dir_for(DATA_FILE))
+        if self.events.seq == 0 and not self.events.snapshots and self.products:
+            # Existing data predates the event log: start its history from here
+            self.events.baseline([p.to_dict() for p in self.products], self.total_earnings)
+        elif self.data.get("event_seq", self.events.seq) < self.events.seq:
+            # A crash after logging but before saving: catch the state up
+            self._replay_events(self.data["event_seq"] + 1)
+
+        self._lock = threading.RLock()  # Serializes writers; readers use self.version
+        self._positions = {p.id: i for i, p in enumerate(self.products)}
+        self.version = InventoryVersion(
+            0,
+            CowList(_view(p) for p in self.products),
+            self.total_earnings,
+            sum(p.price * p.quantity for p in self.products),
+        )
+
+    def _replay_events(self, start_seq):
+        """Applies logged events from start_seq on to the loaded products and earnings."""
+        positions = {p.id: p for p in self.products}
+        for event in self.events.iter_events(start_seq):
+            product_id = event["product_id"]
+            if event["type"] == "add":
+                product = Product(product_id, event["name"], event["price"], event["quantity"])
+                self.products.append(product)
+                positions[product_id] = product
+                self.data["next_product_id"] = max(self.data["next_product_id"], product_id + 1)
+            elif event["type"] == "restock":
+                positions[product_id].quantity += event["quantity"]
+            else:
+                positions[product_id].quantity -= event["quantity"]
+                self.total_earnings += event["amount"]
+        self.data["event_seq"] = self.events.seq
+
+    def _publish(self, product):
+        """Publishes a new version after product changed (called with the lock held)."""
+        current = self.version
+        view = _view(product)
+        index = self._positions.get(product.id)
+        if index is None:
+            self._positions[product.id] = len(current.products)
+            products = current.products.append(view)
+            old_value = 0.0
+        else:
+            old = current.products[index]
+            products = current.products.set(index, view)
+            old_value = old.price * old.quantity
+        self.version = InventoryVersion(
+            current.number + 1,
+            products,
+            self.total_earnings,
+            current.stock_value - old_value + view.price * view.quantity,
+        )
+
+    def snapshot(self):
+        """The current immutable InventoryVersion; never waits for writers."""
+        return self.version
+
+    def summary(self):
+        """Earnings and stock value from one consistent version."""
+        return self.version.summary()
+
+    def save(self):
+        """Saves the current state now (for systems created with autosave=False)."""
+        with self._lock:
+            self._save_state()
         
+    def saved_state(self):
+        """A detached copy of what save() writes; write_state() can store it from any thread."""
+        with self._lock:
+            # Convert Product objects back to dictionaries for storage
+            return dict(self.data, products=[p.to_dict() for p in self.products],
+                        total_earnings=self.total_earnings, event_seq=self.events.seq)
+
+    def write_state(self, state):
+        """Writes a state taken by saved_state()."""
+        _save_data(state)
+
+    @timed("inventory.save")
     def _save_state(self):
-        """Prepares and saves the current state to the JSON file."""
-        # Convert Product objects back to dictionaries for storage
-        self.data["products"] = [p.to_dict() for p in self.products]
-        self.data["total_earnings"] = self.total_earnings
-        _save_data(self.data)
+        """Prepares and saves the current state to the data store."""
+        _save_data(self.saved_state())
         
     def add_product(self, name, price, quantity):
         """Adds a new product or restocks an existing one."""
-        
-        # Check if product already exists by name
-        existing_product = next((p for p in self.products if p.name.lower() == name.lower()), None)
-        
-        if existing_product:
-            existing_product.quantity += quantity
-            print(f"✅ Product already exists. Stock updated for '{name}'. New quantity: {existing_product.quantity}")
-        else:
-            product_id = self.data["next_product_id"]
-            new_product = Product(product_id, name, price, quantity)
-            self.products.append(new_product)
-            self.data["next_product_id"] += 1
-            print(f"✅ New product '{name}' added with ID: {product_id}")
-            
-        self._save_state()
+        with self._lock:
+            # Check if product already exists by name
+            existing_product = next((p for p in self.products if p.name.lower() == name.lower()), None)
+
+            if existing_product:
+                self._restock(existing_product, quantity)
+                print(f"✅ Product already exists. Stock updated for '{name}'. New quantity: {existing_product.quantity}")
+            else:
+                product_id = self.data["next_product_id"]
+                new_product = Product(product_id, name, price, quantity)
+                self.events.add(product_id, new_product.name, new_product.price, new_product.quantity)
+                self.products.append(new_product)
+                self.data["next_product_id"] += 1
+                self._publish(new_product)
+                print(f"✅ New product '{name}' added with ID: {product_id}")
+
+            if self.autosave:
+                self._save_state()
+
+    def _restock(self, product, quantity):
+        """Adds stock to a product (called with the lock held)."""
+        self.events.restock(product.id, quantity)
+        product.quantity += quantity
+        self._publish(product)
+
+    def restock(self, product_id, quantity):
+        """Adds quantity units to a product's stock and returns the new quantity.
+
+        Raises ValueError for an unknown product or a non-positive quantity.
+        """
+        with self._lock:
+            product = self.find_product(product_id)
+            if product is None:
+                raise ValueError(f"Invalid Product ID: {product_id}.")
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive.")
+            self._restock(product, quantity)
+            if self.autosave:
+                self._save_state()
+            return product.quantity
+
+    @timed("inventory.lookup")
+    def find_product(self, product_id):
+        """Returns the product with this ID, or None."""
+        index = self._positions.get(product_id)
+        return None if index is None else self.products[index]
+
+    def purchase(self, product_id, quantity):
+        """Sells quantity units of a product and returns the sale amount.
+
+        Raises ValueError for an unknown product, a non-positive quantity or
+        insufficient stock. process_purchase calls this once the input is valid.
+        """
+        with self._lock:
+            product = self.find_product(product_id)
+            if product is None:
+                raise ValueError(f"Invalid Product ID: {product_id}.")
+            if quantity <= 0:
+                raise ValueError("Quantity must be positive.")
+            if quantity > product.quantity:
+                raise ValueError(f"Insufficient stock. Only {product.quantity} available.")
+
+            sale_amount = quantity * product.price
+            self.events.purchase(product.id, quantity, sale_amount)
+
+            # Update stock and earnings
+            product.quantity -= quantity
+            self.total_earnings += sale_amount
+            self._publish(product)
+
+            if self.autosave:
+                self._save_state()
+            return sale_amount
 
     def show_inventory(self):
         """Displays all available products and their stock."""
@@ -113,7 +281,7 @@ class InventorySystem:
                 if prod_id_input.lower() == 'q': return
                 
                 prod_id = int(prod_id_input)
-                selected_product = next((p for p in self.products if p.id == prod_id), None)
+                selected_product = self.find_product(prod_id)
                 
                 if not selected_product:
                     print("❌ Invalid Product ID.")
@@ -139,13 +307,7 @@ class InventorySystem:
                 print("❌ Invalid input. Please enter a number.")
         
         # 3. Process Transaction
-        sale_amount = quantity_to_buy * selected_product.price
-        
-        # Update stock and earnings
-        selected_product.quantity -= quantity_to_buy
-        self.total_earnings += sale_amount
-        
-        self._save_state()
+        sale_amount = self.purchase(selected_product.id, quantity_to_buy)
         
         print(f"\n🎉 Purchase Successful!")
         print(f"  Item: {selected_product.name}")
@@ -155,14 +317,38 @@ class InventorySystem:
 
     def show_summary(self):
         """Displays the total available stock value and total earnings."""
-        # Calculate the total value of remaining inventory
-        total_stock_value = sum(p.price * p.quantity for p in self.products)
+        # Both figures come from one published version, even while purchases run
+        summary = self.summary()
 
         print("\n--- 💰 Financial Summary ---")
-        print(f"Total Earnings (from sales): ${self.total_earnings:,.2f}")
-        print(f"Total Current Stock Value:   ${total_stock_value:,.2f}")
+        print(f"Total Earnings (from sales): ${summary['total_earnings']:,.2f}")
+        print(f"Total Current Stock Value:   ${summary['total_stock_value']:,.2f}")
+        print("-" * 35)
+
+    def show_stock_at(self, when):
+        """Displays stock and earnings as they were at a past time."""
+        state = self.events.state_at(when)
+        print(f"\n--- 🕘 Stock as of {state['ts'] or when} ---")
+        if not state["products"]:
+            print("  No products recorded yet at that time.")
+        for p in state["products"]:
+            print(f"  {p['name']} (ID: {p['id']}) | Price: ${p['price']:,.2f} | Stock: {p['quantity']}")
+        print(f"Total Earnings by then: ${state['total_earnings']:,.2f}")
+        print("-" * 50)
+
+    def show_daily_revenue(self):
+        """Displays revenue per day, folded from the purchase events."""
+        revenue = self.events.daily_revenue()
+        print("\n--- 📅 Daily Revenue ---")
+        if not revenue:
+            print("  No purchases recorded yet.")
+        for day, amount in revenue.items():
+            print(f"  {day}: ${amount:,.2f}")
         print("-" * 35)
 
+    def close(self):
+        self.events.close()
+
 # --- Main CLI Application Helper Functions ---
 
 def get_valid_float(prompt):
@@ -207,9 +393,11 @@ def main():
         print("2. Process Purchase")
         print("3. Show Available Stock")
         print("4. Show Financial Summary")
-        print("5. Exit")
+        print("5. Show Stock at a Past Time")
+        print("6. Show Daily Revenue")
+        print("7. Exit")
 
-        choice = input("Enter your choice (1-5): ").strip()
+        choice = input("Enter your choice (1-7): ").strip()
 
         if choice == '1':
             name = input("Product Name: ").strip()
@@ -232,11 +420,23 @@ def main():
             system.show_summary()
 
         elif choice == '5':
+            when = input("Time (YYYY-MM-DD HH:MM): ").strip()
+            try:
+                system.show_stock_at(when)
+            except ValueError as e:
+                print(f"❌ {e}")
+
+        elif choice == '6':
+            system.show_daily_revenue()
+
+        elif choice == '7':
+            system.close()
             print("Thank you for using the IMS. Goodbye! 👋")
             break
 
         else:
-            print("Invalid choice. Please enter a number from 1 to 5.")
+            print("Invalid choice. Please enter a number from 1 to 7.")
 
 if __name__ == "__main__":
-    main()
+    with instrumentation.session("inventory"):
+        main()
@@ -0,0 +1,280 @@
+import bisect
+import itertools
+import json
+import os
+from datetime import datetime
+
+# --- Configuration ---
+# The event log keeps its files in one directory:
+#   events-<first seq>.jsonl   - append-only events, one JSON record per line
+#   snapshot-<seq>-<time>.json - full inventory state after event <seq>, whose
+#                                timestamp is <time> (YYYYMMDDHHMMSS)
+# A snapshot is written every SNAPSHOT_EVERY events and the log then moves on
+# to a new file, so each log file holds the events between two snapshots and
+# any point in time is at most SNAPSHOT_EVERY events of replay away.
+EVENTS_DIR = "inventory_events"
+SNAPSHOT_EVERY = 10000
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+READ_BATCH = 10000  # Log lines decoded per json.loads call when streaming
+
+# --- Time Helpers ---
+
+def now():
+    return datetime.now().strftime(TIME_FORMAT)
+
+def normalize_time(when):
+    """A datetime or 'YYYY-MM-DD[ HH:MM[:SS]]' string as a TIME_FORMAT string.
+
+    Event timestamps use the same format, so they compare as plain strings.
+    """
+    if isinstance(when, datetime):
+        return when.strftime(TIME_FORMAT)
+    for fmt in (TIME_FORMAT, "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(str(when).strip(), fmt).strftime(TIME_FORMAT)
+        except ValueError:
+            continue
+    raise ValueError(f"Invalid time: {when!r}. Use YYYY-MM-DD or YYYY-MM-DD HH:MM.")
+
+def events_dir_for(data_file):
+    """'inventory_data.json' -> 'inventory_data.events'."""
+    return os.path.splitext(data_file)[0] + ".events"
+
+def log_path(directory, first_seq):
+    return os.path.join(directory, f"events-{first_seq:012d}.jsonl")
+
+def snapshot_path(directory, seq, ts):
+    stamp = "".join(c for c in ts if c.isdigit()) if ts else "0" * 14
+    return os.path.join(directory, f"snapshot-{seq:012d}-{stamp}.json")
+
+def parse_snapshot_name(name):
+    """'snapshot-<seq>-<time>.json' -> (ts, seq); ts is '' for a log that had no events."""
+    seq, stamp = name[len("snapshot-"):-len(".json")].split("-")
+    if not stamp.strip("0"):
+        return "", int(seq)
+    ts = f"{stamp[:4]}-{stamp[4:6]}-{stamp[6:8]} {stamp[8:10]}:{stamp[10:12]}:{stamp[12:14]}"
+    return ts, int(seq)
+
+def write_snapshot(directory, state):
+    """Writes a state dict (products keyed by ID) atomically as a snapshot file."""
+    path = snapshot_path(directory, state["seq"], state["ts"])
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(state, products=list(state["products"].values())), f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+# --- State ---
+
+def empty_state():
+    return {"seq": 0, "ts": None, "products": {}, "total_earnings": 0.0}
+
+def apply_event(state, event):
+    """Applies one event to a state dict (products keyed by ID)."""
+    kind = event["type"]
+    products = state["products"]
+    if kind == "add":
+        products[event["product_id"]] = {
+            "id": event["product_id"],
+            "name": event["name"],
+            "price": event["price"],
+            "quantity": event["quantity"],
+        }
+    elif kind == "restock":
+        products[event["product_id"]]["quantity"] += event["quantity"]
+    elif kind == "purchase":
+        products[event["product_id"]]["quantity"] -= event["quantity"]
+        state["total_earnings"] += event["amount"]
+    else:
+        raise ValueError(f"Unknown event type: {kind!r}")
+    state["seq"] = event["seq"]
+    state["ts"] = event["ts"]
+
+def daily_revenue(events, start=None, end=None):
+    """Streaming fold of purchase events into {day: revenue}.
+
+    `events` can be any iterable (e.g. InventoryEventLog.iter_events()), so
+    memory grows with the number of days, not the number of events. start
+    and end are inclusive 'YYYY-MM-DD' bounds.
+    """
+    revenue = {}
+    for event in events:
+        if event["type"] != "purchase":
+            continue
+        day = event["ts"][:10]
+        if (start and day < start) or (end and day > end):
+            continue
+        revenue[day] = revenue.get(day, 0.0) + event["amount"]
+    return {day: round(revenue[day], 2) for day in sorted(revenue)}
+
+# --- Event Log ---
+
+class InventoryEventLog:
+    """Append-only restock/purchase events with periodic snapshots.
+
+    Like atm_ledger.Ledger, each event is written to the log before it is
+    applied to the in-memory state, and a restart rebuilds that state from
+    the latest snapshot plus the log written after it. Unlike the ledger,
+    snapshots are kept, which is what makes point-in-time queries cheap.
+    """
+
+    def __init__(self, directory=EVENTS_DIR, snapshot_every=SNAPSHOT_EVERY, fsync=False):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        # (ts, seq) of every snapshot, in order; ts is that of the last event folded in
+        self.snapshots = []
+        self.state = empty_state()
+        self._since_snapshot = 0
+        self._log = None
+        self._recover()
+        self._log = open(log_path(directory, self.seq - self._since_snapshot + 1), 'a', encoding='utf-8')
+
+    @property
+    def seq(self):
+        return self.state["seq"]
+
+    def _log_files(self):
+        """[(first seq, path)] in order."""
+        names = sorted(n for n in os.listdir(self.directory) if n.startswith("events-") and n.endswith(".jsonl"))
+        return [(int(n[7:-6]), os.path.join(self.directory, n)) for n in names]
+
+    # --- Recovery ---
+
+    def _recover(self):
+        """Loads the latest snapshot and replays the log written after it."""
+        # Snapshot names carry their time, so only the latest one is read here
+        self.snapshots = sorted((parse_snapshot_name(n) for n in os.listdir(self.directory)
+                                 if n.startswith("snapshot-") and n.endswith(".json")),
+                                key=lambda snapshot: snapshot[1])
+        if self.snapshots:
+            self.state = self._read_snapshot(*self.snapshots[-1])
+
+        files = self._log_files()
+        if not files:
+            return
+        # A torn write from a crash can only be at the end of the newest file
+        last_path = files[-1][1]
+        good_offset = 0
+        with open(last_path, 'rb') as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    json.loads(raw)
+                except ValueError:
+                    break
+                good_offset += len(raw)
+        if good_offset != os.path.getsize(last_path):
+            with open(last_path, 'r+b') as f:
+                f.truncate(good_offset)
+
+        for event in self.iter_events(self.seq + 1):
+            apply_event(self.state, event)
+            self._since_snapshot += 1
+
+    def _read_snapshot(self, ts, seq):
+        with open(snapshot_path(self.directory, seq, ts), 'r', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        snapshot["products"] = {p["id"]: p for p in snapshot["products"]}
+        return snapshot
+
+    # --- Write Path ---
+
+    def _append(self, kind, product_id, quantity, **fields):
+        event = {"seq": self.seq + 1, "ts": now(), "type": kind, "product_id": product_id,
+                 "quantity": quantity, **fields}
+        self._log.write(json.dumps(event, separators=(',', ':')) + "\n")
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        apply_event(self.state, event)
+        self._since_snapshot += 1
+        if self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+        return event
+
+    def add(self, product_id, name, price, quantity):
+        """Records a new product with its opening stock."""
+        return self._append("add", product_id, quantity, name=name, price=price)
+
+    def restock(self, product_id, quantity):
+        return self._append("restock", product_id, quantity)
+
+    def purchase(self, product_id, quantity, amount):
+        return self._append("purchase", product_id, quantity, amount=amount)
+
+    def baseline(self, products, total_earnings):
+        """Seeds an empty log with existing state (product dicts) as snapshot 0."""
+        if self.seq or self.snapshots:
+            raise ValueError("The event log already has history.")
+        self.state["products"] = {p["id"]: dict(p) for p in products}
+        self.state["total_earnings"] = total_earnings
+        self.state["ts"] = now()
+        self.snapshot()
+
+    # --- Snapshots ---
+
+    def snapshot(self):
+        """Writes the current state atomically, then starts a new log file."""
+        write_snapshot(self.directory, self.state)
+        self.snapshots.append((self.state["ts"] or "", self.seq))
+
+        self._log.close()
+        self._log = open(log_path(self.directory, self.seq + 1), 'a', encoding='utf-8')
+        self._since_snapshot = 0
+
+    # --- Reads ---
+
+    def iter_events(self, start_seq=1):
+        """Yields events with seq >= start_seq, streaming the log file by file."""
+        if self._log is not None:
+            self._log.flush()
+        files = self._log_files()
+        firsts = [first for first, _ in files]
+        # Skip whole files that end before start_seq
+        begin = max(bisect.bisect_right(firsts, start_seq) - 1, 0)
+        for _, path in files[begin:]:
+            with open(path, 'r', encoding='utf-8') as f:
+                while True:
+                    lines = list(itertools.islice(f, READ_BATCH))
+                    if not lines:
+                        break
+                    batch = json.loads("[" + ",".join(lines) + "]")
+                    if batch[-1]["seq"] < start_seq:
+                        continue
+                    if batch[0]["seq"] >= start_seq:
+                        yield from batch
+                    else:
+                        yield from (event for event in batch if event["seq"] >= start_seq)
+
+    def state_at(self, when):
+        """Inventory state as of `when`: nearest earlier snapshot plus a short replay.
+
+        Returns {"seq", "ts", "products": [...], "total_earnings"}.
+        """
+        target = normalize_time(when)
+        index = bisect.bisect_right(self.snapshots, (target, float("inf"))) - 1
+        state = self._read_snapshot(*self.snapshots[index]) if index >= 0 else empty_state()
+        for event in self.iter_events(state["seq"] + 1):
+            if event["ts"] > target:
+                break
+            apply_event(state, event)
+        return dict(state, products=sorted(state["products"].values(), key=lambda p: p["id"]))
+
+    def daily_revenue(self, start=None, end=None):
+        return daily_revenue(self.iter_events(), start, end)
+
+    def close(self):
+        if not self._log.closed:
+            self._log.flush()
+            os.fsync(self._log.fileno())
+            self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,161 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import tracker
+from segment_store import SegmentedStore, segment_dir_for
+
+# --- Configuration ---
+SHARDS_PER_WORKER = 4  # More shards than workers keeps every process busy until the end
+TOP_LEDGERS = 5        # Largest and smallest net balances kept in the rollup
+
+# ====================================================================
+# Per-ledger and per-shard rollups (run inside worker processes)
+# ====================================================================
+# A rollup is a plain dict of sums plus the extreme ledgers, so partial
+# results from any number of shards merge in any order.
+
+def empty_rollup():
+    return {
+        "ledgers": 0,
+        "transactions": 0,
+        "total_income": 0.0,
+        "total_expenses": 0.0,
+        "negative_ledgers": 0,
+        "top": [],     # [(net balance, data file)], highest first
+        "bottom": [],  # [(net balance, data file)], lowest first
+        "errors": [],  # [(data file, message)]
+    }
+
+def read_ledger(data_file):
+    """A ledger's data, read-only: nothing is migrated, repaired or backed up here.
+
+    Damaged ledgers raise (and are reported by the rollup); the tracker
+    repairs them the next time that user's ledger is opened.
+    """
+    data = SegmentedStore(segment_dir_for(data_file), tracker.SEGMENTED_LISTS).read()
+    if data is not None:
+        return data
+    with open(data_file, 'r') as f:
+        return json.load(f)
+
+def summarize_ledger(data_file):
+    """tracker.get_summary-style totals for one ledger."""
+    data = read_ledger(data_file)
+    total_income, total_expenses = tracker._totals(data["transactions"])
+    return {
+        "total_income": total_income,
+        "total_expenses": total_expenses,
+        "net_balance": total_income - total_expenses,
+        "total_transactions": len(data["transactions"]),
+    }
+
+def add_ledger(rollup, data_file, summary):
+    rollup["ledgers"] += 1
+    rollup["transactions"] += summary["total_transactions"]
+    rollup["total_income"] += summary["total_income"]
+    rollup["total_expenses"] += summary["total_expenses"]
+    if summary["net_balance"] < 0:
+        rollup["negative_ledgers"] += 1
+    entry = (round(summary["net_balance"], 2), data_file)
+    rollup["top"] = sorted(rollup["top"] + [entry], reverse=True)[:TOP_LEDGERS]
+    rollup["bottom"] = sorted(rollup["bottom"] + [entry])[:TOP_LEDGERS]
+
+def summarize_shard(data_files):
+    """One worker's partial rollup over a list of ledgers."""
+    rollup = empty_rollup()
+    for data_file in data_files:
+        try:
+            add_ledger(rollup, data_file, summarize_ledger(data_file))
+        except (OSError, ValueError, KeyError) as e:
+            rollup["errors"].append((data_file, str(e)))
+    return rollup
+
+def merge(rollups):
+    """Combines partial rollups into one."""
+    total = empty_rollup()
+    for rollup in rollups:
+        for key in ("ledgers", "transactions", "total_income", "total_expenses", "negative_ledgers"):
+            total[key] += rollup[key]
+        total["top"] = sorted(total["top"] + rollup["top"], reverse=True)[:TOP_LEDGERS]
+        total["bottom"] = sorted(total["bottom"] + rollup["bottom"])[:TOP_LEDGERS]
+        total["errors"].extend(rollup["errors"])
+    total["net_balance"] = total["total_income"] - total["total_expenses"]
+    return total
+
+# ====================================================================
+# Fan-out
+# ====================================================================
+
+def shard(items, count):
+    """Splits items into at most `count` contiguous, nearly equal shards."""
+    count = max(1, min(count, len(items)))
+    size, extra = divmod(len(items), count)
+    shards = []
+    start = 0
+    for i in range(count):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(items[start:end])
+        start = end
+    return shards
+
+def aggregate(directory=None, workers=None, data_files=None):
+    """Rolls up every ledger in the directory across `workers` processes.
+
+    workers=1 runs in this process (no pool); None uses every CPU.
+    """
+    if data_files is None:
+        data_files = tracker.list_ledgers(directory)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(data_files) < 2:
+        return merge([summarize_shard(data_files)])
+    shards = shard(data_files, workers * SHARDS_PER_WORKER)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return merge(pool.map(summarize_shard, shards))
+
+# ====================================================================
+# Command line
+# ====================================================================
+
+USAGE = "Usage: python ledger_aggregate.py [LEDGER_DIR] [--workers N]"
+
+def main(argv):
+    """python ledger_aggregate.py [LEDGER_DIR] [--workers N] - roll up all per-user ledgers."""
+    args = list(argv[1:])
+    workers = None
+    if "--workers" in args:
+        i = args.index("--workers")
+        try:
+            workers = int(args[i + 1])
+        except (IndexError, ValueError):
+            print(USAGE)
+            return 1
+        del args[i:i + 2]
+    if len(args) > 1:
+        print(USAGE)
+        return 1
+    directory = args[0] if args else tracker.LEDGER_DIR
+
+    start = time.perf_counter()
+    rollup = aggregate(directory, workers)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n--- 📊 Rollup of {rollup['ledgers']:,} ledgers in {directory} ---")
+    print(f"Transactions:         {rollup['transactions']:,}")
+    print(f"Total Income:         +${rollup['total_income']:,.2f}")
+    print(f"Total Expenses:       -${rollup['total_expenses']:,.2f}")
+    print(f"Net Balance:          ${rollup['net_balance']:,.2f}")
+    print(f"Ledgers below zero:   {rollup['negative_ledgers']:,}")
+    for title, key in (("Highest net balances", "top"), ("Lowest net balances", "bottom")):
+        print(f"{title}:")
+        for net, data_file in rollup[key]:
+            print(f"  {tracker.ledger_user(data_file):<24} ${net:,.2f}")
+    for data_file, message in rollup["errors"]:
+        print(f"⚠️ Skipped {data_file}: {message}")
+    print(f"({elapsed:.2f}s with {workers or os.cpu_count()} worker process(es))")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -7,6 +7,30 @@ library_inventory = {
     "Moby Dick": 0 # Example of a book with no copies available
 }
 
+def check_out(title):
+    """Takes one copy of a book out and returns the copies left.
+
+    Raises KeyError if the title is not in the collection and ValueError if
+    every copy is already borrowed.
+    """
+    if library_inventory[title] <= 0:
+        raise ValueError(f"All copies of '{title}' are currently borrowed.")
+    library_inventory[title] -= 1
+    return library_inventory[title]
+
+def check_in(title, add_missing=False):
+    """Puts one copy of a book back and returns the copies available.
+
+    A title the library does not know raises KeyError, unless add_missing is
+    set, in which case it is added with that one copy.
+    """
+    if title not in library_inventory and add_missing:
+        library_inventory[title] = 0
+    library_inventory[title] += 1
+    return library_inventory[title]
+
+# --------------------------------------------------
+
 def view_available_books():
     """Views all books and their availability status."""
     if not library_inventory:
@@ -62,13 +86,11 @@ def borrow_book():
         print(f"❌ Book '{title}' is not in the library collection.")
         return
 
-    current_copies = library_inventory[title]
-    
-    if current_copies > 0:
+    try:
         # Updating Dictionary Items
-        library_inventory[title] -= 1
-        print(f"✅ You have borrowed '{title}'. Copies left: {library_inventory[title]}")
-    else:
+        copies_left = check_out(title)
+        print(f"✅ You have borrowed '{title}'. Copies left: {copies_left}")
+    except ValueError:
         print(f"⚠️ Sorry, all copies of '{title}' are currently borrowed.")
 
 # --------------------------------------------------
@@ -82,15 +104,15 @@ def return_book():
         # Option: If the user returns a book not in the system, add it back with 1 copy.
         add_new = input(f"Book '{title}' not found. Add it to inventory with 1 copy? (y/n): ").lower().strip()
         if add_new == 'y':
-            library_inventory[title] = 1
+            check_in(title, add_missing=True)
             print(f"✅ '{title}' returned and added to inventory (1 copy).")
         else:
             print("Return canceled.")
         return
     
     # Updating Dictionary Items
-    library_inventory[title] += 1
-    print(f"✅ Thank you! '{title}' has been returned. Copies available: {library_inventory[title]}")
+    copies = check_in(title)
+    print(f"✅ Thank you! '{title}' has been returned. Copies available: {copies}")
 
 # --------------------------------------------------
 
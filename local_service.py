@@ -0,0 +1,456 @@
+import asyncio
+import contextlib
+import json
+import math
+import os
+import sys
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import hospital
+import inventory
+import tracker
+
+# --- Configuration ---
+HOST = "127.0.0.1"  # Local only: there is no authentication
+PORT = 8080
+FLUSH_INTERVAL = 0.5    # Seconds between batched saves of whatever changed
+MAX_BODY = 64 * 1024    # Larger request bodies are refused
+MAX_HEADERS = 100
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+# ====================================================================
+# In-memory state
+# ====================================================================
+# The service loads each system once and keeps it in memory for its whole
+# life. Requests change that state only; a background task saves whatever
+# changed every FLUSH_INTERVAL seconds (and once more on shutdown), so a
+# burst of requests costs one save per store instead of one per request.
+# Each store's state is copied on the event loop (saved_state) and written
+# by a worker thread (write_state), so a save never stalls the connections.
+# The worker only writes; the changed-store set and the stats are touched
+# on the event loop alone, where a store whose save failed is marked as
+# changed again and retried on the next flush.
+# A crash loses at most the last FLUSH_INTERVAL of tracker and hospital
+# changes; inventory changes are also in its event log (see inventory_events).
+# The service owns the data files while it runs: don't use the CLI menus
+# on the same files at the same time.
+
+class ServiceError(Exception):
+    """A request the service refuses, with the HTTP status to answer."""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+class TrackerLedger:
+    """One tracker data file held in memory, with running totals."""
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.data = tracker._load_data(data_file)
+        self.total_income, self.total_expenses = tracker._totals(self.data["transactions"])
+
+    def add(self, type, amount, description):
+        transaction = tracker.new_transaction(self.data["transactions"], type, amount, description)
+        self.data["transactions"].append(transaction)
+        if type == "income":
+            self.total_income += amount
+        else:
+            self.total_expenses += amount
+        return transaction
+
+    def summary(self):
+        """The same figures as tracker.get_summary."""
+        return {
+            "total_income": self.total_income,
+            "total_expenses": self.total_expenses,
+            "net_balance": self.total_income - self.total_expenses,
+            "total_transactions": len(self.data["transactions"]),
+        }
+
+    def saved_state(self):
+        # Transactions are never changed once added, so a shallow copy is detached
+        return {"transactions": list(self.data["transactions"])}
+
+    def write_state(self, state):
+        tracker._save_data(state, self.data_file)
+
+# --- Request parameters ---
+
+def _param(params, key, convert, check=None, message=None):
+    if key not in params:
+        raise ServiceError(f"Missing parameter: {key}.")
+    try:
+        value = convert(params[key])
+    except (TypeError, ValueError):
+        raise ServiceError(f"Invalid {key}: {params[key]!r}.")
+    if check is not None and not check(value):
+        raise ServiceError(message or f"Invalid {key}: {params[key]!r}.")
+    return value
+
+def _integer(value):
+    """A whole number from JSON or the query string; 2.9, true and "2.5" are refused."""
+    if isinstance(value, bool):
+        raise ValueError(value)
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(value)
+        return int(value)
+    return int(value)
+
+def _text(value):
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError(value)
+    return value.strip()
+
+def _positive(value):
+    return value > 0
+
+# ====================================================================
+# The service
+# ====================================================================
+# Endpoints (JSON in, JSON out; GET parameters may also be in the query):
+#   GET  /inventory/summary
+#   GET  /inventory/product       id
+#   POST /inventory/purchase      product_id, quantity
+#   POST /inventory/restock       product_id, quantity
+#   GET  /tracker/summary         [user]
+#   POST /tracker/transactions    type ("income" or "expense"), amount, description, [user]
+#   GET  /hospital/doctors
+#   POST /hospital/appointments   doctor_id, name, age, disease
+#   GET  /stats
+# Tracker requests with a user go to that user's ledger (tracker.ledger_file).
+
+class Service:
+    """Inventory, tracker and hospital operations over one in-memory state."""
+
+    def __init__(self, flush_interval=FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self.inventory = inventory.InventorySystem(autosave=False)
+        self.hospital = hospital.HospitalSystem(autosave=False)
+        self.ledgers = {}   # data file -> TrackerLedger
+        self._dirty = set()  # Stores (with saved_state/write_state) changed since the last flush
+        self._writing = None  # The flush being written by a worker thread, if any
+        self.stats = {"requests": 0, "errors": 0, "flushes": 0, "saves": 0, "save_errors": 0,
+                      "last_flush_ms": 0.0}
+        self.routes = {
+            ("GET", "/inventory/summary"): self.inventory_summary,
+            ("GET", "/inventory/product"): self.inventory_product,
+            ("POST", "/inventory/purchase"): self.inventory_purchase,
+            ("POST", "/inventory/restock"): self.inventory_restock,
+            ("GET", "/tracker/summary"): self.tracker_summary,
+            ("POST", "/tracker/transactions"): self.tracker_add,
+            ("GET", "/hospital/doctors"): self.hospital_doctors,
+            ("POST", "/hospital/appointments"): self.hospital_book,
+            ("GET", "/stats"): self.get_stats,
+        }
+
+    # --- Inventory ---
+
+    def inventory_summary(self, params):
+        return self.inventory.summary()
+
+    def inventory_product(self, params):
+        product = self.inventory.find_product(_param(params, "id", _integer))
+        if product is None:
+            raise ServiceError(f"Invalid Product ID: {params['id']}.", 404)
+        return product.to_dict()
+
+    def inventory_purchase(self, params):
+        product_id = _param(params, "product_id", _integer)
+        quantity = _param(params, "quantity", _integer, _positive, "Quantity must be positive.")
+        amount = self.inventory.purchase(product_id, quantity)
+        self._dirty.add(self.inventory)
+        return {"product_id": product_id, "quantity": quantity, "amount": amount,
+                "remaining": self.inventory.find_product(product_id).quantity}
+
+    def inventory_restock(self, params):
+        product_id = _param(params, "product_id", _integer)
+        quantity = _param(params, "quantity", _integer, _positive, "Quantity must be positive.")
+        remaining = self.inventory.restock(product_id, quantity)
+        self._dirty.add(self.inventory)
+        return {"product_id": product_id, "quantity": quantity, "remaining": remaining}
+
+    # --- Tracker ---
+
+    def ledger(self, params):
+        """The in-memory ledger for the request's user (or tracker.DATA_FILE)."""
+        user = params.get("user")
+        try:
+            data_file = tracker.ledger_file(user) if user else tracker.DATA_FILE
+        except (AttributeError, ValueError):
+            raise ServiceError(f"Invalid user: {user!r}.")
+        if data_file not in self.ledgers:
+            self.ledgers[data_file] = TrackerLedger(data_file)
+        return self.ledgers[data_file]
+
+    def tracker_summary(self, params):
+        return self.ledger(params).summary()
+
+    def tracker_add(self, params):
+        type = _param(params, "type", str, lambda t: t in ("income", "expense"),
+                      "type must be 'income' or 'expense'.")
+        amount = _param(params, "amount", float, lambda a: a > 0 and math.isfinite(a),
+                        "Transaction amount must be positive.")
+        description = _param(params, "description", _text)
+        ledger = self.ledger(params)
+        transaction = ledger.add(type, amount, description)
+        self._dirty.add(ledger)
+        return transaction
+
+    # --- Hospital ---
+
+    def hospital_doctors(self, params):
+        return [d.to_dict() for d in self.hospital.doctors]
+
+    def hospital_book(self, params):
+        doctor_id = _param(params, "doctor_id", _integer)
+        patient = hospital.Patient(
+            _param(params, "name", _text),
+            _param(params, "age", _integer, _positive, "Age must be positive."),
+            _param(params, "disease", _text),
+        )
+        appointment = self.hospital.book(doctor_id, patient)
+        self._dirty.add(self.hospital)
+        return appointment
+
+    def get_stats(self, params):
+        return dict(self.stats, unsaved_stores=len(self._dirty))
+
+    # --- Dispatch and persistence ---
+
+    def dispatch(self, method, target, body=b""):
+        """Runs one request; returns (HTTP status, JSON-able payload)."""
+        self.stats["requests"] += 1
+        url = urlsplit(target)
+        handler = self.routes.get((method, url.path))
+        try:
+            if handler is None:
+                if any(path == url.path for _, path in self.routes):
+                    raise ServiceError(f"{method} is not supported on {url.path}.", 405)
+                raise ServiceError(f"Unknown endpoint: {url.path}.", 404)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            if body:
+                try:
+                    payload = json.loads(body)
+                except ValueError:
+                    raise ServiceError("Request body is not valid JSON.")
+                if not isinstance(payload, dict):
+                    raise ServiceError("Request body must be a JSON object.")
+                params.update(payload)
+            return 200, handler(params)
+        except ServiceError as e:
+            self.stats["errors"] += 1
+            return e.status, {"error": str(e)}
+        except ValueError as e:
+            # The systems' own validation (unknown ID, insufficient stock, ...)
+            self.stats["errors"] += 1
+            return 400, {"error": str(e)}
+        except Exception as e:
+            self.stats["errors"] += 1
+            _log(f"{method} {target} failed: {e!r}")
+            return 500, {"error": "Internal server error."}
+
+    def _take_dirty(self):
+        """[(store, detached state)] for every store changed since the last flush."""
+        jobs = [(store, store.saved_state()) for store in self._dirty]
+        self._dirty = set()
+        return jobs
+
+    @staticmethod
+    def _write(jobs):
+        """Writes taken states (safe on any thread); returns (failed stores, saves, seconds)."""
+        start = time.perf_counter()
+        failed = []
+        for store, state in jobs:
+            try:
+                store.write_state(state)
+            except Exception as e:
+                failed.append(store)
+                _log(f"Saving {type(store).__name__} failed, will retry: {e!r}")
+        return failed, len(jobs) - len(failed), time.perf_counter() - start
+
+    def _written(self, result):
+        """Records a finished write on the event loop; failed stores are marked changed again."""
+        failed, saves, seconds = result
+        self._dirty.update(failed)
+        self.stats["saves"] += saves
+        self.stats["save_errors"] += len(failed)
+        self.stats["flushes"] += 1
+        self.stats["last_flush_ms"] = round(seconds * 1000, 3)
+
+    def _write_finished(self, jobs, future):
+        """Done callback of a flush's worker (runs on the event loop)."""
+        if not future.cancelled() and future.exception() is None:
+            self._written(future.result())
+            return
+        if not future.cancelled():
+            _log(f"Flush failed, will retry: {future.exception()!r}")
+        self._written(([store for store, _ in jobs], 0, 0.0))
+
+    async def flush(self):
+        """Saves every store changed since the last flush, writing from a worker thread."""
+        jobs = self._take_dirty()
+        if jobs:
+            self._writing = asyncio.get_running_loop().run_in_executor(None, self._write, jobs)
+            # Recorded by a callback, so a flush cancelled at shutdown still re-marks failures
+            self._writing.add_done_callback(lambda future: self._write_finished(jobs, future))
+            await asyncio.shield(self._writing)
+
+    def close(self):
+        """Final flush, on the calling thread; the service must not be used afterwards."""
+        self._written(self._write(self._take_dirty()))
+        self.inventory.close()
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                _log(f"Flush failed: {e!r}")
+
+    # --- HTTP ---
+
+    async def _read_request(self, reader):
+        """(method, target, headers, body) of the next request, or None at end of connection."""
+        line = await _read_line(reader)
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise ServiceError("Malformed request line.")
+        headers = {"http-version": version}
+        while True:
+            line = await _read_line(reader)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) > MAX_HEADERS:
+                raise ServiceError("Too many headers.")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise ServiceError("Invalid Content-Length.")
+        if length > MAX_BODY:
+            raise ServiceError("Request body too large.", 413)
+        body = await reader.readexactly(length) if length > 0 else b""
+        return method, target, headers, body
+
+    async def _handle(self, reader, writer):
+        """Serves one connection, keeping it open between requests (HTTP/1.1 keep-alive)."""
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except ServiceError as e:
+                    writer.write(_response(e.status, {"error": str(e)}, keep_alive=False))
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, payload = self.dispatch(method, target, body)
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and headers["http-version"] != "HTTP/1.0")
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            _log(f"Connection failed: {e!r}")
+            with contextlib.suppress(ConnectionError):
+                writer.write(_response(500, {"error": "Internal server error."}, keep_alive=False))
+        finally:
+            writer.close()
+
+    async def serve(self, host=HOST, port=PORT, ready=None):
+        """Serves until cancelled (e.g. Ctrl+C), then saves everything.
+
+        ready(port) is called once the server is listening (port=0 picks a free one).
+        """
+        server = await asyncio.start_server(self._handle, host, port)
+        flusher = asyncio.create_task(self._flush_loop())
+        try:
+            async with server:
+                if ready is not None:
+                    ready(server.sockets[0].getsockname()[1])
+                await server.serve_forever()
+        finally:
+            flusher.cancel()
+            if self._writing is not None:
+                # A flush interrupted by the shutdown finishes before the final one starts
+                await asyncio.wait([self._writing])
+            self.close()
+
+def _log(message):
+    print(f"⚠️ {message}", file=sys.stderr, flush=True)
+
+async def _read_line(reader):
+    """reader.readline(), with an over-long line (ValueError from the stream limit) as a 400."""
+    try:
+        return await reader.readline()
+    except ValueError:
+        raise ServiceError("Request line or header too long.")
+
+def _response(status, payload, keep_alive=True):
+    body = json.dumps(payload).encode("utf-8")
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+# ====================================================================
+# Command line
+# ====================================================================
+
+USAGE = "Usage: python local_service.py [--port N] [--data-dir DIR]"
+
+def use_data_dir(directory):
+    """Points every system's data files (and the tracker's ledgers) into directory."""
+    os.makedirs(directory, exist_ok=True)
+    inventory.DATA_FILE = os.path.join(directory, os.path.basename(inventory.DATA_FILE))
+    hospital.DATA_FILE = os.path.join(directory, os.path.basename(hospital.DATA_FILE))
+    tracker.DATA_FILE = os.path.join(directory, os.path.basename(tracker.DATA_FILE))
+    tracker.LEDGER_DIR = os.path.join(directory, os.path.basename(tracker.LEDGER_DIR))
+
+def main(argv):
+    """python local_service.py [--port N] [--data-dir DIR] - serve the systems over local HTTP."""
+    args = list(argv[1:])
+    options = {"--port": str(PORT), "--data-dir": None}
+    while args:
+        if args[0] not in options or len(args) < 2:
+            print(USAGE)
+            return 1
+        options[args[0]] = args[1]
+        del args[:2]
+    try:
+        port = int(options["--port"])
+    except ValueError:
+        print(USAGE)
+        return 1
+    if options["--data-dir"]:
+        use_data_dir(options["--data-dir"])
+
+    service = Service()
+
+    def ready(port):
+        print(f"🌐 Serving on http://{HOST}:{port} (Ctrl+C to stop)", flush=True)
+
+    try:
+        asyncio.run(service.serve(HOST, port, ready))
+    except KeyboardInterrupt:
+        pass
+    print(f"💾 Saved. Served {service.stats['requests']:,} requests.", flush=True)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,148 @@
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# --- Configuration ---
+# Monthly progressive tax table: (lower bound of the bracket, rate inside it)
+DEFAULT_BRACKETS = [
+    (0, 0.0),
+    (1_000, 0.10),
+    (4_000, 0.20),
+    (8_000, 0.30),
+]
+SHARD_FIELDS = ["id", "name", "salary"]
+
+# ====================================================================
+# Vectorized payroll over task_models.Employee
+# ====================================================================
+# Employees are held as typed columns (ids, names, float64 salaries) and
+# raises, taxes and net pay are computed over whole arrays. Every formula
+# performs the same floating-point operations in the same order as the
+# scalar Employee methods, so results are bit-for-bit identical to them.
+
+def bracket_tax(salaries, brackets):
+    """Vectorized Employee.bracket_tax over an array of salaries."""
+    salaries = np.asarray(salaries, dtype=np.float64)
+    tax = np.zeros_like(salaries)
+    for i, (lower, rate) in enumerate(brackets):
+        upper = brackets[i + 1][0] if i + 1 < len(brackets) else np.inf
+        # Salaries at or below the bracket contribute exactly 0.0
+        tax += np.maximum(np.minimum(salaries, upper) - lower, 0.0) * rate
+    return tax
+
+class PayrollBatch:
+    """A batch of employees stored column-wise for bulk payroll runs."""
+
+    def __init__(self, ids, names, salaries):
+        self.ids = np.asarray(ids, dtype=object)
+        self.names = np.asarray(names, dtype=object)
+        self.salaries = np.array(salaries, dtype=np.float64)
+        if not len(self.ids) == len(self.names) == len(self.salaries):
+            raise ValueError("ids, names and salaries must have the same length.")
+
+    @classmethod
+    def from_employees(cls, employees):
+        employees = list(employees)
+        return cls([e.id for e in employees], [e.name for e in employees],
+                   [e.salary for e in employees])
+
+    @classmethod
+    def from_records(cls, records):
+        """Builds a batch from dicts with id, name and salary keys."""
+        records = list(records)
+        return cls([r["id"] for r in records], [r["name"] for r in records],
+                   [float(r["salary"]) for r in records])
+
+    def __len__(self):
+        return len(self.salaries)
+
+    # --- Payroll Operations ---
+
+    def give_raise(self, percentage):
+        """Raises every salary by a percentage (a scalar or one value per employee)."""
+        percentage = np.asarray(percentage, dtype=np.float64)
+        self.salaries += self.salaries * (percentage / 100)
+
+    def tax(self, tax_rate=0.15, brackets=None):
+        if brackets is not None:
+            return bracket_tax(self.salaries, brackets)
+        return self.salaries * tax_rate
+
+    def net_salary(self, tax_rate=0.15, brackets=None):
+        return self.salaries - self.tax(tax_rate, brackets)
+
+    def totals(self, tax_rate=0.15, brackets=None):
+        """Gross, tax and net totals for the batch."""
+        tax = self.tax(tax_rate, brackets)
+        return {
+            "employees": len(self),
+            "gross": float(self.salaries.sum()),
+            "tax": float(tax.sum()),
+            "net": float((self.salaries - tax).sum()),
+        }
+
+    def to_records(self, tax_rate=0.15, brackets=None):
+        """Yields store_details-style dicts (name, id, salary, net_salary)."""
+        net = self.net_salary(tax_rate, brackets)
+        for emp_id, name, salary, net_salary in zip(self.ids, self.names, self.salaries, net):
+            yield {"name": name, "id": emp_id, "salary": float(salary), "net_salary": float(net_salary)}
+
+# --- Parity with the scalar methods ---
+
+def parity_mismatches(employees, percentage=0, tax_rate=0.15, brackets=None):
+    """Returns the ids whose vectorized net salary differs from Employee's.
+
+    The scalar side calls give_raise (which prints) and calculate_net_salary
+    on the given Employee objects, so pass copies if they must stay unchanged.
+    """
+    employees = list(employees)
+    batch = PayrollBatch.from_employees(employees)
+    if percentage:
+        batch.give_raise(percentage)
+        for e in employees:
+            e.give_raise(percentage)
+    vector_net = batch.net_salary(tax_rate, brackets)
+    return [
+        e.id for e, net, salary in zip(employees, vector_net, batch.salaries)
+        if e.salary != salary or e.calculate_net_salary(tax_rate, brackets) != net
+    ]
+
+# --- Sharded Runs ---
+
+def write_shard(path, records):
+    """Writes employee records to a CSV shard (id, name, salary)."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=SHARD_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(records)
+
+def read_shard(path):
+    """Loads a CSV shard into a PayrollBatch."""
+    with open(path, 'r', newline='') as f:
+        return PayrollBatch.from_records(csv.DictReader(f))
+
+def run_shard(path, percentage=0, tax_rate=0.15, brackets=None, output_dir=None):
+    """Runs payroll for one shard; optionally writes per-employee results next to it."""
+    batch = read_shard(path)
+    if percentage:
+        batch.give_raise(percentage)
+    if output_dir:
+        out_path = os.path.join(output_dir, os.path.basename(path))
+        with open(out_path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=["id", "name", "salary", "net_salary"])
+            writer.writeheader()
+            writer.writerows(batch.to_records(tax_rate, brackets))
+    return batch.totals(tax_rate, brackets)
+
+def run_sharded(paths, percentage=0, tax_rate=0.15, brackets=None, output_dir=None, processes=None):
+    """Runs payroll over many shard files in a process pool and merges the totals."""
+    totals = {"employees": 0, "gross": 0.0, "tax": 0.0, "net": 0.0}
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(run_shard, p, percentage, tax_rate, brackets, output_dir)
+                   for p in paths]
+        for future in futures:
+            for key, value in future.result().items():
+                totals[key] += value
+    return totals
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import time
+import zlib
+
+# --- Configuration ---
+# A segmented store keeps one app's state in a directory:
+#   manifest.json       - scalar fields plus, per list field, its segments in order
+#   manifest.json.bak   - the previous manifest (fallback if the current one is damaged)
+#   <list>-<n>-<crc>.seg - up to SEGMENT_SIZE list items, one "crc32 json" line each
+# Segment files are never modified in place: a changed segment is written to a
+# new file (its name carries its checksum) and the manifest is swapped in with
+# os.replace, so a crash leaves either the old state or the new one.
+SEGMENT_SIZE = 1000
+MANIFEST_FILE = "manifest.json"
+BACKUP_SUFFIX = ".bak"
+SEGMENT_EXT = ".seg"
+
+# --- Checksums and Encoding ---
+
+def checksum(data):
+    """CRC32 of bytes, as an unsigned int."""
+    return zlib.crc32(data) & 0xffffffff
+
+def encode_segment(items):
+    """One line per item: 8 hex digits of CRC32, a space, the item as compact JSON."""
+    lines = []
+    for item in items:
+        text = json.dumps(item, separators=(',', ':'))
+        lines.append(f"{checksum(text.encode('utf-8')):08x} {text}\n")
+    return "".join(lines).encode('utf-8')
+
+def decode_segment(data):
+    """Items of a segment whose file checksum already matched."""
+    # The lines minus their checksums, joined, are the segment as one JSON array
+    return json.loads("[" + ",".join(line[9:] for line in data.decode('utf-8').splitlines()) + "]")
+
+def fingerprint(items):
+    """Digest of a segment's items, cheap enough to compute on every save."""
+    text = json.dumps(items, separators=(',', ':'))
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+def salvage_segment(data):
+    """Items of a damaged segment up to the first bad line; returns (items, lines dropped)."""
+    items = []
+    lines = data.split(b"\n")
+    complete = lines[:-1]  # Whatever follows the last newline is a torn write
+    for line in complete:
+        crc, _, text = line.partition(b" ")
+        try:
+            if len(crc) != 8 or int(crc, 16) != checksum(text):
+                break
+            items.append(json.loads(text))
+        except ValueError:
+            break
+    dropped = len(complete) - len(items) + (1 if lines[-1] else 0)
+    return items, dropped
+
+# --- File Helpers ---
+
+def _write_atomic(path, data, fsync=False):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        if fsync:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def backup_corrupt_file(path):
+    """Renames a damaged file out of the way (never deletes it); returns the new name."""
+    backup = f"{path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}"
+    suffix = 1
+    while os.path.exists(backup):
+        backup = f"{path}.corrupt-{time.strftime('%Y%m%d-%H%M%S')}-{suffix}"
+        suffix += 1
+    os.replace(path, backup)
+    return backup
+
+def segment_dir_for(data_file):
+    """'finance_data.json' -> 'finance_data.segments'."""
+    return os.path.splitext(data_file)[0] + ".segments"
+
+# --- Segmented Store ---
+
+class SegmentedStore:
+    """A JSON-style dict whose large list fields are stored in checksummed segments.
+
+    Saving rewrites only segments whose content changed (detected by a
+    fingerprint kept in the manifest), so appending to a long list touches
+    the last segment and the manifest. Loading checks each
+    segment's CRC32 against the manifest; a segment that fails is salvaged
+    line by line up to its damaged tail, the original is kept as a
+    .corrupt-<timestamp> backup, and every other segment loads untouched.
+    Recovery therefore costs one segment's worth of work, whatever the size
+    of the data.
+    """
+
+    def __init__(self, directory, lists, segment_size=SEGMENT_SIZE, fsync=False):
+        self.directory = directory
+        self.lists = tuple(lists)
+        self.segment_size = segment_size
+        self.fsync = fsync  # fsync segments and manifest (power-loss safe, slower)
+        self.last_recovery = []  # What the last load() had to repair
+        self._manifest_path = os.path.join(directory, MANIFEST_FILE)
+
+    def exists(self):
+        return (os.path.exists(self._manifest_path)
+                or os.path.exists(self._manifest_path + BACKUP_SUFFIX))
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read_manifest(self):
+        """The current manifest, else the previous one, else None."""
+        for path in (self._manifest_path, self._manifest_path + BACKUP_SUFFIX):
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+            except ValueError:
+                backup = backup_corrupt_file(path)
+                self.last_recovery.append(f"manifest {os.path.basename(path)} was damaged (kept as {os.path.basename(backup)})")
+                continue
+            if path != self._manifest_path:
+                self.last_recovery.append("fell back to the previous manifest")
+            return manifest
+        return None
+
+    def _write_manifest(self, manifest):
+        data = json.dumps(manifest, indent=1).encode('utf-8')
+        tmp_path = self._manifest_path + ".tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        # Keep the outgoing manifest as the fallback, then swap the new one in
+        if os.path.exists(self._manifest_path):
+            os.replace(self._manifest_path, self._manifest_path + BACKUP_SUFFIX)
+        os.replace(tmp_path, self._manifest_path)
+
+    def _write_segment(self, name, index, blob):
+        crc = checksum(blob)
+        filename = f"{name}-{index:06d}-{crc:08x}{SEGMENT_EXT}"
+        if not os.path.exists(self._path(filename)):
+            _write_atomic(self._path(filename), blob, self.fsync)
+        return filename, crc
+
+    # --- Load ---
+
+    def load(self):
+        """The stored dict, repairing damaged segments; None if nothing is stored."""
+        self.last_recovery = []
+        manifest = self._read_manifest()
+        if manifest is None:
+            return None
+
+        data = dict(manifest["header"])
+        repaired = False
+        for name in self.lists:
+            items = []
+            entries = manifest["lists"].get(name, [])
+            for index, entry in enumerate(entries):
+                path = self._path(entry["file"])
+                blob = None
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        blob = f.read()
+                if blob is not None and checksum(blob) == entry["crc"]:
+                    items.extend(decode_segment(blob))
+                    continue
+
+                # Damaged or missing: keep the intact prefix, back up the original
+                salvaged, dropped = salvage_segment(blob or b"")
+                if blob is None:
+                    dropped = entry["count"] - len(salvaged)
+                    self.last_recovery.append(f"{entry['file']} is missing ({dropped} item(s) lost)")
+                else:
+                    backup = backup_corrupt_file(path)
+                    self.last_recovery.append(
+                        f"{entry['file']} failed its checksum: kept {len(salvaged)} item(s), "
+                        f"dropped {dropped} line(s) (original kept as {os.path.basename(backup)})"
+                    )
+                filename, crc = self._write_segment(name, index, encode_segment(salvaged))
+                entries[index] = {"file": filename, "count": len(salvaged), "crc": crc,
+                                  "digest": fingerprint(salvaged)}
+                items.extend(salvaged)
+                repaired = True
+            data[name] = items
+
+        if repaired or self.last_recovery:
+            self._write_manifest(manifest)
+        return data
+
+    def read(self):
+        """The stored dict without repairing anything (for read-only tools).
+
+        Returns None if nothing is stored; raises ValueError for a damaged
+        manifest or segment and OSError for a missing one.
+        """
+        if not os.path.exists(self._manifest_path):
+            return None
+        with open(self._manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        data = dict(manifest["header"])
+        for name in self.lists:
+            items = []
+            for entry in manifest["lists"].get(name, []):
+                with open(self._path(entry["file"]), 'rb') as f:
+                    blob = f.read()
+                if checksum(blob) != entry["crc"]:
+                    raise ValueError(f"{entry['file']} failed its checksum")
+                items.extend(decode_segment(blob))
+            data[name] = items
+        return data
+
+    # --- Save ---
+
+    def save(self, data):
+        """Writes the changed segments, then swaps in a new manifest."""
+        os.makedirs(self.directory, exist_ok=True)
+        previous = self._read_manifest() if self.exists() else None
+        old_lists = previous["lists"] if previous else {}
+
+        lists = {}
+        for name in self.lists:
+            items = data.get(name, [])
+            old = old_lists.get(name, [])
+            entries = []
+            for index, start in enumerate(range(0, len(items), self.segment_size)):
+                chunk = items[start:start + self.segment_size]
+                digest = fingerprint(chunk)
+                if index < len(old) and old[index].get("digest") == digest \
+                        and os.path.exists(self._path(old[index]["file"])):
+                    entries.append(old[index])  # Unchanged: no write
+                    continue
+                filename, crc = self._write_segment(name, index, encode_segment(chunk))
+                entries.append({"file": filename, "count": len(chunk), "crc": crc, "digest": digest})
+            lists[name] = entries
+
+        header = {key: value for key, value in data.items() if key not in self.lists}
+        manifest = {"version": 1, "segment_size": self.segment_size, "header": header, "lists": lists}
+        self._write_manifest(manifest)
+        self._remove_unreferenced(manifest, previous)
+
+    def _remove_unreferenced(self, manifest, previous):
+        """Deletes segment files neither the current nor the fallback manifest uses."""
+        keep = set()
+        for m in (manifest, previous):
+            if m:
+                for entries in m["lists"].values():
+                    keep.update(entry["file"] for entry in entries)
+        for filename in os.listdir(self.directory):
+            if filename.endswith(SEGMENT_EXT) and filename not in keep:
+                os.remove(self._path(filename))
+            elif filename.endswith(SEGMENT_EXT + ".tmp"):
+                os.remove(self._path(filename))  # Leftover of a crashed segment write
+
+# --- App Helpers ---
+# tracker, inventory and hospital keep DATA_FILE as their configured name;
+# the segmented store lives next to it (see segment_dir_for). A legacy JSON
+# file is imported on first load; if it is corrupt it is backed up, never
+# overwritten.
+
+def read_legacy_json(data_file):
+    """The dict in an old single-file JSON store, or None (backing up a corrupt file)."""
+    if not os.path.exists(data_file) or os.stat(data_file).st_size == 0:
+        return None
+    with open(data_file, 'r') as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            pass
+    backup = backup_corrupt_file(data_file)
+    print(f"⚠️ Warning: {data_file} is corrupted. It was moved to {backup}; starting with empty data.")
+    return None
+
+def load_state(data_file, lists, empty):
+    """Loads an app's state from its segmented store, migrating data_file if needed.
+
+    `empty` is a function returning the app's initial structure.
+    """
+    store = SegmentedStore(segment_dir_for(data_file), lists)
+    data = store.load()
+    for problem in store.last_recovery:
+        print(f"⚠️ Warning: recovered {store.directory}: {problem}")
+    if data is not None:
+        return data
+
+    data = read_legacy_json(data_file)
+    if data is None:
+        return empty()
+    store.save(data)
+    return data
+
+def state_stamp(data_file):
+    """Changes whenever the store at data_file is saved (the manifest is replaced); None if absent."""
+    try:
+        stat = os.stat(os.path.join(segment_dir_for(data_file), MANIFEST_FILE))
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+def save_state(data_file, lists, data):
+    """Saves an app's state to its segmented store."""
+    SegmentedStore(segment_dir_for(data_file), lists).save(data)
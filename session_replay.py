@@ -0,0 +1,425 @@
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import atm
+import hospital
+import inventory
+import library
+import tracker
+from atm_ledger import LedgerError, to_cents
+from atm_server import ATMEngine
+
+# ====================================================================
+# Headless session replay for the CLI apps
+# ====================================================================
+# A script is a JSONL file with one operation per line:
+#   {"app": "inventory", "op": "purchase", "args": {"product_id": 1001, "quantity": 2}}
+# Each app has a driver that maps op names onto the same core calls its
+# menu makes (InventorySystem.purchase, library.check_out, ...), so a script
+# exercises the real logic without input(). Data files go to a work
+# directory, never the repository. Scripts run headless (one user) or with
+# many simulated users on threads; drivers that are not thread-safe are
+# called under a per-app lock, so their latency includes the queueing a
+# shared single-process deployment would see. Business failures (unknown
+# product, insufficient funds, ...) are counted as errors, not raised.
+
+BUSINESS_ERRORS = (ValueError, KeyError, LedgerError)
+
+# --- Drivers ---
+
+class AppDriver:
+    """Maps script ops onto one app's core logic. Subclasses define op_<name> methods.
+
+    Apps keep their data file in a module global; drivers point it into the
+    workdir with _patch(), and close() puts the original back.
+    """
+
+    thread_safe = False
+
+    def __init__(self, workdir):
+        self.workdir = workdir
+        self._originals = []
+
+    def _patch(self, module, attr, value):
+        self._originals.append((module, attr, getattr(module, attr)))
+        setattr(module, attr, value)
+
+    def call(self, op, args):
+        method = getattr(self, "op_" + op, None)
+        if method is None:
+            raise ValueError(f"Unknown {self.name} operation: {op!r}")
+        return method(**args)
+
+    def close(self):
+        while self._originals:
+            module, attr, value = self._originals.pop()
+            setattr(module, attr, value)
+
+class LibraryDriver(AppDriver):
+    name = "library"
+
+    def __init__(self, workdir):
+        super().__init__(workdir)
+        self._patch(library, "library_inventory", {})
+
+    def op_add(self, title, copies=1):
+        library.library_inventory[title] = library.library_inventory.get(title, 0) + copies
+        return library.library_inventory[title]
+
+    def op_borrow(self, title):
+        return library.check_out(title)
+
+    def op_return(self, title, add_missing=False):
+        return library.check_in(title, add_missing)
+
+    def op_view(self):
+        return dict(library.library_inventory)
+
+class ATMDriver(AppDriver):
+    """ATMEngine over a fresh ledger seeded with atm.ACCOUNTS (per-account locking)."""
+
+    name = "atm"
+    thread_safe = True
+
+    def __init__(self, workdir):
+        super().__init__(workdir)
+        self._patch(atm, "ledger", None)  # open_ledger rebinds atm.ledger; close() puts it back
+        self.ledger = atm.open_ledger(os.path.join(workdir, "atm_ledger"))
+        self.engine = ATMEngine(self.ledger)
+
+    def op_open_account(self, account, amount=0):
+        if account not in self.ledger:
+            self.ledger.open_account(account, to_cents(amount))
+
+    def op_balance(self, account):
+        return self.engine.balance(account)
+
+    def op_deposit(self, account, amount):
+        return self.engine.deposit(account, to_cents(amount))
+
+    def op_withdraw(self, account, amount):
+        return self.engine.withdraw(account, to_cents(amount))
+
+    def op_transfer(self, account, to, amount):
+        return self.engine.transfer(account, to, to_cents(amount))
+
+    def close(self):
+        try:
+            self.ledger.close()
+        finally:
+            super().close()
+
+class TrackerDriver(AppDriver):
+    name = "tracker"
+
+    def __init__(self, workdir):
+        super().__init__(workdir)
+        self._patch(tracker, "DATA_FILE", os.path.join(workdir, "finance_data.json"))
+
+    def op_add_transaction(self, type, amount, description):
+        if not tracker.add_transaction(type, amount, description):
+            raise ValueError("Transaction amount must be positive.")
+
+    def op_summary(self):
+        return tracker.get_summary()
+
+class InventoryDriver(AppDriver):
+    name = "inventory"
+
+    def __init__(self, workdir):
+        super().__init__(workdir)
+        self._patch(inventory, "DATA_FILE", os.path.join(workdir, "inventory_data.json"))
+        self.system = inventory.InventorySystem()
+
+    def op_add_product(self, name, price, quantity):
+        self.system.add_product(name, price, quantity)
+
+    def op_purchase(self, product_id, quantity):
+        return self.system.purchase(product_id, quantity)
+
+    def op_summary(self):
+        self.system.show_summary()
+
+    def close(self):
+        try:
+            self.system.close()
+        finally:
+            super().close()
+
+class HospitalDriver(AppDriver):
+    name = "hospital"
+
+    def __init__(self, workdir):
+        super().__init__(workdir)
+        self._patch(hospital, "DATA_FILE", os.path.join(workdir, "hospital_data.json"))
+        self.system = hospital.HospitalSystem()
+
+    def op_add_doctor(self, name, specialization, timings):
+        self.system.add_doctor(name, specialization, timings)
+
+    def op_book(self, doctor_id, patient, age, disease):
+        return self.system.book(doctor_id, hospital.Patient(patient, age, disease))
+
+    def op_show_appointments(self):
+        self.system.show_appointments()
+
+DRIVERS = {cls.name: cls for cls in (LibraryDriver, ATMDriver, TrackerDriver, InventoryDriver, HospitalDriver)}
+
+# --- Scripts ---
+
+def load_script(path):
+    """Reads a JSONL script into a list of {"app", "op", "args"} dicts."""
+    operations = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            record = json.loads(line)
+            if record.get("app") not in DRIVERS or "op" not in record:
+                raise ValueError(f"{path}:{number}: need a known 'app' and an 'op'.")
+            record.setdefault("args", {})
+            operations.append(record)
+    return operations
+
+def save_script(operations, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        for operation in operations:
+            f.write(json.dumps(operation) + "\n")
+
+def generate_script(app, n, seed=0):
+    """A synthetic n-operation script for one app (a realistic mix of its ops)."""
+    rng = random.Random(seed)
+    ops = []
+
+    def add(op, **args):
+        ops.append({"app": app, "op": op, "args": args})
+
+    if app == "library":
+        titles = [f"Book {i:04d}" for i in range(max(n // 20, 5))]
+        for title in titles:
+            add("add", title=title, copies=rng.randint(1, 5))
+        while len(ops) < n:
+            roll = rng.random()
+            if roll < 0.45:
+                add("borrow", title=rng.choice(titles))
+            elif roll < 0.9:
+                add("return", title=rng.choice(titles))
+            else:
+                add("view")
+    elif app == "atm":
+        accounts = list(atm.ACCOUNTS)
+        while len(ops) < n:
+            account = rng.choice(accounts)
+            amount = round(rng.uniform(1, 200), 2)
+            roll = rng.random()
+            if roll < 0.3:
+                add("deposit", account=account, amount=amount)
+            elif roll < 0.6:
+                add("withdraw", account=account, amount=amount)
+            elif roll < 0.75:
+                target = rng.choice([a for a in accounts if a != account])
+                add("transfer", account=account, to=target, amount=amount)
+            else:
+                add("balance", account=account)
+    elif app == "tracker":
+        while len(ops) < n:
+            if rng.random() < 0.8:
+                kind = "income" if rng.random() < 0.3 else "expense"
+                add("add_transaction", type=kind, amount=round(rng.uniform(1, 500), 2),
+                    description=rng.choice(["Salary", "Groceries", "Rent", "Fuel"]))
+            else:
+                add("summary")
+    elif app == "inventory":
+        products = max(n // 20, 3)
+        for i in range(products):
+            add("add_product", name=f"Product {i:04d}", price=round(rng.uniform(1, 500), 2),
+                quantity=rng.randint(10, 100))
+        while len(ops) < n:
+            roll = rng.random()
+            if roll < 0.75:
+                add("purchase", product_id=1001 + rng.randrange(products), quantity=rng.randint(1, 3))
+            elif roll < 0.9:
+                add("add_product", name=f"Product {rng.randrange(products):04d}", price=1.0,
+                    quantity=rng.randint(5, 20))
+            else:
+                add("summary")
+    elif app == "hospital":
+        doctors = max(n // 50, 2)
+        for i in range(doctors):
+            add("add_doctor", name=f"Doctor {i}", specialization="General", timings="Mon-Fri 9AM-5PM")
+        while len(ops) < n:
+            if rng.random() < 0.9:
+                add("book", doctor_id=101 + rng.randrange(doctors), patient=f"Patient {len(ops)}",
+                    age=rng.randint(1, 95), disease="checkup")
+            else:
+                add("show_appointments")
+    else:
+        raise ValueError(f"Unknown app: {app!r}")
+    return ops[:n] if len(ops) > n else ops
+
+# --- Replay ---
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q / 100 * len(sorted_values)))]
+
+def _latency_stats(samples):
+    samples = sorted(samples)
+    return {
+        "count": len(samples),
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "max_ms": samples[-1] * 1000 if samples else 0.0,
+    }
+
+class Replayer:
+    """Replays scripts against fresh app state in `workdir`."""
+
+    def __init__(self, workdir):
+        self.workdir = workdir
+        self.drivers = {}
+        self._locks = {}
+        self._setup_lock = threading.Lock()
+
+    def driver(self, app):
+        with self._setup_lock:
+            if app not in self.drivers:
+                self.drivers[app] = DRIVERS[app](self.workdir)
+                self._locks[app] = threading.Lock()
+            return self.drivers[app]
+
+    def execute(self, operation):
+        """Runs one operation; returns (seconds, error type name or None)."""
+        driver = self.driver(operation["app"])
+        lock = None if driver.thread_safe else self._locks[operation["app"]]
+        start = time.perf_counter()
+        try:
+            if lock is None:
+                driver.call(operation["op"], operation["args"])
+            else:
+                with lock:
+                    driver.call(operation["op"], operation["args"])
+            error = None
+        except BUSINESS_ERRORS as e:
+            error = type(e).__name__
+        return time.perf_counter() - start, error
+
+    def _run_user(self, operations):
+        samples = []
+        for operation in operations:
+            seconds, error = self.execute(operation)
+            samples.append((operation["app"] + "." + operation["op"], seconds, error))
+        return samples
+
+    def run(self, scripts, users=1, repeat=1):
+        """Replays with `users` concurrent users; user i runs scripts[i % len(scripts)]."""
+        plans = [scripts[i % len(scripts)] * repeat for i in range(users)]
+        # The apps' prints go to devnull: buffering them would grow with the run and cost time
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            # Set up every driver before timing starts
+            for script in scripts:
+                for app in {op["app"] for op in script}:
+                    self.driver(app)
+            start = time.perf_counter()
+            if users == 1:
+                results = [self._run_user(plans[0])]
+            else:
+                with ThreadPoolExecutor(max_workers=users) as pool:
+                    results = list(pool.map(self._run_user, plans))
+            elapsed = time.perf_counter() - start
+        return build_report(results, elapsed, users)
+
+    def close(self):
+        for driver in self.drivers.values():
+            driver.close()
+
+def build_report(results, elapsed, users):
+    per_op = {}
+    errors = {}
+    everything = []
+    for samples in results:
+        for key, seconds, error in samples:
+            per_op.setdefault(key, []).append(seconds)
+            everything.append(seconds)
+            if error:
+                errors[f"{key}:{error}"] = errors.get(f"{key}:{error}", 0) + 1
+    return {
+        "users": users,
+        "ops": len(everything),
+        "elapsed_s": elapsed,
+        "ops_per_sec": len(everything) / elapsed if elapsed else 0.0,
+        "latency": _latency_stats(everything),
+        "per_op": {key: _latency_stats(samples) for key, samples in sorted(per_op.items())},
+        "errors": errors,
+    }
+
+def format_report(report):
+    lines = [
+        f"{report['ops']:,} ops by {report['users']} user(s) in {report['elapsed_s']:.2f}s "
+        f"= {report['ops_per_sec']:,.0f} ops/s",
+        f"{'operation':<28} {'count':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}",
+    ]
+    rows = list(report["per_op"].items()) + [("ALL", report["latency"])]
+    for key, stats in rows:
+        lines.append(f"{key:<28} {stats['count']:>8,} {stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} "
+                     f"{stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}")
+    for key, count in sorted(report["errors"].items()):
+        lines.append(f"  errors {key}: {count}")
+    return "\n".join(lines)
+
+def replay(paths, users=1, repeat=1, workdir=None):
+    """Loads and replays script files; returns the report dict."""
+    scripts = [load_script(path) for path in paths]
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = stack.enter_context(tempfile.TemporaryDirectory())
+        replayer = Replayer(workdir)
+        stack.callback(replayer.close)
+        return replayer.run(scripts, users, repeat)
+
+# --- Command line ---
+
+USAGE = """Usage:
+  python session_replay.py generate APP N OUT.jsonl [SEED]
+  python session_replay.py run SCRIPT.jsonl [SCRIPT ...] [--users N] [--repeat N] [--json OUT] [--workdir DIR]
+APP is one of: """ + ", ".join(DRIVERS)
+
+def main(argv):
+    """Command-line entry point (see USAGE)."""
+    if len(argv) >= 5 and argv[1] == "generate":
+        seed = int(argv[5]) if len(argv) > 5 else 0
+        save_script(generate_script(argv[2], int(argv[3]), seed), argv[4])
+        print(f"✅ Wrote {argv[3]} {argv[2]} operations to {argv[4]}.")
+        return 0
+
+    if len(argv) >= 3 and argv[1] == "run":
+        options = {"--users": "1", "--repeat": "1", "--json": None, "--workdir": None}
+        paths = []
+        args = iter(argv[2:])
+        for arg in args:
+            if arg in options:
+                options[arg] = next(args)
+            else:
+                paths.append(arg)
+        report = replay(paths, int(options["--users"]), int(options["--repeat"]), options["--workdir"])
+        print(format_report(report))
+        if options["--json"]:
+            with open(options["--json"], 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    print(USAGE)
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
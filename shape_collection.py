@@ -0,0 +1,113 @@
+import math
+
+import numpy as np
+
+from task_models import Circle, Rectangle
+
+# ====================================================================
+# Bulk areas and an area index over task_models.Shape objects
+# ====================================================================
+# Shapes are grouped by exact type. Types with a known formula keep their
+# dimensions in NumPy arrays and get their areas computed in one vectorized
+# step (using math.pi, the same formula as Circle.area); any other Shape
+# subclass falls back to calling area() on each object. A sorted array of
+# all areas answers "shapes with area in [a, b]" with two binary searches.
+
+# {shape class: (dimension attributes, vectorized area function)}
+KERNELS = {
+    Circle: (("radius",), lambda r: math.pi * r * r),
+    Rectangle: (("length", "width"), lambda length, width: length * width),
+}
+
+class _Group:
+    """Shapes of one type: their positions in the collection and dimensions."""
+
+    def __init__(self, attrs, kernel):
+        self.attrs = attrs
+        self.kernel = kernel
+        self.indices = []
+        self.columns = [[] for _ in attrs]
+        self._areas = None
+
+    def add(self, index, shape):
+        self.indices.append(index)
+        for column, attr in zip(self.columns, self.attrs):
+            column.append(getattr(shape, attr))
+        self._areas = None
+
+    def areas(self, shapes):
+        if self._areas is None:
+            if self.kernel is None:
+                self._areas = np.array([shapes[i].area() for i in self.indices], dtype=np.float64)
+            else:
+                arrays = [np.asarray(c, dtype=np.float64) for c in self.columns]
+                self._areas = np.asarray(self.kernel(*arrays), dtype=np.float64)
+        return self._areas
+
+class ShapeCollection:
+    """Many shapes grouped by type for bulk area totals and area range queries."""
+
+    def __init__(self, shapes=()):
+        self.shapes = []
+        self._groups = {}
+        self._index = None  # (sorted areas, shape indices in the same order)
+        self.extend(shapes)
+
+    def __len__(self):
+        return len(self.shapes)
+
+    def add(self, shape):
+        shape_type = type(shape)
+        group = self._groups.get(shape_type)
+        if group is None:
+            attrs, kernel = KERNELS.get(shape_type, ((), None))
+            group = self._groups[shape_type] = _Group(attrs, kernel)
+        group.add(len(self.shapes), shape)
+        self.shapes.append(shape)
+        self._index = None
+
+    def extend(self, shapes):
+        for shape in shapes:
+            self.add(shape)
+
+    # --- Bulk Areas ---
+
+    def areas(self, shape_type=None):
+        """Areas of every shape (collection order), or of one type (insertion order)."""
+        if shape_type is not None:
+            group = self._groups.get(shape_type)
+            return group.areas(self.shapes) if group else np.empty(0)
+        result = np.empty(len(self.shapes))
+        for group in self._groups.values():
+            result[group.indices] = group.areas(self.shapes)
+        return result
+
+    def total_area(self):
+        return float(sum(g.areas(self.shapes).sum() for g in self._groups.values()))
+
+    def totals_by_type(self):
+        """{type name: (count, total area)}."""
+        return {
+            shape_type.__name__: (len(group.indices), float(group.areas(self.shapes).sum()))
+            for shape_type, group in self._groups.items()
+        }
+
+    # --- Area Index ---
+
+    def _sorted_index(self):
+        if self._index is None:
+            areas = self.areas()
+            order = np.argsort(areas, kind='stable')
+            self._index = (areas[order], order)
+        return self._index
+
+    def in_area_range(self, low, high):
+        """Shapes whose area lies in [low, high], smallest first."""
+        areas, order = self._sorted_index()
+        start = np.searchsorted(areas, low, side='left')
+        stop = np.searchsorted(areas, high, side='right')
+        return [self.shapes[i] for i in order[start:stop]]
+
+    def count_in_area_range(self, low, high):
+        areas, _ = self._sorted_index()
+        return int(np.searchsorted(areas, high, side='right') - np.searchsorted(areas, low, side='left'))
@@ -0,0 +1,31 @@
+"""Model classes from the task.py exercises, importable without side effects.
+
+Importing this package only defines classes: no demo output, no files read
+or written. The demos live in task.py and run with `python task.py`.
+
+Each class is loaded from its submodule on first access, so a worker that
+only needs Employee never imports BankAccount's transaction-log machinery.
+"""
+import importlib
+
+_SUBMODULES = {
+    "BankAccount": "bank",
+    "Employee": "employee",
+    "Person": "people", "Professor": "people", "Researcher": "people", "Teacher": "people",
+    "Circle": "shapes", "Rectangle": "shapes", "Shape": "shapes",
+    "Student": "student",
+    "Vector": "vector",
+    "Car": "vehicles", "Sedan": "vehicles", "Vehicle": "vehicles",
+}
+
+__all__ = sorted(_SUBMODULES)
+
+def __getattr__(name):
+    if name not in _SUBMODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_SUBMODULES[name]}", __name__), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
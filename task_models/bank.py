@@ -0,0 +1,102 @@
+import json
+import os
+
+import transaction_log # Buffered JSONL transaction logging
+import transaction_history # Streaming history reader (balance rebuild, statements)
+
+# ====================================================================
+# Task 4 & 11: Encapsulation and File Handling
+# ====================================================================
+
+class BankAccount:
+    def __init__(self, owner, initial_balance=0, logger=None):
+        # Task 4: Private attribute (Encapsulation)
+        self.__balance = initial_balance
+        self.owner = owner
+        self.filename = f"{owner}_transactions.jsonl"
+        self.legacy_filename = f"{owner}_transactions.txt"  # Plain-text history before JSONL
+        # Shared buffered logger: batches writes and pools open files
+        self.logger = logger or transaction_log.DEFAULT_LOGGER
+        self._since_checkpoint = 0
+        self._initialize_file()
+
+    def _initialize_file(self):
+        """Helper to ensure the file exists and record initial balance.
+
+        If the file already exists, the balance is rebuilt from its history
+        (the file is the source of truth, not initial_balance). A legacy
+        plain-text history is imported first if there is no JSONL file yet.
+        """
+        if not os.path.exists(self.filename) and os.path.exists(self.legacy_filename):
+            self._import_legacy_file()
+        if not os.path.exists(self.filename):
+            self._save_transaction("initial", self.__balance)
+            self.logger.flush(self.filename)
+        else:
+            self.logger.flush(self.filename)
+            history = transaction_history.TransactionHistory(self.filename)
+            self.__balance, self._since_checkpoint = history.rebuild()
+
+    def _import_legacy_file(self):
+        """Copies the plain-text history into the JSONL file, adding running balances."""
+        balance = 0
+        tmp_path = self.filename + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for record in transaction_history.TransactionHistory(self.legacy_filename).records():
+                balance = transaction_history.apply_record(balance, record)
+                record["balance"] = balance / 100
+                f.write(json.dumps(record, separators=(',', ':')) + "\n")
+        # The JSONL file only appears once complete, so a crash just imports again
+        os.replace(tmp_path, self.filename)
+
+    def deposit(self, amount):
+        if amount > 0:
+            self.__balance += amount
+            self._save_transaction("deposit", amount)
+            print(f"Deposit successful. New balance: ${self.__balance:.2f}")
+        else:
+            print("Deposit amount must be positive.")
+
+    def withdraw(self, amount):
+        if 0 < amount <= self.__balance:
+            self.__balance -= amount
+            self._save_transaction("withdrawal", amount)
+            print(f"Withdrawal successful. New balance: ${self.__balance:.2f}")
+        else:
+            print("Invalid withdrawal amount or insufficient funds.")
+
+    def check_balance(self):
+        # Access method to check the private balance
+        print(f"Current balance for {self.owner}: ${self.__balance:.2f}")
+    
+    # Task 11: File Handling - Saving transactions (one JSON record per line)
+    def _save_transaction(self, kind, amount):
+        record = transaction_log.make_record(kind, amount, self.__balance)
+        self.logger.log(self.filename, record)
+        # Periodic checkpoints let the balance be rebuilt without a full replay
+        self._since_checkpoint += 1
+        if self._since_checkpoint >= transaction_history.CHECKPOINT_EVERY:
+            self.logger.log(self.filename, transaction_log.make_record("checkpoint", 0, self.__balance))
+            self._since_checkpoint = 0
+
+    def statement(self, start=None, end=None):
+        """Returns a period statement (ISO timestamps) built from the history file."""
+        self.logger.flush(self.filename)
+        return transaction_history.TransactionHistory(self.filename).statement(start, end)
+            
+    # Task 11: File Handling - Reading history
+    def read_history(self):
+        print(f"\n--- Transaction History for {self.owner} ---")
+        # Make sure buffered records are on disk before reading
+        self.logger.flush(self.filename)
+        try:
+            for record in transaction_history.TransactionHistory(self.filename).records():
+                if record["type"] == "checkpoint":
+                    continue
+                sign = "-" if record["type"] == "withdrawal" else "+"
+                when = record["ts"][:19].replace('T', ' ') if record["ts"] else "-"
+                balance = f" (Balance: {record['balance']:.2f})" if "balance" in record else ""
+                print(f"{when} {record['type'].title()}: {sign}{record['amount']:.2f}{balance}")
+        except FileNotFoundError:
+            print("No transaction history found.")
+        print("------------------------------------------")
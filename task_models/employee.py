@@ -0,0 +1,86 @@
+import os
+import json # Needed for Mini-Project file storage
+
+# ====================================================================
+# Task 13: Mini Project - Employee Payroll System
+# ====================================================================
+
+class Employee:
+    def __init__(self, name, emp_id, salary):
+        self.name = name
+        self.id = emp_id
+        self.salary = salary # Monthly salary
+        self.file_path = "employee_data.json"
+
+    def calculate_net_salary(self, tax_rate=0.15, brackets=None):
+        """Calculate Salary after tax deductions.
+
+        brackets: optional progressive tax table [(lower_bound, rate), ...]
+        sorted by lower bound; when given it replaces the flat tax_rate.
+        """
+        if brackets is not None:
+            tax = Employee.bracket_tax(self.salary, brackets)
+        else:
+            tax = self.salary * tax_rate
+        net_salary = self.salary - tax
+        return net_salary
+
+    @staticmethod
+    def bracket_tax(salary, brackets):
+        """Progressive tax: each bracket's rate applies to the part of salary inside it."""
+        tax = 0.0
+        for i, (lower, rate) in enumerate(brackets):
+            upper = brackets[i + 1][0] if i + 1 < len(brackets) else float('inf')
+            if salary > lower:
+                tax += (min(salary, upper) - lower) * rate
+        return tax
+
+    def give_raise(self, percentage):
+        """Give a raise based on a percentage."""
+        raise_amount = self.salary * (percentage / 100)
+        self.salary += raise_amount
+        print(f"✅ {self.name} received a {percentage}% raise. New salary: ${self.salary:,.2f}")
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "id": self.id,
+            "salary": self.salary,
+            "net_salary": self.calculate_net_salary()
+        }
+
+    def store_details(self, repository=None):
+        """Store employee details in a file (JSON format).
+
+        If an employee_store.EmployeeRepository is given, only this employee's
+        row is upserted instead of rewriting the whole JSON file.
+        """
+        data = self.to_dict()
+
+        if repository is not None:
+            repository.upsert(data)
+            print(f"✅ Employee details for {self.name} stored/updated in {repository.path}.")
+            return
+        
+        # Read existing data if file exists
+        all_employees = {}
+        if os.path.exists(self.file_path):
+            with open(self.file_path, 'r') as f:
+                try:
+                    all_employees = json.load(f)
+                except json.JSONDecodeError:
+                    pass # File is empty or corrupt
+        
+        # Add/update the current employee's data
+        all_employees[self.id] = data
+        
+        # Write back to file
+        with open(self.file_path, 'w') as f:
+            json.dump(all_employees, f, indent=4)
+            
+        print(f"✅ Employee details for {self.name} stored/updated in {self.file_path}.")
+
+    @staticmethod
+    def store_many(employees, repository):
+        """Store many employees in one repository transaction."""
+        repository.store_many(e.to_dict() for e in employees)
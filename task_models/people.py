@@ -0,0 +1,46 @@
+# ====================================================================
+# Task 7: Multiple Inheritance
+# ====================================================================
+
+class Teacher:
+    def teach(self):
+        return "I am teaching a class."
+    def work(self):
+        return self.teach()
+
+class Researcher:
+    def research(self):
+        return "I am conducting research."
+    def work(self):
+        return self.research() # Overridden from Teacher
+
+# Professor inherits from both
+class Professor(Teacher, Researcher):
+    def work(self):
+        # Method Resolution Order (MRO) will choose Teacher's work() first
+        return f"As a Professor, I can say: {Teacher.work(self)} AND {Researcher.work(self)}"
+
+# ====================================================================
+# Task 10: Class Method & Static Method
+# ====================================================================
+
+class Person:
+    # Class attribute to track object count
+    number_of_people = 0 
+    
+    def __init__(self, name, age):
+        self.name = name
+        self.age = age
+        # Increment count using the class method
+        self.count_people() 
+        
+    # Task 10: Class Method (uses the class itself as the first argument, 'cls')
+    @classmethod
+    def count_people(cls):
+        cls.number_of_people += 1
+        return cls.number_of_people
+
+    # Task 10: Static Method (does not receive 'self' or 'cls', acts like a regular function)
+    @staticmethod
+    def is_adult(age):
+        return age >= 18
@@ -0,0 +1,31 @@
+import abc # Needed for Abstract Base Classes
+import math
+
+# ====================================================================
+# Task 8: Abstract Class & Method
+# ====================================================================
+
+# Abstract Class
+class Shape(abc.ABC):
+    @abc.abstractmethod
+    def area(self):
+        # Abstract method has no implementation
+        pass
+
+# Implementation Subclass 1
+class Circle(Shape):
+    def __init__(self, radius):
+        self.radius = radius
+    
+    # Must implement the abstract method area()
+    def area(self):
+        return math.pi * self.radius * self.radius
+
+# Implementation Subclass 2
+class Rectangle(Shape):
+    def __init__(self, length, width):
+        self.length = length
+        self.width = width
+        
+    def area(self):
+        return self.length * self.width
@@ -0,0 +1,42 @@
+# ====================================================================
+# Task 12: Mini Project - Student Management System
+# ====================================================================
+
+class Student:
+    def __init__(self, name, age, marks, gradebook=None):
+        self.name = name
+        self.age = age
+        self.marks = marks # Dictionary: {"subject": score}
+        # Optional gradebook.Gradebook kept in sync with this student's marks
+        self.gradebook = gradebook
+        if gradebook is not None:
+            gradebook.add_student(self)
+
+    # Add student details (done via constructor here, but method allows updates)
+    def add_marks(self, subject, score):
+        # Adding/Updating Dictionary Items
+        self.marks[subject] = score
+        if self.gradebook is not None:
+            self.gradebook.set_mark(self.name, subject, score)
+        print(f"Added/Updated {subject} marks for {self.name}.")
+
+    # Update student marks (similar to add_marks, focusing on modification)
+    def update_marks(self, subject, new_score):
+        if subject in self.marks:
+            self.marks[subject] = new_score
+            if self.gradebook is not None:
+                self.gradebook.set_mark(self.name, subject, new_score)
+            print(f"Updated {self.name}'s {subject} score to {new_score}.")
+        else:
+            print(f"{self.name} is not enrolled in {subject}. Use add_marks().")
+
+    # Display student details
+    def display_details(self):
+        print("\n--- Student Details ---")
+        print(f"Name: {self.name}")
+        print(f"Age: {self.age}")
+        print("Marks:")
+        # Iterating Through a Dictionary
+        for subj, score in self.marks.items():
+            print(f"  - {subj}: {score}")
+        print("-----------------------")
@@ -0,0 +1,21 @@
+# ====================================================================
+# Task 9: Operator Overloading
+# ====================================================================
+
+class Vector:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        
+    def __str__(self):
+        return f"Vector({self.x}, {self.y})"
+
+    # Overload the + operator using the __add__ dunder method
+    def __add__(self, other):
+        # Let batch types (vector_array.VectorArray) handle mixed additions
+        if not isinstance(other, Vector):
+            return NotImplemented
+        # Returns a new Vector object
+        new_x = self.x + other.x
+        new_y = self.y + other.y
+        return Vector(new_x, new_y)
@@ -0,0 +1,49 @@
+# ====================================================================
+# Task 1-3: Class, Object, Methods, Constructor
+# ====================================================================
+
+class Car:
+    # Class attribute to track the number of Car objects (for demonstration)
+    car_count = 0 
+    
+    # Task 3: Constructor (__init__ method)
+    def __init__(self, brand, model, year):
+        # Task 1: Attributes
+        self.brand = brand
+        self.model = model
+        self.year = year
+        Car.car_count += 1
+
+    # Task 2: Add Methods to a Class
+    def start_engine(self):
+        print(f"[{self.brand} {self.model}] Engine started! Vroom!")
+
+    def get_details(self):
+        # Task 1: Access object details
+        print(f"Car Details: {self.year} {self.brand} {self.model}")
+
+# ====================================================================
+# Task 5 & 6: Inheritance & Method Overriding (Polymorphism)
+# ====================================================================
+
+# Task 5: Parent Class
+class Vehicle:
+    def __init__(self, manufacturer):
+        self.manufacturer = manufacturer
+    
+    # Task 5: show_details() method
+    def show_details(self):
+        print(f"Vehicle: Manufacturer is {self.manufacturer}.")
+
+# Task 5: Child Class (Inherits from Vehicle)
+class Sedan(Vehicle):
+    def __init__(self, manufacturer, seats, color):
+        super().__init__(manufacturer)
+        self.seats = seats
+        self.color = color
+    
+    # Task 6: Method Overriding (Polymorphism)
+    def show_details(self):
+        # Calling the parent method is optional but good practice
+        super().show_details() 
+        print(f"  Type: Sedan | Seats: {self.seats} | Color: {self.color}")
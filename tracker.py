@@ -1,77 +1,174 @@
-import json
 import os
+import sys
+import threading
+from collections import namedtuple
 from datetime import datetime
+from urllib.parse import quote, unquote
 
-# Define the file path for data storage
+import instrumentation
+from instrumentation import timed
+from segment_store import load_state, save_state, state_stamp
+
+# Define the file path for data storage. Data lives in the segmented store
+# next to it (finance_data.segments/); an existing JSON file is imported once.
 DATA_FILE = "finance_data.json"
+SEGMENTED_LISTS = ("transactions",)
+
+# With one ledger per user, each user's data file lives in LEDGER_DIR (see
+# ledger_file). Every function below takes an optional data_file and falls
+# back to DATA_FILE; `python tracker.py USER` runs the menu on USER's ledger.
+LEDGER_DIR = "ledgers"
+
+# Writers (add_transaction) are serialized per data file. After each save
+# they publish an immutable LedgerVersion for the file, so get_summary reads
+# a consistent set of totals without touching the lock or the disk. The
+# stamp ties a version to the saved store; if another process saves, the
+# stamp no longer matches and the totals are recomputed from the file.
+# Between a writer's save and its publish the stamp is briefly ahead of the
+# version too; readers then keep the published version (consistent, one
+# write behind) instead of waiting for that writer.
+LedgerVersion = namedtuple("LedgerVersion", "stamp total_income total_expenses total_transactions")
+_versions = {}  # data file -> LedgerVersion
+_locks = {}     # data file -> writer lock
+_locks_guard = threading.Lock()
 
 # ====================================================================
 # Core Logic Functions (The "Module" Logic)
 # ====================================================================
 
-def _load_data():
-    """Loads all transaction data from the JSON file."""
-    # Check if the file exists and is not empty
-    if not os.path.exists(DATA_FILE) or os.stat(DATA_FILE).st_size == 0:
-        return {"transactions": []}
-    
-    with open(DATA_FILE, 'r') as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            # Handle case where file is corrupted or invalid JSON
-            print(f"⚠️ Warning: {DATA_FILE} is corrupted. Starting with empty data.")
-            return {"transactions": []}
-
-def _save_data(data):
-    """Saves all transaction data to the JSON file."""
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
-
-def add_transaction(type, amount, description):
+def ledger_file(user, directory=None):
+    """The data file of one user's ledger in the ledger directory.
+
+    The name is percent-encoded ('bob smith' -> 'bob%20smith.json'), so
+    every user name gets its own file; ledger_user() reverses it.
+    """
+    name = quote(user, safe="")
+    if not user.strip() or not name.strip("."):
+        raise ValueError(f"Invalid user name: {user!r}")
+    return os.path.join(directory or LEDGER_DIR, f"{name}.json")
+
+def ledger_user(data_file):
+    """The user name a ledger_file() path belongs to."""
+    return unquote(os.path.splitext(os.path.basename(data_file))[0])
+
+def list_ledgers(directory=None):
+    """Data files of every ledger in the ledger directory, sorted."""
+    directory = directory or LEDGER_DIR
+    if not os.path.isdir(directory):
+        return []
+    names = set()
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".segments") and entry.is_dir():
+            names.add(entry.name[:-len(".segments")])
+        elif entry.name.endswith(".json") and entry.is_file():
+            names.add(entry.name[:-len(".json")])  # Not yet migrated
+    return [os.path.join(directory, f"{name}.json") for name in sorted(names)]
+
+def _lock_for(data_file):
+    with _locks_guard:
+        return _locks.setdefault(data_file, threading.Lock())
+
+@timed("tracker.load")
+def _load_data(data_file=None):
+    """Loads all transaction data from the segmented store."""
+    # A damaged segment is salvaged up to its bad tail; a corrupt legacy
+    # JSON file is backed up rather than overwritten by the next save
+    return load_state(data_file or DATA_FILE, SEGMENTED_LISTS, lambda: {"transactions": []})
+
+@timed("tracker.save")
+def _save_data(data, data_file=None):
+    """Saves all transaction data, rewriting only the segments that changed."""
+    data_file = data_file or DATA_FILE
+    directory = os.path.dirname(data_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    save_state(data_file, SEGMENTED_LISTS, data)
+
+def _totals(transactions):
+    total_income = 0.0
+    total_expenses = 0.0
+    for t in transactions:
+        if t["type"] == "income":
+            total_income += t["amount"]
+        elif t["type"] == "expense":
+            total_expenses += t["amount"]
+    return total_income, total_expenses
+
+def _current_version(data_file):
+    """The published version for data_file, rebuilt from the file if it is stale."""
+    version = _versions.get(data_file)
+    if version is not None and version.stamp is not None and version.stamp == state_stamp(data_file):
+        return version  # The common case: no lock, no file reads
+    lock = _lock_for(data_file)
+    if not lock.acquire(blocking=version is None):
+        # A writer in this process holds the lock and publishes when it is done
+        return version
+    # First read, or another process saved: reload, keeping writers out meanwhile
+    try:
+        data = _load_data(data_file)
+        version = LedgerVersion(state_stamp(data_file), *_totals(data["transactions"]), len(data["transactions"]))
+        _versions[data_file] = version
+    finally:
+        lock.release()
+    return version
+
+def new_transaction(transactions, type, amount, description):
+    """The record add_transaction appends to a ledger's transactions list."""
+    return {
+        "id": len(transactions) + 1,
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "type": type,
+        "amount": amount,
+        "description": description
+    }
+
+def add_transaction(type, amount, description, data_file=None):
     """
     Allows users to add income and expenses.
     :param type: 'income' or 'expense'
+    :param data_file: ledger to write to (default: DATA_FILE)
     """
     if amount <= 0:
         print("❌ Transaction amount must be positive.")
         return False
-        
-    data = _load_data()
-    
-    new_transaction = {
-        "id": len(data["transactions"]) + 1,
-        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "type": type,
-        "amount": amount,
-        "description": description
-    }
-    
-    data["transactions"].append(new_transaction)
-    _save_data(data)
+
+    data_file = data_file or DATA_FILE
+    with _lock_for(data_file):
+        data = _load_data(data_file)
+
+        data["transactions"].append(new_transaction(data["transactions"], type, amount, description))
+        _save_data(data, data_file)
+
+        # Publish the new totals: incrementally if the last version matches what was loaded
+        previous = _versions.get(data_file)
+        if previous is not None and previous.total_transactions == len(data["transactions"]) - 1:
+            total_income, total_expenses = previous.total_income, previous.total_expenses
+            if type == "income":
+                total_income += amount
+            elif type == "expense":
+                total_expenses += amount
+        else:
+            total_income, total_expenses = _totals(data["transactions"])
+        _versions[data_file] = LedgerVersion(
+            state_stamp(data_file), total_income, total_expenses, len(data["transactions"])
+        )
     print(f"✅ {type.title()} transaction recorded successfully.")
     return True
 
-def get_summary():
-    """Calculates the total income, total expenses, and net balance."""
-    data = _load_data()
-    
-    total_income = 0.0
-    total_expenses = 0.0
-    
-    for t in data["transactions"]:
-        if t["type"] == "income":
-            total_income += t["amount"]
-        elif t["type"] == "expense":
-            total_expenses += t["amount"]
-            
-    net_balance = total_income - total_expenses
+def get_summary(data_file=None):
+    """Calculates the total income, total expenses, and net balance.
+
+    Reads the latest published version, so it never waits for add_transaction
+    (except on the very first read of a ledger, when there is none yet).
+    """
+    version = _current_version(data_file or DATA_FILE)
+    net_balance = version.total_income - version.total_expenses
     
     return {
-        "total_income": total_income,
-        "total_expenses": total_expenses,
+        "total_income": version.total_income,
+        "total_expenses": version.total_expenses,
         "net_balance": net_balance,
-        "total_transactions": len(data["transactions"])
+        "total_transactions": version.total_transactions
     }
 
 def display_summary():
@@ -140,4 +237,9 @@ def main_menu():
 
 # Run the main program
 if __name__ == "__main__":
-    main_menu()
\ No newline at end of file
+    if len(sys.argv) > 1:
+        # python tracker.py USER: use USER's ledger in the ledger directory
+        DATA_FILE = ledger_file(sys.argv[1])
+        print(f"Using the ledger of {sys.argv[1]} ({DATA_FILE}).")
+    with instrumentation.session("tracker"):
+        main_menu()
\ No newline at end of file
@@ -0,0 +1,196 @@
+import json
+import os
+
+# --- Configuration ---
+CHECKPOINT_EVERY = 1000   # BankAccount writes a checkpoint record every N transactions
+BLOCK_SIZE = 64 * 1024    # Bytes read per step when scanning a file backwards
+
+# Checkpoint records are written compactly by transaction_log, so this exact
+# byte pattern identifies them without parsing every line.
+CHECKPOINT_MARK = b'"type":"checkpoint"'
+
+# ====================================================================
+# Streaming reader for BankAccount transaction files
+# ====================================================================
+# Understands both the JSONL records written by transaction_log and the
+# original plain-text format ("Initial Balance: 500.00", "Deposit: +100.50",
+# "Withdrawal: -50.00"). Balances are folded in integer cents.
+#
+# Reconstruction does not replay a whole history: it scans backwards from
+# the end of the file for the last checkpoint record (which carries the
+# balance at that point) and only replays the records after it.
+
+def to_cents(amount):
+    return int(round(amount * 100))
+
+def parse_line(line):
+    """Parses one history line (bytes or str) into a record dict, or None if blank."""
+    if isinstance(line, bytes):
+        line = line.decode('utf-8')
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        return json.loads(line)
+
+    # Legacy plain-text line: "<Label>: <signed amount>"
+    label, _, value = line.partition(':')
+    amount = abs(float(value))
+    kind = {"Initial Balance": "initial", "Deposit": "deposit", "Withdrawal": "withdrawal"}.get(label)
+    if kind is None:
+        raise ValueError(f"Unrecognized history line: {line!r}")
+    return {"ts": None, "type": kind, "amount": amount}
+
+def apply_record(balance_cents, record):
+    """Returns the balance (in cents) after one record."""
+    kind = record["type"]
+    if kind == "deposit":
+        return balance_cents + to_cents(record["amount"])
+    if kind == "withdrawal":
+        return balance_cents - to_cents(record["amount"])
+    if kind == "initial":
+        return to_cents(record["amount"])
+    if kind == "checkpoint":
+        return to_cents(record["balance"])
+    return balance_cents
+
+class TransactionHistory:
+    """Read-side view of one transaction file (time-ordered, append-only)."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def records(self, offset=0):
+        """Yields parsed records starting at a byte offset."""
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                record = parse_line(line)
+                if record is not None:
+                    yield record
+
+    # --- Checkpoints ---
+
+    def _last_checkpoint(self, f, end):
+        """Finds the last complete checkpoint line before byte `end`.
+
+        Returns (offset just after that line, record), or (0, None).
+        """
+        pos = end
+        carry = b""  # Partial first line of the block read previously
+        while pos > 0:
+            size = min(BLOCK_SIZE, pos)
+            pos -= size
+            f.seek(pos)
+            chunk = f.read(size) + carry
+
+            idx = chunk.rfind(CHECKPOINT_MARK)
+            while idx != -1:
+                line_start = chunk.rfind(b"\n", 0, idx) + 1
+                if line_start == 0 and pos > 0:
+                    break  # The line begins in an earlier block
+                line_end = chunk.find(b"\n", idx)
+                if line_end != -1:
+                    return pos + line_end + 1, json.loads(chunk[line_start:line_end])
+                idx = chunk.rfind(CHECKPOINT_MARK, 0, idx)  # Torn last line: ignore it
+
+            first_newline = chunk.find(b"\n")
+            carry = chunk if first_newline == -1 else chunk[:first_newline + 1]
+        return 0, None
+
+    def rebuild(self):
+        """Rebuilds the balance from the last checkpoint onwards.
+
+        Returns (balance, records replayed since that checkpoint).
+        """
+        with open(self.path, 'rb') as f:
+            offset, checkpoint = self._last_checkpoint(f, os.fstat(f.fileno()).st_size)
+        balance = to_cents(checkpoint["balance"]) if checkpoint else 0
+        replayed = 0
+        for record in self.records(offset):
+            balance = apply_record(balance, record)
+            replayed += 1
+        return balance / 100, replayed
+
+    def rebuild_full(self):
+        """Rebuilds the balance by replaying every record (no checkpoints)."""
+        balance = 0
+        for record in self.records():
+            if record["type"] != "checkpoint":
+                balance = apply_record(balance, record)
+        return balance / 100
+
+    # --- Statements ---
+
+    def _offset_for_time(self, f, size, ts):
+        """Byte offset of the first line whose timestamp is >= ts (binary search)."""
+        lo, hi = 0, size
+        while hi - lo > BLOCK_SIZE:
+            mid = (lo + hi) // 2
+            f.seek(mid)
+            f.readline()  # Skip the partial line we landed in
+            line_start = f.tell()
+            line = f.readline()
+            if not line:
+                hi = mid
+                continue
+            record = parse_line(line)
+            if record is None or record.get("ts") is None or record["ts"] < ts:
+                lo = line_start + len(line)
+            else:
+                hi = mid
+
+        f.seek(lo)
+        offset = lo
+        for line in f:
+            record = parse_line(line)
+            if record is not None and record.get("ts") is not None and record["ts"] >= ts:
+                return offset
+            offset += len(line)
+        return offset
+
+    def statement(self, start=None, end=None):
+        """Summarizes the period [start, end) given as ISO timestamp strings.
+
+        Records without a timestamp (legacy lines) count as before any period.
+        """
+        with open(self.path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            start_offset = self._offset_for_time(f, size, start) if start else 0
+            offset, checkpoint = self._last_checkpoint(f, start_offset)
+
+            # Opening balance: nearest checkpoint, then replay up to the period start
+            balance = to_cents(checkpoint["balance"]) if checkpoint else 0
+            f.seek(offset)
+            while offset < start_offset:
+                line = f.readline()
+                offset += len(line)
+                record = parse_line(line)
+                if record is not None:
+                    balance = apply_record(balance, record)
+
+            opening = balance
+            deposits = withdrawals = count = 0
+            for line in f:
+                record = parse_line(line)
+                if record is None:
+                    continue
+                if end and record.get("ts") is not None and record["ts"] >= end:
+                    break
+                if record["type"] == "deposit":
+                    deposits += to_cents(record["amount"])
+                    count += 1
+                elif record["type"] == "withdrawal":
+                    withdrawals += to_cents(record["amount"])
+                    count += 1
+                balance = apply_record(balance, record)
+
+        return {
+            "start": start,
+            "end": end,
+            "opening_balance": opening / 100,
+            "total_deposits": deposits / 100,
+            "total_withdrawals": withdrawals / 100,
+            "closing_balance": balance / 100,
+            "transactions": count,
+        }
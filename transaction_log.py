@@ -0,0 +1,164 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+# --- Configuration ---
+# benchmarks/bench_transaction_log.py (2000 accounts, 100k records) puts these
+# defaults at 2-3x open/append/close per record. The remaining cost is
+# json.dumps, not file handling: a pool of 256 or 1024, or flush_every=1000,
+# came out within run-to-run noise of these values, so the smaller pool and
+# the shorter wait for a busy file's records are kept.
+MAX_OPEN_FILES = 64     # Log files kept open at once; least recently used are closed
+FLUSH_EVERY = 100       # Buffered records per file before they are written out
+FLUSH_INTERVAL = 1.0    # Seconds a buffered record may wait, even if no more records arrive
+
+# ====================================================================
+# Buffered, structured transaction logging
+# ====================================================================
+# Each record is one JSON object per line (JSONL), e.g.
+#   {"ts": "2025-10-15T08:46:39.120000", "type": "deposit", "amount": 100.5, "balance": 600.5}
+# Records are buffered per file and written in batches through a bounded
+# pool of open file handles, instead of open/append/close on every call.
+
+def make_record(kind, amount, balance, **extra):
+    """Builds a timestamped transaction record."""
+    record = {
+        "ts": datetime.now().isoformat(timespec="microseconds"),
+        "type": kind,
+        "amount": round(amount, 2),
+        "balance": round(balance, 2),
+    }
+    record.update(extra)
+    return record
+
+def read_records(path):
+    """Yields the records of a JSONL transaction log, one dict per line."""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+class TransactionLogger:
+    """Writes JSONL records to many files with batching and an LRU handle pool.
+
+    Flush policy: a file's buffer is written once it holds `flush_every`
+    records, all buffers are written when `flush_interval` seconds have passed
+    since the last full flush, and flush() or close() writes everything
+    immediately. The interval is checked on each log() call and by a
+    background thread (started with the first record), so an idle logger
+    still writes its records out within `flush_interval` seconds.
+    """
+
+    def __init__(self, max_open_files=MAX_OPEN_FILES, flush_every=FLUSH_EVERY,
+                 flush_interval=FLUSH_INTERVAL, fsync=False):
+        if max_open_files < 1:
+            raise ValueError("max_open_files must be at least 1.")
+        self.max_open_files = max_open_files
+        self.flush_every = max(1, flush_every)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self._handles = OrderedDict()  # path -> open file, most recently used last
+        self._buffers = {}             # path -> list of serialized lines
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        self._flusher = None  # Background flush thread and its stop event, while running
+        self._stop = None
+
+    # --- File Handle Pool ---
+
+    def _handle(self, path):
+        """Returns an open append handle for path, evicting the least recently used."""
+        handle = self._handles.get(path)
+        if handle is not None:
+            self._handles.move_to_end(path)
+            return handle
+        while len(self._handles) >= self.max_open_files:
+            _, oldest = self._handles.popitem(last=False)
+            oldest.close()
+        handle = open(path, 'a', encoding='utf-8')
+        self._handles[path] = handle
+        return handle
+
+    def open_files(self):
+        """Number of log files currently held open."""
+        return len(self._handles)
+
+    # --- Write Path ---
+
+    def log(self, path, record):
+        """Buffers one record for path, flushing according to the policy."""
+        line = json.dumps(record, separators=(',', ':')) + "\n"
+        with self._lock:
+            buffer = self._buffers.setdefault(path, [])
+            buffer.append(line)
+            if len(buffer) >= self.flush_every:
+                self._write(path)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush_all()
+            if self._flusher is None and self.flush_interval > 0:
+                self._start_flusher()
+
+    # --- Background Flush ---
+
+    def _start_flusher(self):
+        """Starts the timer thread (called with the lock held)."""
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, args=(self._stop,),
+                                         name="transaction-log-flush", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self, stop):
+        """Writes all buffers whenever flush_interval passes without a full flush."""
+        delay = self.flush_interval
+        while not stop.wait(delay):
+            with self._lock:
+                delay = self._last_flush + self.flush_interval - time.monotonic()
+                if delay <= 0:
+                    self._flush_all()
+                    delay = self.flush_interval
+
+    def _write(self, path):
+        buffer = self._buffers.pop(path, None)
+        if not buffer:
+            return
+        handle = self._handle(path)
+        handle.write("".join(buffer))
+        handle.flush()
+        if self.fsync:
+            os.fsync(handle.fileno())
+
+    def _flush_all(self):
+        for path in list(self._buffers):
+            self._write(path)
+        self._last_flush = time.monotonic()
+
+    def flush(self, path=None):
+        """Writes buffered records for one path, or for every path."""
+        with self._lock:
+            if path is None:
+                self._flush_all()
+            else:
+                self._write(path)
+
+    def close(self):
+        """Stops the background flush, flushes everything and closes all pooled file handles."""
+        with self._lock:
+            flusher, stop = self._flusher, self._stop
+            self._flusher = self._stop = None
+        if flusher is not None:
+            stop.set()
+            flusher.join()
+        with self._lock:
+            self._flush_all()
+            while self._handles:
+                _, handle = self._handles.popitem(last=False)
+                handle.close()
+
+# Shared logger used by task_models.BankAccount unless one is passed in
+DEFAULT_LOGGER = TransactionLogger()
+atexit.register(DEFAULT_LOGGER.close)
@@ -0,0 +1,145 @@
+import numbers
+
+import numpy as np
+
+from task_models import Vector
+
+# ====================================================================
+# Batch companion to task_models.Vector
+# ====================================================================
+# VectorArray keeps many 2-D vectors as two float64 arrays (struct of
+# arrays) instead of one Python object per vector, so arithmetic over
+# millions of vectors is a handful of NumPy operations with no per-element
+# allocation. A scalar task_models.Vector can be mixed in anywhere and is
+# broadcast across the whole batch.
+
+class VectorArray:
+    """Many (x, y) vectors stored as parallel NumPy arrays."""
+
+    def __init__(self, x, y):
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        if self.x.shape != self.y.shape or self.x.ndim != 1:
+            raise ValueError("x and y must be 1-D arrays of the same length.")
+
+    @classmethod
+    def zeros(cls, n):
+        return cls(np.zeros(n), np.zeros(n))
+
+    @classmethod
+    def from_vectors(cls, vectors):
+        """Builds a batch from task_models.Vector objects (anything with .x and .y)."""
+        vectors = list(vectors)
+        return cls([v.x for v in vectors], [v.y for v in vectors])
+
+    def to_vectors(self):
+        """Returns the batch as a list of task_models.Vector objects."""
+        return [Vector(x, y) for x, y in zip(self.x.tolist(), self.y.tolist())]
+
+    # --- Container Protocol ---
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, index):
+        """An int index returns a task_models.Vector; slices and masks return a VectorArray."""
+        if isinstance(index, numbers.Integral):
+            return Vector(float(self.x[index]), float(self.y[index]))
+        return VectorArray(self.x[index], self.y[index])
+
+    def __setitem__(self, index, value):
+        x, y = self._components(value)
+        self.x[index] = x
+        self.y[index] = y
+
+    def __iter__(self):
+        return iter(self.to_vectors())
+
+    def __str__(self):
+        return f"VectorArray({len(self)} vectors)"
+
+    def __eq__(self, other):
+        if not isinstance(other, VectorArray):
+            return NotImplemented
+        return np.array_equal(self.x, other.x) and np.array_equal(self.y, other.y)
+
+    __hash__ = None
+
+    # --- Arithmetic ---
+
+    # NumPy operands defer to our reflected methods instead of broadcasting
+    # over the VectorArray as an object, so ndarray * VectorArray goes
+    # through __rmul__ and still returns a VectorArray
+    __array_ufunc__ = None
+
+    @staticmethod
+    def _components(other):
+        """(x, y) of a VectorArray or a single vector; raises TypeError otherwise."""
+        if isinstance(other, VectorArray):
+            return other.x, other.y
+        if hasattr(other, "x") and hasattr(other, "y"):
+            return other.x, other.y
+        raise TypeError(f"Expected a VectorArray or Vector, got {type(other).__name__}")
+
+    def _binary(self, other, op):
+        try:
+            x, y = self._components(other)
+        except TypeError:
+            return NotImplemented
+        return VectorArray(op(self.x, x), op(self.y, y))
+
+    def __add__(self, other):
+        return self._binary(other, np.add)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self._binary(other, np.subtract)
+
+    def __rsub__(self, other):
+        return self._binary(other, lambda a, b: np.subtract(b, a))
+
+    def __mul__(self, scalar):
+        """Scalar (or per-vector array of scalars) multiplication."""
+        if isinstance(scalar, (numbers.Real, np.ndarray)):
+            return VectorArray(self.x * scalar, self.y * scalar)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return VectorArray(-self.x, -self.y)
+
+    # In-place variants write into the existing arrays (no allocation)
+
+    def __iadd__(self, other):
+        x, y = self._components(other)
+        self.x += x
+        self.y += y
+        return self
+
+    def __isub__(self, other):
+        x, y = self._components(other)
+        self.x -= x
+        self.y -= y
+        return self
+
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    # --- Reductions ---
+
+    def dot(self, other):
+        """Element-wise dot products with another batch or a single vector."""
+        x, y = self._components(other)
+        return self.x * x + self.y * y
+
+    def norm(self):
+        """Length of every vector."""
+        return np.hypot(self.x, self.y)
+
+    def sum(self):
+        """Sum of all vectors as a single task_models.Vector."""
+        return Vector(float(self.x.sum()), float(self.y.sum()))
@@ -0,0 +1,108 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import info
+from weather_cache import cache_key
+
+# --- Configuration ---
+CONCURRENCY = 8       # HTTP requests in flight at once
+RETRIES = 3           # Attempts per request
+BACKOFF_BASE = 0.5    # Seconds; attempt i waits BACKOFF_BASE * 2**i plus random jitter
+
+# ====================================================================
+# Concurrent multi-city weather fetching
+# ====================================================================
+# Each city is a coroutine (geocode, then current weather). The blocking
+# HTTP call itself runs on a thread pool sized to the concurrency limit,
+# and a semaphore caps how many requests are in flight, so the wall time
+# of a batch grows with len(cities) / concurrency rather than len(cities).
+# Backoff between retries is an asyncio.sleep, so a city waiting to retry
+# never holds up the others. A failing city is reported in its own result
+# and never aborts the batch.
+
+class BatchFetcher:
+    """Fetches current weather for many cities with bounded concurrency."""
+
+    def __init__(self, concurrency=CONCURRENCY, retries=RETRIES, backoff_base=BACKOFF_BASE,
+                 use_cache=True):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.use_cache = use_cache
+        self._executor = None
+        self._semaphore = None
+
+    async def get_json(self, url, params, ttl):
+        """GET with caching, bounded concurrency and non-blocking jittered backoff."""
+        cache = info.get_cache() if self.use_cache else None
+        key = cache_key(url, params)
+        if cache is not None:
+            found, data = cache.get(key)
+            if found:
+                return data
+
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries):
+            try:
+                async with self._semaphore:
+                    data = await loop.run_in_executor(self._executor, info.http_get_json, url, params)
+                break
+            except requests.exceptions.RequestException:
+                if attempt == self.retries - 1:
+                    raise
+                delay = self.backoff_base * 2 ** attempt
+                await asyncio.sleep(delay + random.uniform(0, delay))
+
+        if cache is not None:
+            cache.set(key, data, ttl)
+        return data
+
+    async def fetch_city(self, city_name):
+        """Returns {"city", "location", "weather", "error"} for one city."""
+        result = {"city": city_name, "location": None, "weather": None, "error": None}
+        try:
+            location = info.local_geocode(city_name)
+            if location is None:
+                geo_data = await self.get_json(info.API_URL_GEO, info.build_geo_params(city_name),
+                                               info.GEO_CACHE_TTL)
+                if not geo_data.get('results'):
+                    result["error"] = f"City '{city_name}' not found."
+                    return result
+                location = geo_data['results'][0]
+            result["location"] = location
+
+            weather_data = await self.get_json(
+                info.API_URL_WEATHER,
+                info.build_weather_params(location['latitude'], location['longitude']),
+                info.WEATHER_CACHE_TTL,
+            )
+            result["weather"] = weather_data.get('current_weather')
+            if not result["weather"]:
+                result["error"] = "Could not retrieve current weather data for this location."
+        except requests.exceptions.HTTPError as err:
+            result["error"] = f"API Error: status code {err.response.status_code}"
+        except requests.exceptions.RequestException as err:
+            result["error"] = f"Network Error: {err}"
+        except Exception as e:
+            result["error"] = f"Unexpected error: {e}"
+        return result
+
+    async def fetch_many(self, city_names):
+        """Fetches every city concurrently; results keep the input order."""
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            self._executor = executor
+            try:
+                return await asyncio.gather(*(self.fetch_city(c) for c in city_names))
+            finally:
+                self._executor = None
+
+def fetch_weather_batch(city_names, concurrency=CONCURRENCY, **options):
+    """Synchronous entry point: runs a BatchFetcher on a fresh event loop."""
+    fetcher = BatchFetcher(concurrency=concurrency, **options)
+    return asyncio.run(fetcher.fetch_many(city_names))
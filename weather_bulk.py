@@ -0,0 +1,96 @@
+import requests
+
+import info
+from weather_cache import cache_key
+
+# --- Configuration ---
+GRID_STEP = 0.1          # Degrees; sites in the same cell (~11 km) share one forecast
+MAX_COORDINATES = 50     # Coordinates per multi-location request (keeps the URL short)
+
+# ====================================================================
+# Bulk current weather for many sites
+# ====================================================================
+# Polling hundreds of sites one request at a time repeats work: nearby
+# sites get practically the same forecast. Coordinates are snapped to a
+# grid, sites that land in the same cell share one bucket, and buckets are
+# fetched with the forecast API's multi-coordinate form (comma-separated
+# latitude/longitude lists), MAX_COORDINATES per request. Each bucket's
+# result is then fanned back out to all of its sites. Buckets go through
+# the same response cache as get_current_weather, keyed by the snapped
+# coordinate, so a fresh bucket costs no request at all.
+
+def snap(lat, lon, step=GRID_STEP):
+    """Centre of the grid cell containing (lat, lon)."""
+    return (round(round(lat / step) * step, 6), round(round(lon / step) * step, 6))
+
+def group_by_bucket(sites, step=GRID_STEP):
+    """Maps each grid bucket to the site ids inside it, in first-seen order."""
+    buckets = {}
+    for site_id, (lat, lon) in sites.items():
+        buckets.setdefault(snap(lat, lon, step), []).append(site_id)
+    return buckets
+
+def build_bulk_weather_params(coordinates):
+    """Weather params for several (lat, lon) pairs in one request."""
+    params = info.build_weather_params(0, 0)
+    params['latitude'] = ",".join(str(lat) for lat, _ in coordinates)
+    params['longitude'] = ",".join(str(lon) for _, lon in coordinates)
+    return params
+
+def fetch_buckets(buckets, chunk_size=MAX_COORDINATES, use_cache=True):
+    """Returns ({bucket: current_weather or None}, upstream requests, failed buckets)."""
+    cache = info.get_cache() if use_cache else None
+    weather = {}
+    missing = []
+    for bucket in buckets:
+        if cache is not None:
+            found, data = cache.get(cache_key(info.API_URL_WEATHER, info.build_weather_params(*bucket)))
+            if found:
+                weather[bucket] = data.get('current_weather')
+                continue
+        missing.append(bucket)
+
+    upstream = failed = 0
+    for i in range(0, len(missing), chunk_size):
+        chunk = missing[i:i + chunk_size]
+        upstream += 1
+        try:
+            data = info.fetch_with_retry(info.API_URL_WEATHER, params=build_bulk_weather_params(chunk))
+        except requests.exceptions.RequestException:
+            failed += len(chunk)
+            for bucket in chunk:
+                weather[bucket] = None
+            continue
+
+        # One coordinate comes back as an object, several as a list in request order
+        points = data if isinstance(data, list) else [data]
+        for bucket, point in zip(chunk, points):
+            weather[bucket] = point.get('current_weather')
+            if cache is not None:
+                cache.set(cache_key(info.API_URL_WEATHER, info.build_weather_params(*bucket)),
+                          point, info.WEATHER_CACHE_TTL)
+    return weather, upstream, failed
+
+def fetch_weather_bulk(sites, step=GRID_STEP, chunk_size=MAX_COORDINATES, use_cache=True):
+    """Current weather for {site_id: (lat, lon)}; returns (weather by site, stats).
+
+    A site whose bucket could not be fetched maps to None. stats counts the
+    sites, buckets, upstream requests made and the calls saved compared to
+    one request per site.
+    """
+    buckets = group_by_bucket(sites, step)
+    weather, upstream, failed = fetch_buckets(buckets, chunk_size, use_cache)
+
+    by_site = {}
+    for bucket, site_ids in buckets.items():
+        for site_id in site_ids:
+            by_site[site_id] = weather.get(bucket)
+
+    stats = {
+        "sites": len(sites),
+        "buckets": len(buckets),
+        "upstream_calls": upstream,
+        "calls_saved": len(sites) - upstream,
+        "failed_buckets": failed,
+    }
+    return by_site, stats
@@ -0,0 +1,145 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# --- Configuration ---
+CACHE_FILE = "weather_cache.db"
+MEMORY_ENTRIES = 256   # Responses kept in the in-memory LRU layer
+
+# ====================================================================
+# Two-level response cache for info.py
+# ====================================================================
+# Level 1 is an in-process LRU dictionary; level 2 is a SQLite file that
+# survives restarts. Every entry carries its own expiry time, so geocoding
+# answers can live for weeks while current weather expires in minutes.
+
+def cache_key(url, params=None):
+    """Stable key for a GET request: URL plus sorted query parameters."""
+    return url + "?" + json.dumps(params or {}, sort_keys=True, separators=(',', ':'))
+
+class LRUCache:
+    """In-memory cache with per-entry expiry and least-recently-used eviction."""
+
+    def __init__(self, maxsize=MEMORY_ENTRIES, clock=time.time):
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Returns (True, value) for a fresh entry, else (False, None)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires_at, value = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return False, None
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class DiskCache:
+    """SQLite-backed cache of JSON values with per-entry expiry."""
+
+    def __init__(self, path=CACHE_FILE, clock=time.time):
+        self.path = path
+        self.clock = clock
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[1] <= self.clock():
+            return False, None, None
+        return True, json.loads(row[0]), row[1]
+
+    def set(self, key, value, expires_at):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+
+    def purge_expired(self):
+        """Deletes expired entries; returns how many were removed."""
+        with self._lock, self.conn:
+            return self.conn.execute(
+                "DELETE FROM responses WHERE expires_at <= ?", (self.clock(),)
+            ).rowcount
+
+    def close(self):
+        self.conn.close()
+
+class TwoLevelCache:
+    """Memory LRU in front of a disk cache, with hit/miss counters.
+
+    The cache is shared by weather_async's fetcher threads, so the counters
+    are updated and read under their own lock.
+    """
+
+    def __init__(self, memory=None, disk=None, clock=time.time):
+        self.clock = clock
+        self.memory = memory or LRUCache(clock=clock)
+        self.disk = disk  # None = memory only
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def counters(self):
+        """A consistent copy of the hit/miss counters."""
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def get(self, key):
+        found, value = self.memory.get(key)
+        if found:
+            self._count("memory_hits")
+            return True, value
+        if self.disk is not None:
+            found, value, expires_at = self.disk.get(key)
+            if found:
+                self._count("disk_hits")
+                self.memory.set(key, value, expires_at)  # Promote to level 1
+                return True, value
+        self._count("misses")
+        return False, None
+
+    def set(self, key, value, ttl):
+        expires_at = self.clock() + ttl
+        self.memory.set(key, value, expires_at)
+        if self.disk is not None:
+            self.disk.set(key, value, expires_at)
+
+    def hit_ratio(self):
+        stats = self.counters()
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        total = hits + stats["misses"]
+        return hits / total if total else 0.0